@@ -1,5 +1,6 @@
 __version__ = "1.0.0"
 
+from mongodb_odm.connection import aconnect as aconnect
 from mongodb_odm.connection import adisconnect as adisconnect
 from mongodb_odm.connection import connect as connect
 from mongodb_odm.connection import disconnect as disconnect
@@ -11,6 +12,14 @@ from mongodb_odm.types import ObjectIdStr as ObjectIdStr
 from mongodb_odm.types import ODMObjectId as ODMObjectId
 from mongodb_odm.utils.apply_indexes import apply_indexes as apply_indexes
 from mongodb_odm.utils.apply_indexes import async_apply_indexes as async_apply_indexes
+from mongodb_odm.utils.apply_indexes import async_plan_indexes as async_plan_indexes
+from mongodb_odm.utils.apply_indexes import plan_indexes as plan_indexes
+from mongodb_odm.utils.concurrency import retry_on_conflict as retry_on_conflict
+from mongodb_odm.utils.sequence import FieldSequence as FieldSequence
+from mongodb_odm.utils.transaction import atransaction as atransaction
+from mongodb_odm.utils.transaction import transaction as transaction
+from mongodb_odm.utils.write_buffer import AsyncWriteBuffer as AsyncWriteBuffer
+from mongodb_odm.utils.write_buffer import WriteBuffer as WriteBuffer
 from pydantic import BaseModel as BaseModel
 from pydantic import ConfigDict as ConfigDict
 from pymongo import ASCENDING as ASCENDING
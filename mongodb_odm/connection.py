@@ -1,4 +1,7 @@
+import asyncio
 import logging
+import os
+import weakref
 from typing import Any, Optional, Union, cast
 
 from mongodb_odm.exceptions import ConnectionError, InvalidAction, InvalidConnection
@@ -10,9 +13,38 @@ from pymongo.database import Database
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CONNECTION_ALIAS = "default"
+
 """Store database connection related values in this variable"""
 __connection_obj = Connection()
 
+"""Connections of the other aliases, see ODMConfig.connection"""
+__connections: dict[str, Connection] = {}
+
+
+def _get_connection(alias: str) -> Connection:
+    if alias == DEFAULT_CONNECTION_ALIAS:
+        return __connection_obj
+
+    if alias not in __connections:
+        __connections[alias] = Connection()
+    return __connections[alias]
+
+
+def _set_connection(alias: str, connection: Connection) -> None:
+    global __connection_obj
+
+    if alias == DEFAULT_CONNECTION_ALIAS:
+        __connection_obj = connection
+    else:
+        __connections[alias] = connection
+
+
+def get_connection_aliases() -> list[str]:
+    """Aliases that have a connection configured"""
+    aliases = [DEFAULT_CONNECTION_ALIAS] if __connection_obj.url else []
+    return aliases + [alias for alias, obj in __connections.items() if obj.url]
+
 
 def _get_connection_client(url: str, connection_kwargs: DICT_TYPE) -> MongoClient[Any]:
     return MongoClient(url, **connection_kwargs)
@@ -24,11 +56,157 @@ def _get_async_connection_client(
     return AsyncMongoClient(url, **connection_kwargs)
 
 
+def _get_running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+"""Seconds adisconnect() waits for another running loop to close its client"""
+LOOP_CLIENT_CLOSE_TIMEOUT = 5
+
+
+def _close_with_loop(
+    connection_obj: Connection, loop: asyncio.AbstractEventLoop
+) -> None:
+    """
+    Close the client of the loop before the loop itself. asyncio.run() and a
+    bare loop.close() both close the loop after it stopped running.
+    """
+    loop_close = loop.close
+
+    def close() -> None:
+        loop_clients = connection_obj.loop_clients
+        try:
+            if loop_clients is not None and not (loop.is_running() or loop.is_closed()):
+                client = loop_clients.pop(loop, None)
+                if client is not None:
+                    from mongodb_odm.models import _clear_collection_handles
+
+                    _clear_collection_handles(client)
+                    loop.run_until_complete(client.close())
+        except Exception:
+            logger.exception("Failed to close the client of the event loop")
+        finally:
+            loop_close()
+
+    try:
+        loop.close = close  # type: ignore[method-assign]
+    except AttributeError:
+        # The client is released by the garbage collector after the loop
+        logger.debug("Event loop %r does not allow closing its client", loop)
+
+
+def _get_loop_client(
+    connection_obj: Connection, client: AsyncMongoClient[Any]
+) -> AsyncMongoClient[Any]:
+    """
+    An AsyncMongoClient can only be used by one event loop. The first loop that
+    uses the connection gets `client`, every other running loop gets its own
+    client and pool. The clients are closed when their loop is closed.
+    """
+    loop = _get_running_loop()
+    if loop is None:
+        return client
+
+    if connection_obj.loop_clients is None or connection_obj.given_clients is None:
+        connection_obj.loop_clients = weakref.WeakKeyDictionary()
+        connection_obj.given_clients = weakref.WeakSet()
+
+    loop_client = connection_obj.loop_clients.get(loop)
+    if loop_client is None:
+        loop_client = client
+        if client in connection_obj.given_clients:
+            loop_client = _get_async_connection_client(
+                cast(str, connection_obj.url), connection_obj.connection_kwargs or {}
+            )
+
+        connection_obj.loop_clients[loop] = loop_client
+        connection_obj.given_clients.add(loop_client)
+        _close_with_loop(connection_obj, loop)
+
+    return loop_client
+
+
+async def _aclose_loop_clients(
+    connection_obj: Connection, client: AsyncMongoClient[Any]
+) -> None:
+    """
+    Close `client` and the clients of the running loops. The client of a loop
+    that is not running is closed when that loop is closed.
+    """
+    from mongodb_odm.models import _clear_collection_handles
+
+    running_loop = asyncio.get_running_loop()
+    loop_clients = connection_obj.loop_clients
+    for loop, loop_client in list((loop_clients or {}).items()):
+        if loop is not running_loop and not loop.is_running():
+            continue
+        cast(weakref.WeakKeyDictionary[Any, Any], loop_clients).pop(loop, None)
+        _clear_collection_handles(loop_client)
+        if loop is running_loop:
+            await loop_client.close()
+            continue
+
+        future = asyncio.run_coroutine_threadsafe(loop_client.close(), loop)
+        try:
+            await asyncio.wait_for(
+                asyncio.wrap_future(future), LOOP_CLIENT_CLOSE_TIMEOUT
+            )
+        except Exception:
+            logger.exception("Failed to close the client of event loop %r", loop)
+
+    if client not in (connection_obj.given_clients or ()):
+        await client.close()
+
+
+def _add_metrics_listeners(connection_kwargs: DICT_TYPE) -> DICT_TYPE:
+    from mongodb_odm.utils.metrics import get_metrics_registry
+
+    listeners = list(connection_kwargs.get("event_listeners", []))
+    for listener in get_metrics_registry().get_listeners():
+        if listener not in listeners:
+            listeners.append(listener)
+
+    return {**connection_kwargs, "event_listeners": listeners}
+
+
+def _add_query_counter_listener(connection_kwargs: DICT_TYPE) -> DICT_TYPE:
+    from mongodb_odm.utils.query_counter import get_query_counter_listener
+
+    listeners = list(connection_kwargs.get("event_listeners", []))
+    listener = get_query_counter_listener()
+    if listener not in listeners:
+        listeners.append(listener)
+
+    return {**connection_kwargs, "event_listeners": listeners}
+
+
+def _add_pool_listener(connection_kwargs: DICT_TYPE) -> DICT_TYPE:
+    """A new listener, the one of the parent process counts its connections"""
+    from mongodb_odm.utils.warmup import PoolConnectionListener
+
+    listeners = [
+        listener
+        for listener in connection_kwargs.get("event_listeners", [])
+        if not isinstance(listener, PoolConnectionListener)
+    ]
+    listeners.append(PoolConnectionListener())
+
+    return {**connection_kwargs, "event_listeners": listeners}
+
+
 def connect(
     url: str,
     databases: Optional[set[str]] = None,
     connection_kwargs: Optional[DICT_TYPE] = None,
     async_is_enabled: bool = False,
+    alias: str = DEFAULT_CONNECTION_ALIAS,
+    dual_mode: bool = False,
+    warmup: bool = False,
+    metrics: bool = False,
+    query_counter: bool = False,
 ) -> Union[AsyncMongoClient[Any], MongoClient[Any]]:
     """
     This connect function should manage and store database connection config
@@ -48,15 +226,44 @@ def connect(
     async_is_enabled: bool, optional
         If True then use AsyncMongoClient, otherwise use MongoClient.
         Default is False.
+
+    alias: string, optional
+        Name of the connection. Models use the connection of the alias
+        that is set in ODMConfig.connection, "default" otherwise.
+        Every alias has its own client and connection pool.
+
+    dual_mode: bool, optional
+        Use a MongoClient for the sync operations and an AsyncMongoClient for
+        the async operations, both created from the same url and connection_kwargs.
+        The clients connect on their first operation. Returns the MongoClient.
+
+    warmup: bool, optional
+        Ping the server and wait until the pool has minPoolSize connections
+        before returning, and cache the collections of the models. It's done
+        again in forked processes. Use aconnect() to warm up an async client.
+
+    metrics: bool, optional
+        Register the command, pool and heartbeat listeners of the metrics
+        registry, see mongodb_odm.utils.metrics.get_metrics_registry().
+
+    query_counter: bool, optional
+        Register the command listener of odm_query_counter(),
+        see mongodb_odm.utils.query_counter.
     """
-    global __connection_obj
+    if dual_mode and async_is_enabled:
+        raise InvalidAction("async_is_enabled can't be used with dual_mode")
+    if warmup and async_is_enabled:
+        raise InvalidAction("Use aconnect() to warm up an async client.")
+
+    connection_obj = _get_connection(alias)
 
-    if __connection_obj.client is not None:
+    if connection_obj.client is not None:
         """Log a warning if a user tries to connect multiple times."""
         logger.warning("Already have an connection.")
-        return __connection_obj.client
+        return connection_obj.client
 
-    __connection_obj = Connection()
+    connection_obj = Connection()
+    _set_connection(alias, connection_obj)
 
     if databases is None:
         """Assign empty set as default value"""
@@ -65,9 +272,19 @@ def connect(
     if not connection_kwargs:
         connection_kwargs = {}
 
+    if metrics:
+        connection_kwargs = _add_metrics_listeners(connection_kwargs)
+    if query_counter:
+        connection_kwargs = _add_query_counter_listener(connection_kwargs)
+    if warmup:
+        connection_kwargs = _add_pool_listener(connection_kwargs)
+
     client: Union[AsyncMongoClient[Any], MongoClient[Any]]
     if async_is_enabled:
         client = _get_async_connection_client(url, connection_kwargs)
+    elif dual_mode:
+        # Don't start the monitor threads of processes that only use async
+        client = _get_connection_client(url, {"connect": False, **connection_kwargs})
     else:
         client = _get_connection_client(url, connection_kwargs)
 
@@ -75,115 +292,296 @@ def connect(
     databases.add(default_database)
 
     """Store the user configuration in the global variable to use later."""
-    __connection_obj.url = url
-    __connection_obj.databases = databases
-    __connection_obj.client = client
-    __connection_obj.async_is_enabled = async_is_enabled
-    __connection_obj.connection_kwargs = connection_kwargs
+    connection_obj.url = url
+    connection_obj.databases = databases
+    connection_obj.client = client
+    connection_obj.async_is_enabled = async_is_enabled
+    connection_obj.dual_mode = dual_mode
+    connection_obj.connection_kwargs = connection_kwargs
+    connection_obj.pid = os.getpid()
+    connection_obj.warmup = warmup
+    _clear_model_names()
+
+    if isinstance(client, AsyncMongoClient):
+        # The client belongs to the running loop if there is one
+        _get_loop_client(connection_obj, client)
 
     logger.info("Connection established successfully")
 
-    return __connection_obj.client
+    if warmup:
+        from mongodb_odm.utils.warmup import warmup_pool
 
+        warmup_pool(alias)
 
-def _disconnect_common() -> bool:
-    global __connection_obj
+    return connection_obj.client
 
-    from mongodb_odm.models import _clear_cache
 
-    _clear_cache()
+async def aconnect(
+    url: str,
+    databases: Optional[set[str]] = None,
+    connection_kwargs: Optional[DICT_TYPE] = None,
+    async_is_enabled: bool = True,
+    alias: str = DEFAULT_CONNECTION_ALIAS,
+    dual_mode: bool = False,
+    warmup: bool = False,
+    metrics: bool = False,
+    query_counter: bool = False,
+) -> Union[AsyncMongoClient[Any], MongoClient[Any]]:
+    """
+    connect() for async applications. Warm up the async client of the
+    running event loop, see the warmup argument of connect().
+    """
+    if warmup:
+        connection_kwargs = _add_pool_listener(connection_kwargs or {})
+
+    client = connect(
+        url,
+        databases=databases,
+        connection_kwargs=connection_kwargs,
+        async_is_enabled=async_is_enabled and not dual_mode,
+        alias=alias,
+        dual_mode=dual_mode,
+        metrics=metrics,
+        query_counter=query_counter,
+    )
+
+    if warmup:
+        from mongodb_odm.utils.warmup import awarmup_pool
+
+        await awarmup_pool(alias)
+
+    return client
+
+
+def _clear_model_names() -> None:
+    from mongodb_odm.utils.query_counter import _get_model_name
+
+    _get_model_name.cache_clear()
+
+
+def _disconnect_common(alias: str = DEFAULT_CONNECTION_ALIAS) -> bool:
+    from mongodb_odm.models import _clear_connection_cache
 
-    __connection_obj = Connection()  # Reset the connection object
+    _clear_connection_cache(alias)
+    _clear_model_names()
+
+    _set_connection(alias, Connection())  # Reset the connection object
 
     logger.info("Disconnect the db connection")
 
     return True
 
 
-def disconnect(raise_error: bool = True) -> bool:
-    global __connection_obj
+def disconnect(raise_error: bool = True, alias: str = DEFAULT_CONNECTION_ALIAS) -> bool:
+    connection_obj = _get_connection(alias)
 
-    if __connection_obj.client is None:
+    if connection_obj.client is None:
         logger.warning("No client connection found")
-        return _disconnect_common()
+        return _disconnect_common(alias)
 
-    if isinstance(__connection_obj.client, AsyncMongoClient):
+    if connection_obj.async_client is not None:
+        if raise_error:
+            raise InvalidAction(
+                "The async client of dual mode is in use. Use adisconnect() instead."
+            )
+        logger.warning(
+            "The async client of dual mode is in use. Use adisconnect() instead."
+        )
+        connection_obj.async_client = None
+
+    if isinstance(connection_obj.client, AsyncMongoClient):
         if not raise_error:
             logger.warning(
                 "The client is configured as async. Use adisconnect() instead."
             )
             # We are not closing the async client expecting since this is a silent disconnect.
             # Also it's not possible to call close() on an async client in a sync context.
-            __connection_obj.client = None
+            connection_obj.client = None
 
-            return _disconnect_common()
+            return _disconnect_common(alias)
         else:
             raise InvalidAction(
                 "The client is configured as async. Use adisconnect() instead."
             )
 
-    __connection_obj.client.close()
-    __connection_obj.client = None
+    from mongodb_odm.utils.write_buffer import close_write_buffers
 
-    return _disconnect_common()
+    """Write all the buffered documents before closing the client."""
+    close_write_buffers(alias)
 
+    connection_obj.client.close()
+    connection_obj.client = None
 
-async def adisconnect(raise_error: bool = True) -> bool:
-    global __connection_obj
+    return _disconnect_common(alias)
+
+
+async def _adisconnect_dual_mode(connection_obj: Connection, alias: str) -> bool:
+    from mongodb_odm.utils.write_buffer import (
+        aclose_write_buffers,
+        close_write_buffers,
+    )
+
+    """Write all the buffered documents of both clients before closing them."""
+    await aclose_write_buffers(alias)
+    # Closing joins the writer threads, don't block the event loop meanwhile
+    await asyncio.to_thread(close_write_buffers, alias)
+
+    if connection_obj.async_client is not None:
+        await _aclose_loop_clients(connection_obj, connection_obj.async_client)
+        connection_obj.async_client = None
+    if connection_obj.client is not None:
+        connection_obj.client.close()
+        connection_obj.client = None
+
+    return _disconnect_common(alias)
+
+
+async def adisconnect(
+    raise_error: bool = True, alias: str = DEFAULT_CONNECTION_ALIAS
+) -> bool:
+    connection_obj = _get_connection(alias)
 
-    if __connection_obj.client is None:
+    if connection_obj.client is None:
         logger.warning("No client connection found")
-        return _disconnect_common()
+        return _disconnect_common(alias)
 
-    if isinstance(__connection_obj.client, MongoClient):
+    if connection_obj.dual_mode:
+        return await _adisconnect_dual_mode(connection_obj, alias)
+
+    if isinstance(connection_obj.client, MongoClient):
         if not raise_error:
-            return disconnect()
+            return disconnect(alias=alias)
         else:
             raise InvalidAction(
                 "The client is configured as sync. Use disconnect() instead."
             )
 
-    await __connection_obj.client.close()
-    __connection_obj.client = None
+    from mongodb_odm.utils.write_buffer import aclose_write_buffers
+
+    """Write all the buffered documents before closing the client."""
+    await aclose_write_buffers(alias)
+
+    await _aclose_loop_clients(connection_obj, connection_obj.client)
+    connection_obj.client = None
+
+    return _disconnect_common(alias)
+
+
+def _get_dual_mode_async_client(connection_obj: Connection) -> AsyncMongoClient[Any]:
+    if connection_obj.async_client is None:
+        connection_obj.async_client = _get_async_connection_client(
+            cast(str, connection_obj.url), connection_obj.connection_kwargs or {}
+        )
+
+    return connection_obj.async_client
+
+
+def _reconnect_after_fork(alias: str, connection_obj: Connection) -> None:
+    """
+    The clients of the parent process can't be used after a fork. Connect
+    again in the child with the same configuration. The clients of the parent
+    are not closed since they still belong to the parent.
+    """
+    logger.info(f'Reconnect "{alias}" in the forked process {os.getpid()}')
+
+    _set_connection(alias, Connection())
+    connect(
+        cast(str, connection_obj.url),
+        databases=connection_obj.databases,
+        connection_kwargs=connection_obj.connection_kwargs,
+        async_is_enabled=connection_obj.async_is_enabled,
+        alias=alias,
+        dual_mode=connection_obj.dual_mode,
+        warmup=connection_obj.warmup,
+    )
+
+
+def _after_fork_in_child() -> None:
+    """
+    Registered with os.register_at_fork(). Reset the state inherited from the
+    parent before any thread of the child can use it: the reserved sequence
+    blocks, the counter caches, the write buffer writers, the cached collections
+    and the locks that a thread of the parent may have held. The clients are
+    replaced on the next get_client() call.
+    """
+    from mongodb_odm.models import _clear_cache
+    from mongodb_odm.utils.counters import reset_counters_after_fork
+    from mongodb_odm.utils.sequence import reset_sequences_after_fork
+    from mongodb_odm.utils.write_buffer import reset_write_buffers_after_fork
+
+    reset_sequences_after_fork()
+    reset_counters_after_fork()
+    reset_write_buffers_after_fork()
+    _clear_cache()
+
+    # Stale until get_client() connects again in this process
+    for connection_obj in [__connection_obj, *__connections.values()]:
+        connection_obj.pid = None
+
 
-    return _disconnect_common()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
 
 
-def get_client() -> Union[AsyncMongoClient[Any], MongoClient[Any]]:
+def get_client(
+    alias: str = DEFAULT_CONNECTION_ALIAS,
+    is_async_action: Optional[bool] = None,
+) -> Union[AsyncMongoClient[Any], MongoClient[Any]]:
     """
     Function should return MongoClient if url exists.
     Otherwise raise ConnectionError error
-    """
-    global __connection_obj
 
-    if __connection_obj.client:
-        return __connection_obj.client
+    is_async_action: In dual mode, return the AsyncMongoClient if True.
+    Otherwise the only client of the connection is returned.
 
-    if __connection_obj.url is None:
+    A new client is created in a forked process, e.g. in the workers of
+    gunicorn with preload_app.
+    """
+    connection_obj = _get_connection(alias)
+
+    if connection_obj.client and connection_obj.pid != os.getpid():
+        _reconnect_after_fork(alias, connection_obj)
+        connection_obj = _get_connection(alias)
+
+    if connection_obj.client:
+        if connection_obj.dual_mode and is_async_action:
+            client = _get_dual_mode_async_client(connection_obj)
+            return _get_loop_client(connection_obj, client)
+        if isinstance(connection_obj.client, AsyncMongoClient):
+            return _get_loop_client(connection_obj, connection_obj.client)
+        return connection_obj.client
+
+    if connection_obj.url is None:
+        if alias != DEFAULT_CONNECTION_ALIAS:
+            raise ConnectionError(f'DB connection URL of "{alias}" is not provided')
         raise ConnectionError("DB connection URL is not provided")
 
-    databases = __connection_obj.databases
-    connection_kwargs = __connection_obj.connection_kwargs
-    async_is_enabled = __connection_obj.async_is_enabled
+    databases = connection_obj.databases
+    connection_kwargs = connection_obj.connection_kwargs
+    async_is_enabled = connection_obj.async_is_enabled
 
-    return connect(
-        __connection_obj.url,
+    connect(
+        connection_obj.url,
         databases=databases,
         connection_kwargs=connection_kwargs,
         async_is_enabled=async_is_enabled,
+        alias=alias,
+        dual_mode=connection_obj.dual_mode,
     )
+    return get_client(alias, is_async_action)
 
 
 def db(
     database: Optional[str] = None,
     is_async_action: Optional[bool] = None,
+    alias: str = DEFAULT_CONNECTION_ALIAS,
 ) -> Union[Database[Any], AsyncDatabase[Any]]:
-    global __connection_obj
+    connection_obj = _get_connection(alias)
 
     if is_async_action is None:
-        is_async_action = __connection_obj.async_is_enabled
+        is_async_action = connection_obj.async_is_enabled
 
-    client = get_client()
+    client = get_client(alias, is_async_action)
 
     if isinstance(client, MongoClient) and is_async_action is True:
         raise InvalidAction("The client is not configured as async")
@@ -191,7 +589,7 @@ def db(
         raise InvalidAction("The client is not configured as sync")
 
     if database:
-        if not __connection_obj.databases or database not in __connection_obj.databases:
+        if not connection_obj.databases or database not in connection_obj.databases:
             """
             Make sure valid database strings are passed
             and avoid creating invalid databases by mistake
@@ -208,24 +606,28 @@ def db(
         return client.get_database()
 
 
-def drop_database(database: Optional[str] = None) -> None:
-    collection = db(database, is_async_action=False)
+def drop_database(
+    database: Optional[str] = None, alias: str = DEFAULT_CONNECTION_ALIAS
+) -> None:
+    collection = db(database, is_async_action=False, alias=alias)
 
     collection.command("dropDatabase")
 
 
-async def adrop_database(database: Optional[str] = None) -> None:  # noqa
-    collection = db(database, is_async_action=True)
+async def adrop_database(  # noqa
+    database: Optional[str] = None, alias: str = DEFAULT_CONNECTION_ALIAS
+) -> None:
+    collection = db(database, is_async_action=True, alias=alias)
 
     collection = cast(AsyncDatabase[Any], collection)
 
     await collection.command("dropDatabase")
 
 
-def is_async() -> bool:
-    global __connection_obj
+def is_async(alias: str = DEFAULT_CONNECTION_ALIAS) -> bool:
+    connection_obj = _get_connection(alias)
 
-    if not __connection_obj.client:
+    if not connection_obj.client:
         raise ConnectionError("No connection established. Please connect first.")
 
-    return isinstance(__connection_obj.client, AsyncMongoClient)
+    return isinstance(connection_obj.client, AsyncMongoClient)
@@ -16,3 +16,23 @@ class InvalidAction(Exception):
 
 class InvalidConfiguration(Exception):
     pass
+
+
+class WriteBufferFull(Exception):
+    pass
+
+
+class VersionConflictError(Exception):
+    pass
+
+
+class CollectionScanError(Exception):
+    pass
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class QueryBudgetExceeded(Exception):
+    pass
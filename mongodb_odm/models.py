@@ -1,7 +1,10 @@
-from collections.abc import AsyncIterator, Iterator, Sequence
+import time
+from collections.abc import AsyncIterator, Awaitable, Iterator, Sequence
+from contextlib import AbstractContextManager
 from datetime import datetime
 from typing import (
     Any,
+    Callable,
     Optional,
     Union,
     cast,
@@ -9,20 +12,87 @@ from typing import (
 
 from mongodb_odm.connection import db, get_client
 from mongodb_odm.data_conversion import dict2obj
-from mongodb_odm.exceptions import InvalidConfiguration, ObjectDoesNotExist
+from mongodb_odm.exceptions import (
+    CollectionScanError,
+    InvalidConfiguration,
+    ObjectDoesNotExist,
+    VersionConflictError,
+)
 from mongodb_odm.fields import Field
 from mongodb_odm.types import DICT_TYPE, SORT_TYPE, ODMObjectId, WriteOp
 from mongodb_odm.utils._internal_models import CollectionConfig, RelationalFieldInfo
+from mongodb_odm.utils.batch import (
+    BatchProgress,
+    BatchThrottle,
+    get_batch_filter,
+    get_batch_ids_filter,
+)
+from mongodb_odm.utils.collection_options import (
+    READ_CONCERN_TYPE,
+    READ_OPTIONS,
+    READ_PREFERENCE_TYPE,
+    WRITE_CONCERN_TYPE,
+    WRITE_OPTIONS,
+    get_collection_options,
+    get_options_key,
+    get_override_options,
+    pop_collection_options,
+)
+from mongodb_odm.utils.counters import ShardedCounter
+from mongodb_odm.utils.deadline import (
+    OPERATION_AGGREGATE,
+    OPERATION_READ,
+    OPERATION_WRITE,
+    get_max_time_ms,
+    get_operation_timeout,
+)
+from mongodb_odm.utils.explain import (
+    ExplainSummary,
+    get_explain_summary,
+    is_collection_scan_forbidden,
+)
+from mongodb_odm.utils.profiling import (
+    PHASE_HYDRATION,
+    PHASE_NETWORK,
+    PHASE_SERIALIZATION,
+    PHASE_VALIDATION,
+    atime_iteration,
+    time_iteration,
+    time_phase,
+)
+from mongodb_odm.utils.query_shape import get_filter_shape, record_query
+from mongodb_odm.utils.sequence import (
+    FieldSequence,
+    get_model_sequences,
+    reset_sequences,
+)
+from mongodb_odm.utils.slow_query import (
+    alog_slow_iteration,
+    get_pipeline_filter,
+    get_write_count,
+    log_slow_iteration,
+    log_slow_query,
+)
+from mongodb_odm.utils.transaction import get_current_session, outside_transaction
 from mongodb_odm.utils.utils import (
     convert_model_to_collection,
+    get_connection_alias,
     get_database_name,
+    get_max_time_ms_options,
     get_model_fields,
     get_relationship_fields_info,
+    get_version_field,
 )
 from mongodb_odm.utils.validation import validate_filter_dict
 from pydantic import BaseModel, PrivateAttr
 from pydantic._internal._model_construction import ModelMetaclass
-from pymongo import AsyncMongoClient, IndexModel, MongoClient
+from pymongo import (
+    ASCENDING,
+    AsyncMongoClient,
+    IndexModel,
+    MongoClient,
+    ReadPreference,
+)
 from pymongo.asynchronous.client_session import AsyncClientSession
 from pymongo.asynchronous.collection import AsyncCollection
 from pymongo.asynchronous.cursor import AsyncCursor
@@ -38,16 +108,62 @@ RELATION_TYPE = dict[str, RelationalFieldInfo]
 
 _cashed_collection: dict[Any, CollectionConfig] = {}
 _cashed_field_info: dict[str, RELATION_TYPE] = {}
+_cashed_counters: dict[tuple[Any, ...], ShardedCounter] = {}
+_cashed_collection_handles: dict[tuple[Any, ...], Any] = {}
+
+
+def _clear_collection_handles(client: Any) -> None:
+    """Forget the collection handles of a closed client"""
+    for key, collection in list(_cashed_collection_handles.items()):
+        if collection.database.client is client:
+            del _cashed_collection_handles[key]
+
+
+def _get_connection_models(alias: str) -> list[type["Document"]]:
+    """Every model of the connection, child models included"""
+    models: list[type[Document]] = []
+    pending = list(Document.__subclasses__())
+    while pending:
+        model = pending.pop(0)
+        pending.extend(model.__subclasses__())
+        if model._connection_alias() == alias:
+            models.append(model)
+
+    return models
+
+
+def _clear_connection_cache(alias: str) -> None:
+    """Forget the cached state of the models of one connection"""
+    models = set(_get_connection_models(alias))
+    for key in list(_cashed_collection_handles.keys()):
+        if key[1] == alias:
+            del _cashed_collection_handles[key]
+
+    for key in list(_cashed_counters.keys()):
+        if key[0] in models:
+            del _cashed_counters[key]
+
+    for model in models:
+        _cashed_collection.pop(model, None)
+        _cashed_field_info.pop(f"{hash(model)}-field_info", None)
+        for sequence in get_model_sequences(model):
+            sequence.reset()
 
 
 def _clear_cache() -> None:
-    global _cashed_collection, _cashed_field_info
+    global _cashed_collection, _cashed_field_info, _cashed_counters
+    _cashed_collection_handles.clear()
     for key in list(_cashed_collection.keys()):
         del _cashed_collection[key]
 
     for key in list(_cashed_field_info.keys()):
         del _cashed_field_info[key]
 
+    for key in list(_cashed_counters.keys()):
+        del _cashed_counters[key]
+
+    reset_sequences()
+
 
 class ODMMeta(ModelMetaclass):
     def __getattr__(cls, name: str) -> str:
@@ -82,6 +198,18 @@ class _BaseDocument(BaseModel, metaclass=ODMMeta):
         index_inheritance_field: bool = True
         indexes: list[IndexModel] = []
         database: Optional[str] = None
+        connection: Optional[str] = None
+        version_field: Optional[str] = None
+        sequences: list[FieldSequence] = []
+        read_preference: Optional[READ_PREFERENCE_TYPE] = None
+        max_staleness_seconds: Optional[int] = None
+        read_preference_tags: Optional[list[dict[str, str]]] = None
+        read_concern: Optional[READ_CONCERN_TYPE] = None
+        write_concern: Optional[WRITE_CONCERN_TYPE] = None
+        journal: Optional[bool] = None
+        read_max_time_ms: Optional[int] = None
+        write_max_time_ms: Optional[int] = None
+        aggregate_max_time_ms: Optional[int] = None
 
         """
         Definition of ODMConfig fields:
@@ -100,6 +228,33 @@ class _BaseDocument(BaseModel, metaclass=ODMMeta):
 
         database: Handle multiple database configurations using this field.
         The default database will be None.
+
+        connection: Alias of the connection passed to connect(..., alias=...).
+        Use it to keep models on different clusters. The default is "default".
+
+        version_field: Enable optimistic concurrency control by storing
+        a version counter in this field (e.g. "_v"). The field should not be
+        declared in the model. update() will only match the loaded version
+        and raise VersionConflictError if the document was changed meanwhile.
+
+        sequences: Define list of FieldSequence to assign increasing integer values
+        to fields on create.
+
+        read_preference: Read preference of find, count_documents and aggregate
+        as a mode name ("secondaryPreferred") or a pymongo read preference.
+        max_staleness_seconds and read_preference_tags refine the mode name.
+        Every read method also accepts a read_preference argument.
+
+        read_concern: Read concern level of the reads, like "majority".
+
+        write_concern, journal: The w value (1, "majority") and the j option of
+        the write concern, or a pymongo WriteConcern. Every read method accepts
+        a read_concern argument and every write method a write_concern argument.
+
+        read_max_time_ms, write_max_time_ms, aggregate_max_time_ms: Default time
+        limit in milliseconds of find and count, write and aggregate operations.
+        Reads and aggregations send it as maxTimeMS, writes use a client-side
+        timeout. None means no limit.
         """
 
     def __setattr__(self, key: str, value: Any) -> None:
@@ -172,7 +327,11 @@ class _BaseDocument(BaseModel, metaclass=ODMMeta):
             collection_name=convert_model_to_collection(model),
             child_collection_name=child_collection_name,
             database_name=get_database_name(model),
+            connection_alias=get_connection_alias(model),
             has_children=has_children,
+            version_field=get_version_field(model),
+            max_time_ms=get_max_time_ms_options(model),
+            collection_options=get_collection_options(model),
         )
         return _cashed_collection[cls]
 
@@ -181,10 +340,18 @@ class _BaseDocument(BaseModel, metaclass=ODMMeta):
         config = cls.__get_collection_config()
         return config.database_name
 
+    @classmethod
+    def _connection_alias(cls) -> str:
+        return cls.__get_collection_config().connection_alias
+
     @classmethod
     def _get_collection_name(cls) -> str:
         return cls.__get_collection_config().collection_name
 
+    @classmethod
+    def _get_version_field(cls) -> Optional[str]:
+        return cls.__get_collection_config().version_field
+
     @classmethod
     def _get_child(cls) -> Optional[str]:
         """
@@ -200,16 +367,43 @@ class _BaseDocument(BaseModel, metaclass=ODMMeta):
         return cls.__get_collection_config().has_children
 
     @classmethod
-    def _get_collection(cls) -> Collection[Any]:
-        db_connection = db(cls._database_name())
-        collection = db_connection[cls._get_collection_name()]
+    def _get_collection_handle(
+        cls, is_async_action: Optional[bool], overrides: DICT_TYPE
+    ) -> Any:
+        """
+        Get the collection with the ODMConfig options and the per-call overrides.
+        Handles are cached by model, client and options until disconnect.
+        """
+        options = {
+            **cls.__get_collection_config().collection_options,
+            **get_override_options(overrides, getattr(cls.ODMConfig, "journal", None)),
+        }
+
+        alias = cls._connection_alias()
+        # Every event loop has its own async client
+        client = get_client(alias, is_async_action)
+        key = (cls, alias, is_async_action, id(client), get_options_key(options))
+        if key not in _cashed_collection_handles:
+            db_connection = db(
+                cls._database_name(), is_async_action=is_async_action, alias=alias
+            )
+            collection = db_connection[cls._get_collection_name()]
+            if options:
+                collection = collection.with_options(**options)
+            _cashed_collection_handles[key] = collection
+
+        return _cashed_collection_handles[key]
+
+    @classmethod
+    def _get_collection(cls, **overrides: Any) -> Collection[Any]:
+        """overrides: read_preference, read_concern or write_concern of the call"""
+        collection = cls._get_collection_handle(None, overrides)
 
         return cast(Collection[Any], collection)
 
     @classmethod
-    def _async_get_collection(cls) -> AsyncCollection[Any]:
-        db_connection = db(cls._database_name(), is_async_action=True)
-        collection = db_connection[cls._get_collection_name()]
+    def _async_get_collection(cls, **overrides: Any) -> AsyncCollection[Any]:
+        collection = cls._get_collection_handle(True, overrides)
 
         return cast(AsyncCollection[Any], collection)
 
@@ -270,7 +464,7 @@ class _BaseDocument(BaseModel, metaclass=ODMMeta):
 
     @classmethod
     def start_session(cls, **kwargs: Any) -> ClientSession:
-        client = get_client()
+        client = get_client(cls._connection_alias(), is_async_action=False)
         if not isinstance(client, MongoClient):
             raise InvalidConfiguration(
                 "Client is not configured for sync operations use 'astart_session' instead."
@@ -280,7 +474,7 @@ class _BaseDocument(BaseModel, metaclass=ODMMeta):
 
     @classmethod
     def astart_session(cls, **kwargs: Any) -> AsyncClientSession:
-        client = get_client()
+        client = get_client(cls._connection_alias(), is_async_action=True)
         if not isinstance(client, AsyncMongoClient):
             raise InvalidConfiguration(
                 "Client is not configured for async operations use 'start_session' instead."
@@ -288,6 +482,54 @@ class _BaseDocument(BaseModel, metaclass=ODMMeta):
 
         return client.start_session(**kwargs)
 
+    @classmethod
+    def _get_max_time_ms(
+        cls, operation_type: str, max_time_ms: Optional[int] = None
+    ) -> Optional[int]:
+        """
+        Time limit of an operation. The value passed by the caller overrides
+        the ODMConfig default and both are limited by the current deadline.
+        """
+        if max_time_ms is None:
+            max_time_ms = cls.__get_collection_config().max_time_ms.get(operation_type)
+
+        return get_max_time_ms(max_time_ms)
+
+    @classmethod
+    def _get_write_timeout(cls) -> AbstractContextManager[Any]:
+        """Write commands don't accept maxTimeMS, limit them with a client timeout"""
+        return get_operation_timeout(cls._get_max_time_ms(OPERATION_WRITE))
+
+    @classmethod
+    def _get_operation_kwargs(
+        cls,
+        kwargs: DICT_TYPE,
+        is_async: bool = False,
+        max_time_ms_key: Optional[str] = None,
+        operation_type: str = OPERATION_READ,
+    ) -> DICT_TYPE:
+        """
+        Prepare the keyword arguments of a pymongo collection operation.
+        Bind the session of the current transaction if the caller has not passed one.
+        Set the time limit as `max_time_ms_key` if the operation accepts one.
+        """
+        if kwargs.get("session") is None:
+            session = get_current_session()
+            session_type = AsyncClientSession if is_async else ClientSession
+            # A session can only be used with the client that started it
+            if session is not None and isinstance(session, session_type):
+                if session.client is get_client(cls._connection_alias(), is_async):
+                    kwargs = {**kwargs, "session": session}
+
+        if max_time_ms_key is not None:
+            max_time_ms = cls._get_max_time_ms(
+                operation_type, kwargs.get(max_time_ms_key)
+            )
+            if max_time_ms is not None:
+                kwargs = {**kwargs, max_time_ms_key: max_time_ms}
+
+        return kwargs
+
     def __str__(self) -> str:
         return super().__repr__()
 
@@ -300,6 +542,7 @@ class Document(_BaseDocument):
 
     _id: ODMObjectId = PrivateAttr(default_factory=ODMObjectId)
     id: ODMObjectId = Field(default_factory=ODMObjectId)
+    _version: Optional[int] = PrivateAttr(default=None)
 
     def __init__(self, *args: list[Any], **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
@@ -314,33 +557,85 @@ class Document(_BaseDocument):
         object.__setattr__(self, "id", id)
         object.__setattr__(self, "_id", id)
 
+        version_field = self._get_version_field()
+        if version_field is not None:
+            # Keep the loaded version to detect concurrent updates.
+            object.__setattr__(self, "_version", kwargs.get(version_field))
+
     def _prepare_crate_data(self, **kwargs: Any) -> DICT_TYPE:
         data = self.to_mongo()
         if self._get_child() is not None:
             # Assign the '_cls' field if the model is a child.
             data = {**self.get_inheritance_key(), **data}
 
+        version_field = self._get_version_field()
+        if version_field is not None:
+            # Every new document starts with the first version.
+            data[version_field] = 1
+            object.__setattr__(self, "_version", 1)
+
         return data
 
+    def _assign_sequence_values(self) -> None:
+        for sequence in get_model_sequences(type(self)):
+            if getattr(self, sequence.field, None) is None:
+                self.__dict__[sequence.field] = sequence.next_value(type(self))
+
+    async def _async_assign_sequence_values(self) -> None:
+        for sequence in get_model_sequences(type(self)):
+            if getattr(self, sequence.field, None) is None:
+                self.__dict__[sequence.field] = await sequence.anext_value(type(self))
+
+    @classmethod
+    def next_sequence_value(cls, field: str) -> int:
+        """Get the next value of a field sequence without creating a document"""
+        return cls._get_sequence(field).next_value(cls)
+
+    @classmethod
+    async def anext_sequence_value(cls, field: str) -> int:
+        return await cls._get_sequence(field).anext_value(cls)
+
+    @classmethod
+    def _get_sequence(cls, field: str) -> FieldSequence:
+        for sequence in get_model_sequences(cls):
+            if sequence.field == field:
+                return sequence
+
+        raise InvalidConfiguration(f'No sequence is defined for the field "{field}"')
+
     def _update_new_id(self, new_id: ODMObjectId) -> None:
         self.__dict__.update({"_id": new_id, "id": new_id})
 
     def create(self, **kwargs: Any) -> Self:
-        data = self._prepare_crate_data(**kwargs)
+        self._assign_sequence_values()
+        with time_phase(type(self), "create", PHASE_SERIALIZATION):
+            data = self._prepare_crate_data(**kwargs)
 
-        _collection = self._get_collection()
-        result = _collection.insert_one(data, **kwargs)
+        _collection = self._get_collection(
+            **pop_collection_options(kwargs, WRITE_OPTIONS)
+        )
+        kwargs = self._get_operation_kwargs(kwargs)
+        with self._get_write_timeout():
+            with time_phase(type(self), "create", PHASE_NETWORK):
+                result = _collection.insert_one(data, **kwargs)
         inserted_id = result.inserted_id
         self._update_new_id(inserted_id)
 
         return self
 
     async def acreate(self, **kwargs: Any) -> Self:
-        data = self._prepare_crate_data(**kwargs)
+        await self._async_assign_sequence_values()
+        with time_phase(type(self), "acreate", PHASE_SERIALIZATION):
+            data = self._prepare_crate_data(**kwargs)
 
-        _collection = self._async_get_collection()
-        inserted_id = (await _collection.insert_one(data, **kwargs)).inserted_id
-        self._update_new_id(inserted_id)
+        _collection = self._async_get_collection(
+            **pop_collection_options(kwargs, WRITE_OPTIONS)
+        )
+        kwargs = self._get_operation_kwargs(kwargs, is_async=True)
+        with self._get_write_timeout():
+            with time_phase(type(self), "acreate", PHASE_NETWORK):
+                result = await _collection.insert_one(data, **kwargs)
+        self._update_new_id(result.inserted_id)
 
         return self
 
@@ -356,6 +651,47 @@ class Document(_BaseDocument):
 
         return filter
 
+    @classmethod
+    def _has_declared_indexes(cls) -> bool:
+        return any(
+            getattr(getattr(kls, "ODMConfig", None), "indexes", None)
+            for kls in cls.__mro__
+        )
+
+    @classmethod
+    def _check_collection_scan(
+        cls, summary: ExplainSummary, filter: Optional[DICT_TYPE]
+    ) -> None:
+        if summary.is_collscan and cls._has_declared_indexes():
+            raise CollectionScanError(
+                f"{cls.__name__} query {get_filter_shape(filter)} runs as a "
+                f'COLLSCAN on "{summary.collection_name}".'
+            )
+
+    @classmethod
+    def _before_query(
+        cls,
+        operation: str,
+        filter: Optional[DICT_TYPE],
+        sort: Optional[SORT_TYPE] = None,
+    ) -> None:
+        record_query(cls, operation, filter, sort)
+        # A read of the whole collection is a COLLSCAN, no need to explain it
+        if is_collection_scan_forbidden() and (filter or sort):
+            cls._check_collection_scan(cls.explain(filter, sort=sort), filter)
+
+    @classmethod
+    async def _abefore_query(
+        cls,
+        operation: str,
+        filter: Optional[DICT_TYPE],
+        sort: Optional[SORT_TYPE] = None,
+    ) -> None:
+        record_query(cls, operation, filter, sort)
+        # A read of the whole collection is a COLLSCAN, no need to explain it
+        if is_collection_scan_forbidden() and (filter or sort):
+            cls._check_collection_scan(await cls.aexplain(filter, sort=sort), filter)
+
     @classmethod
     def find_raw(
         cls,
@@ -368,7 +704,10 @@ class Document(_BaseDocument):
 
         filter = cls._validate_and_prepare_filter(filter)
 
-        _collection = cls._get_collection()
+        _collection = cls._get_collection(
+            **pop_collection_options(kwargs, READ_OPTIONS)
+        )
+        kwargs = cls._get_operation_kwargs(kwargs, max_time_ms_key="max_time_ms")
 
         if projection:
             return _collection.find(filter, projection, **kwargs)
@@ -386,13 +725,52 @@ class Document(_BaseDocument):
             projection = {}
 
         filter = cls._validate_and_prepare_filter(filter)
-        _collection = cls._async_get_collection()
+        _collection = cls._async_get_collection(
+            **pop_collection_options(kwargs, READ_OPTIONS)
+        )
+        kwargs = cls._get_operation_kwargs(
+            kwargs, is_async=True, max_time_ms_key="max_time_ms"
+        )
 
         if projection:
             return _collection.find(filter, projection, **kwargs)
 
         return _collection.find(filter, **kwargs)
 
+    @classmethod
+    def explain(
+        cls,
+        filter: Optional[DICT_TYPE] = None,
+        sort: Optional[SORT_TYPE] = None,
+        projection: Optional[DICT_TYPE] = None,
+        **kwargs: Any,
+    ) -> ExplainSummary:
+        """
+        Summary of the winning plan and the execution stats of a find. It runs
+        outside the current transaction, explain is not allowed in transactions.
+        """
+        with outside_transaction():
+            qs = cls.find_raw(filter, projection, **kwargs)
+        if sort:
+            qs = qs.sort(sort)
+
+        return get_explain_summary(cls._get_collection_name(), qs.explain())
+
+    @classmethod
+    async def aexplain(
+        cls,
+        filter: Optional[DICT_TYPE] = None,
+        sort: Optional[SORT_TYPE] = None,
+        projection: Optional[DICT_TYPE] = None,
+        **kwargs: Any,
+    ) -> ExplainSummary:
+        with outside_transaction():
+            qs = cls.afind_raw(filter, projection, **kwargs)
+        if sort:
+            qs = qs.sort(sort)
+
+        return get_explain_summary(cls._get_collection_name(), await qs.explain())
+
     @classmethod
     def _prepare_query(
         cls,
@@ -448,19 +826,38 @@ class Document(_BaseDocument):
         limit: Optional[int] = None,
         **kwargs: Any,
     ) -> Iterator[Self]:
-        qs = cls.find_raw(filter, projection, **kwargs)
-        qs = cls._prepare_query(qs, sort, skip, limit)
+        return log_slow_iteration(
+            cls,
+            "find",
+            cls._find(filter, projection, sort, skip, limit, **kwargs),
+            filter,
+            sort,
+            projection,
+        )
 
-        if cls._has_children():
-            model_children = cls._get_child_models()
-            for data in qs:
-                yield cls._prepare_class_instance(model_children, data)
-        else:
-            for data in qs:
-                yield cls(**data)
+    @classmethod
+    def _find(
+        cls,
+        filter: Optional[DICT_TYPE] = None,
+        projection: Optional[DICT_TYPE] = None,
+        sort: Optional[SORT_TYPE] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        **kwargs: Any,
+    ) -> Iterator[Self]:
+        cls._before_query("find", filter, sort)
+        with time_phase(cls, "find", PHASE_VALIDATION):
+            qs = cls.find_raw(filter, projection, **kwargs)
+            qs = cls._prepare_query(qs, sort, skip, limit)
+
+        model_children = cls._get_child_models() if cls._has_children() else {}
+        for data in time_iteration(cls, "find", qs):
+            with time_phase(cls, "find", PHASE_HYDRATION):
+                obj = cls._prepare_class_instance(model_children, data)
+            yield obj
 
     @classmethod
-    async def afind(
+    def afind(
         cls,
         filter: Optional[DICT_TYPE] = None,
         projection: Optional[DICT_TYPE] = None,
@@ -469,16 +866,35 @@ class Document(_BaseDocument):
         limit: Optional[int] = None,
         **kwargs: Any,
     ) -> AsyncIterator[Self]:
-        qs = cls.afind_raw(filter, projection, **kwargs)
-        qs = cls._prepare_query(qs, sort, skip, limit)
+        return alog_slow_iteration(
+            cls,
+            "find",
+            cls._afind(filter, projection, sort, skip, limit, **kwargs),
+            filter,
+            sort,
+            projection,
+        )
 
-        if cls._has_children():
-            model_children = cls._get_child_models()
-            async for data in qs:
-                yield cls._prepare_class_instance(model_children, data)
-        else:
-            async for data in qs:
-                yield cls(**data)
+    @classmethod
+    async def _afind(
+        cls,
+        filter: Optional[DICT_TYPE] = None,
+        projection: Optional[DICT_TYPE] = None,
+        sort: Optional[SORT_TYPE] = None,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[Self]:
+        await cls._abefore_query("find", filter, sort)
+        with time_phase(cls, "afind", PHASE_VALIDATION):
+            qs = cls.afind_raw(filter, projection, **kwargs)
+            qs = cls._prepare_query(qs, sort, skip, limit)
+
+        model_children = cls._get_child_models() if cls._has_children() else {}
+        async for data in atime_iteration(cls, "afind", qs):
+            with time_phase(cls, "afind", PHASE_HYDRATION):
+                obj = cls._prepare_class_instance(model_children, data)
+            yield obj
 
     @classmethod
     def find_one(
@@ -488,23 +904,26 @@ class Document(_BaseDocument):
         sort: Optional[SORT_TYPE] = None,
         **kwargs: Any,
     ) -> Optional[Self]:
-        qs = cls.find_raw(filter, projection=projection, **kwargs)
-        if sort:
-            qs = qs.sort(sort)
+        cls._before_query("find_one", filter, sort)
+        with time_phase(cls, "find_one", PHASE_VALIDATION):
+            qs = cls.find_raw(filter, projection=projection, **kwargs)
+            if sort:
+                qs = qs.sort(sort)
 
         obj = None
-        for data in qs.limit(1):
+        for data in time_iteration(cls, "find_one", qs.limit(1)):
             """limit 1 is equivalent to find_one and that is implemented in pymongo find_one"""
             obj = data
 
         if not obj:
             return None
 
-        if cls._has_children():
-            model_children = cls._get_child_models()
-            return cls._prepare_class_instance(model_children, data)
+        with time_phase(cls, "find_one", PHASE_HYDRATION):
+            if cls._has_children():
+                model_children = cls._get_child_models()
+                return cls._prepare_class_instance(model_children, data)
 
-        return cls(**data)
+            return cls(**data)
 
     @classmethod
     async def afind_one(
@@ -514,23 +933,26 @@ class Document(_BaseDocument):
         sort: Optional[SORT_TYPE] = None,
         **kwargs: Any,
     ) -> Optional[Self]:
-        qs = cls.afind_raw(filter, projection=projection, **kwargs)
-        if sort:
-            qs = qs.sort(sort)
+        await cls._abefore_query("find_one", filter, sort)
+        with time_phase(cls, "afind_one", PHASE_VALIDATION):
+            qs = cls.afind_raw(filter, projection=projection, **kwargs)
+            if sort:
+                qs = qs.sort(sort)
 
         obj = None
-        async for data in qs.limit(1):
+        async for data in atime_iteration(cls, "afind_one", qs.limit(1)):
             """limit 1 is equivalent to find_one and that is implemented in pymongo find_one"""
             obj = data
 
         if not obj:
             return None
 
-        if cls._has_children():
-            model_children = cls._get_child_models()
-            return cls._prepare_class_instance(model_children, data)
+        with time_phase(cls, "afind_one", PHASE_HYDRATION):
+            if cls._has_children():
+                model_children = cls._get_child_models()
+                return cls._prepare_class_instance(model_children, data)
 
-        return cls(**data)
+            return cls(**data)
 
     @classmethod
     def get(
@@ -588,21 +1010,35 @@ class Document(_BaseDocument):
 
     @classmethod
     def count_documents(cls, filter: Optional[DICT_TYPE] = None, **kwargs: Any) -> int:
-        filter = cls._validate_and_prepare_filter(filter)
+        cls._before_query("count_documents", filter)
+        with time_phase(cls, "count_documents", PHASE_VALIDATION):
+            filter = cls._validate_and_prepare_filter(filter)
 
-        _collection = cls._get_collection()
+        _collection = cls._get_collection(
+            **pop_collection_options(kwargs, READ_OPTIONS)
+        )
+        kwargs = cls._get_operation_kwargs(kwargs, max_time_ms_key="maxTimeMS")
 
-        return _collection.count_documents(filter, **kwargs)
+        with time_phase(cls, "count_documents", PHASE_NETWORK):
+            return _collection.count_documents(filter, **kwargs)
 
     @classmethod
     async def acount_documents(
         cls, filter: Optional[DICT_TYPE] = None, **kwargs: Any
     ) -> int:
-        filter = cls._validate_and_prepare_filter(filter)
+        await cls._abefore_query("count_documents", filter)
+        with time_phase(cls, "acount_documents", PHASE_VALIDATION):
+            filter = cls._validate_and_prepare_filter(filter)
 
-        _collection = cls._async_get_collection()
+        _collection = cls._async_get_collection(
+            **pop_collection_options(kwargs, READ_OPTIONS)
+        )
+        kwargs = cls._get_operation_kwargs(
+            kwargs, is_async=True, max_time_ms_key="maxTimeMS"
+        )
 
-        return await _collection.count_documents(filter, **kwargs)
+        with time_phase(cls, "acount_documents", PHASE_NETWORK):
+            return await _collection.count_documents(filter, **kwargs)
 
     @classmethod
     def exists(cls, filter: Optional[DICT_TYPE] = None, **kwargs: Any) -> bool:
@@ -666,18 +1102,42 @@ class Document(_BaseDocument):
         inheritance_filter: bool = True,
         **kwargs: Any,
     ) -> Iterator[Any]:
-        pipeline = cls._prepare_aggregation_pipeline(
-            pipeline, inheritance_filter=inheritance_filter
+        return log_slow_iteration(
+            cls,
+            "aggregate",
+            cls._aggregate(pipeline, get_raw, inheritance_filter, **kwargs),
+            get_pipeline_filter(pipeline),
         )
-        _collection = cls._get_collection()
 
-        query = _collection.aggregate(pipeline, **kwargs)
+    @classmethod
+    def _aggregate(
+        cls,
+        pipeline: list[Any],
+        get_raw: bool = False,
+        inheritance_filter: bool = True,
+        **kwargs: Any,
+    ) -> Iterator[Any]:
+        with time_phase(cls, "aggregate", PHASE_VALIDATION):
+            pipeline = cls._prepare_aggregation_pipeline(
+                pipeline, inheritance_filter=inheritance_filter
+            )
+        _collection = cls._get_collection(
+            **pop_collection_options(kwargs, READ_OPTIONS)
+        )
+        kwargs = cls._get_operation_kwargs(
+            kwargs, max_time_ms_key="maxTimeMS", operation_type=OPERATION_AGGREGATE
+        )
+
+        with time_phase(cls, "aggregate", PHASE_NETWORK):
+            query = _collection.aggregate(pipeline, **kwargs)
 
-        for obj in query:
-            yield cls._get_aggregation_obj(obj, get_raw=get_raw)
+        for obj in time_iteration(cls, "aggregate", query):
+            with time_phase(cls, "aggregate", PHASE_HYDRATION):
+                obj = cls._get_aggregation_obj(obj, get_raw=get_raw)
+            yield obj
 
     @classmethod
-    async def aaggregate(
+    def aaggregate(
         cls,
         pipeline: list[Any],
         get_raw: bool = False,
@@ -687,14 +1147,41 @@ class Document(_BaseDocument):
         """
         Return an async iterator for MongoDB aggregation results.
         """
-        pipeline = cls._prepare_aggregation_pipeline(
-            pipeline, inheritance_filter=inheritance_filter
+        return alog_slow_iteration(
+            cls,
+            "aggregate",
+            cls._aaggregate(pipeline, get_raw, inheritance_filter, **kwargs),
+            get_pipeline_filter(pipeline),
         )
-        _collection = cls._async_get_collection()
-        query = await _collection.aggregate(pipeline, **kwargs)
 
-        async for obj in query:
-            yield cls._get_aggregation_obj(obj, get_raw=get_raw)
+    @classmethod
+    async def _aaggregate(
+        cls,
+        pipeline: list[Any],
+        get_raw: bool = False,
+        inheritance_filter: bool = True,
+        **kwargs: Any,
+    ) -> AsyncIterator[Any]:
+        with time_phase(cls, "aaggregate", PHASE_VALIDATION):
+            pipeline = cls._prepare_aggregation_pipeline(
+                pipeline, inheritance_filter=inheritance_filter
+            )
+        _collection = cls._async_get_collection(
+            **pop_collection_options(kwargs, READ_OPTIONS)
+        )
+        kwargs = cls._get_operation_kwargs(
+            kwargs,
+            is_async=True,
+            max_time_ms_key="maxTimeMS",
+            operation_type=OPERATION_AGGREGATE,
+        )
+        with time_phase(cls, "aaggregate", PHASE_NETWORK):
+            query = await _collection.aggregate(pipeline, **kwargs)
+
+        async for obj in atime_iteration(cls, "aaggregate", query):
+            with time_phase(cls, "aaggregate", PHASE_HYDRATION):
+                obj = cls._get_aggregation_obj(obj, get_raw=get_raw)
+            yield obj
 
     @classmethod
     def _get_pipeline_for_random_one(cls, filter: DICT_TYPE) -> list[DICT_TYPE]:
@@ -738,61 +1225,133 @@ class Document(_BaseDocument):
 
             self.__dict__.update({"updated_at": datetime_now})
 
+        version_field = self._get_version_field()
+        if version_field is not None:
+            # Increase the version with the same write.
+            updated_data["$inc"] = {**updated_data.get("$inc", {}), version_field: 1}
+
         return updated_data
 
+    def _get_update_filter(self) -> DICT_TYPE:
+        filter: DICT_TYPE = {"_id": self.id}
+
+        version_field = self._get_version_field()
+        if version_field is not None:
+            """Only match the document if nobody has updated it since it was loaded."""
+            filter[version_field] = self._version
+
+        return filter
+
+    def _check_version_conflict(self, result: UpdateResult) -> None:
+        if self._get_version_field() is None:
+            return
+
+        if result.matched_count == 0:
+            raise VersionConflictError(
+                f"{type(self).__name__} {self.id} was modified or deleted by another operation."
+            )
+
+        object.__setattr__(self, "_version", (self._version or 0) + 1)
+
     def update(self, raw: Optional[DICT_TYPE] = None, **kwargs: Any) -> UpdateResult:
-        filter = {"_id": self.id}
+        filter = self._get_update_filter()
 
-        updated_data = self._get_update_dict(raw)
+        with time_phase(type(self), "update", PHASE_SERIALIZATION):
+            updated_data = self._get_update_dict(raw)
 
-        return self.update_one(filter, updated_data, **kwargs)
+        result = self.update_one(filter, updated_data, **kwargs)
+        self._check_version_conflict(result)
+
+        return result
 
     async def aupdate(
         self, raw: Optional[DICT_TYPE] = None, **kwargs: Any
     ) -> UpdateResult:
-        filter = {"_id": self.id}
+        filter = self._get_update_filter()
+
+        with time_phase(type(self), "aupdate", PHASE_SERIALIZATION):
+            updated_data = self._get_update_dict(raw)
 
-        updated_data = self._get_update_dict(raw)
+        result = await self.aupdate_one(filter, updated_data, **kwargs)
+        self._check_version_conflict(result)
 
-        return await self.aupdate_one(filter, updated_data, **kwargs)
+        return result
 
     @classmethod
     def update_one(
         cls, filter: DICT_TYPE, data: DICT_TYPE, **kwargs: Any
     ) -> UpdateResult:
-        filter = cls._validate_and_prepare_filter(filter)
+        with time_phase(cls, "update_one", PHASE_VALIDATION):
+            filter = cls._validate_and_prepare_filter(filter)
 
-        _collection = cls._get_collection()
+        _collection = cls._get_collection(
+            **pop_collection_options(kwargs, WRITE_OPTIONS)
+        )
+        kwargs = cls._get_operation_kwargs(kwargs)
 
-        return _collection.update_one(filter, data, **kwargs)
+        with cls._get_write_timeout(), time_phase(cls, "update_one", PHASE_NETWORK):
+            return _collection.update_one(filter, data, **kwargs)
 
     @classmethod
     async def aupdate_one(
         cls, filter: DICT_TYPE, data: DICT_TYPE, **kwargs: Any
     ) -> UpdateResult:
-        filter = cls._validate_and_prepare_filter(filter)
-        _collection = cls._async_get_collection()
+        with time_phase(cls, "aupdate_one", PHASE_VALIDATION):
+            filter = cls._validate_and_prepare_filter(filter)
+        _collection = cls._async_get_collection(
+            **pop_collection_options(kwargs, WRITE_OPTIONS)
+        )
+        kwargs = cls._get_operation_kwargs(kwargs, is_async=True)
 
-        return await _collection.update_one(filter, data, **kwargs)
+        with cls._get_write_timeout(), time_phase(cls, "aupdate_one", PHASE_NETWORK):
+            return await _collection.update_one(filter, data, **kwargs)
 
     @classmethod
     def update_many(
         cls, filter: DICT_TYPE, data: DICT_TYPE, **kwargs: Any
     ) -> UpdateResult:
-        filter = cls._validate_and_prepare_filter(filter)
+        with log_slow_query(cls, "update_many", filter) as slow_query:
+            cls._before_query("update_many", filter)
+            with time_phase(cls, "update_many", PHASE_VALIDATION):
+                filter = cls._validate_and_prepare_filter(filter)
+
+            _collection = cls._get_collection(
+                **pop_collection_options(kwargs, WRITE_OPTIONS)
+            )
+            kwargs = cls._get_operation_kwargs(kwargs)
 
-        _collection = cls._get_collection()
+            with (
+                cls._get_write_timeout(),
+                time_phase(cls, "update_many", PHASE_NETWORK),
+            ):
+                result = _collection.update_many(filter, data, **kwargs)
 
-        return _collection.update_many(filter, data, **kwargs)
+            if slow_query is not None:
+                slow_query.documents = get_write_count(result)
+        return result
 
     @classmethod
     async def aupdate_many(
         cls, filter: DICT_TYPE, data: DICT_TYPE, **kwargs: Any
     ) -> UpdateResult:
-        filter = cls._validate_and_prepare_filter(filter)
-        _collection = cls._async_get_collection()
+        with log_slow_query(cls, "update_many", filter) as slow_query:
+            await cls._abefore_query("update_many", filter)
+            with time_phase(cls, "aupdate_many", PHASE_VALIDATION):
+                filter = cls._validate_and_prepare_filter(filter)
+            _collection = cls._async_get_collection(
+                **pop_collection_options(kwargs, WRITE_OPTIONS)
+            )
+            kwargs = cls._get_operation_kwargs(kwargs, is_async=True)
 
-        return await _collection.update_many(filter, data, **kwargs)
+            with (
+                cls._get_write_timeout(),
+                time_phase(cls, "aupdate_many", PHASE_NETWORK),
+            ):
+                result = await _collection.update_many(filter, data, **kwargs)
+
+            if slow_query is not None:
+                slow_query.documents = get_write_count(result)
+        return result
 
     def delete(self, **kwargs: Any) -> DeleteResult:
         return self.delete_one({"_id": self.id}, **kwargs)
@@ -807,47 +1366,298 @@ class Document(_BaseDocument):
 
         print(f"delete_many filter: {filter}, kwargs: {kwargs}")
 
-        _collection = cls._get_collection()
-        return _collection.delete_one(filter, **kwargs)
+        _collection = cls._get_collection(
+            **pop_collection_options(kwargs, WRITE_OPTIONS)
+        )
+        kwargs = cls._get_operation_kwargs(kwargs)
+        with cls._get_write_timeout():
+            return _collection.delete_one(filter, **kwargs)
 
     @classmethod
     async def adelete_one(cls, filter: DICT_TYPE, **kwargs: Any) -> DeleteResult:
         """Will perform as Pymongo delete_one function."""
         filter = cls._validate_and_prepare_filter(filter)
-        _collection = cls._async_get_collection()
+        _collection = cls._async_get_collection(
+            **pop_collection_options(kwargs, WRITE_OPTIONS)
+        )
+        kwargs = cls._get_operation_kwargs(kwargs, is_async=True)
 
-        return await _collection.delete_one(filter, **kwargs)
+        with cls._get_write_timeout():
+            return await _collection.delete_one(filter, **kwargs)
 
     @classmethod
     def delete_many(cls, filter: DICT_TYPE, **kwargs: Any) -> DeleteResult:
         """Will perform as Pymongo delete_many function."""
         filter = cls._validate_and_prepare_filter(filter)
 
-        _collection = cls._get_collection()
-        return _collection.delete_many(filter, **kwargs)
+        _collection = cls._get_collection(
+            **pop_collection_options(kwargs, WRITE_OPTIONS)
+        )
+        kwargs = cls._get_operation_kwargs(kwargs)
+        with cls._get_write_timeout():
+            return _collection.delete_many(filter, **kwargs)
 
     @classmethod
     async def adelete_many(cls, filter: DICT_TYPE, **kwargs: Any) -> DeleteResult:
         """Will perform as Pymongo delete_many function."""
         filter = cls._validate_and_prepare_filter(filter)
-        _collection = cls._async_get_collection()
+        _collection = cls._async_get_collection(
+            **pop_collection_options(kwargs, WRITE_OPTIONS)
+        )
+        kwargs = cls._get_operation_kwargs(kwargs, is_async=True)
+
+        with cls._get_write_timeout():
+            return await _collection.delete_many(filter, **kwargs)
+
+    @classmethod
+    def _get_next_batch_ids(
+        cls, filter: DICT_TYPE, last_id: Optional[Any], batch_size: int
+    ) -> list[Any]:
+        ids_filter = get_batch_ids_filter(filter, last_id)
+        # A lagging secondary would miss the writes of the previous batches
+        qs = cls.find_raw(
+            ids_filter, projection={"_id": 1}, read_preference=ReadPreference.PRIMARY
+        )
+
+        return [obj["_id"] for obj in qs.sort("_id", ASCENDING).limit(batch_size)]
+
+    @classmethod
+    async def _async_get_next_batch_ids(
+        cls, filter: DICT_TYPE, last_id: Optional[Any], batch_size: int
+    ) -> list[Any]:
+        ids_filter = get_batch_ids_filter(filter, last_id)
+        # A lagging secondary would miss the writes of the previous batches
+        qs = cls.afind_raw(
+            ids_filter, projection={"_id": 1}, read_preference=ReadPreference.PRIMARY
+        )
+
+        return [obj["_id"] async for obj in qs.sort("_id", ASCENDING).limit(batch_size)]
 
-        return await _collection.delete_many(filter, **kwargs)
+    @classmethod
+    def _run_in_batches(
+        cls,
+        filter: Optional[DICT_TYPE],
+        operation: Callable[[DICT_TYPE], Union[UpdateResult, DeleteResult]],
+        batch_size: int,
+        start_after: Optional[Any],
+        throttle: BatchThrottle,
+        on_batch: Optional[Callable[[BatchProgress], None]],
+    ) -> BatchProgress:
+        if filter is None:
+            filter = {}
+        validate_filter_dict(cls, filter)
+
+        progress = BatchProgress(last_id=start_after)
+        client = cast(
+            MongoClient[Any], get_client(cls._connection_alias(), is_async_action=False)
+        )
+
+        while True:
+            started_at = time.perf_counter()
+            ids = cls._get_next_batch_ids(filter, progress.last_id, batch_size)
+            if not ids:
+                break
+
+            result = operation(get_batch_filter(filter, ids))
+            progress.add_result(ids, result)
+            if on_batch is not None:
+                on_batch(progress)
+
+            if len(ids) < batch_size:
+                break
+            throttle.wait(client, len(ids), time.perf_counter() - started_at)
+
+        return progress
+
+    @classmethod
+    async def _async_run_in_batches(
+        cls,
+        filter: Optional[DICT_TYPE],
+        operation: Callable[[DICT_TYPE], Awaitable[Union[UpdateResult, DeleteResult]]],
+        batch_size: int,
+        start_after: Optional[Any],
+        throttle: BatchThrottle,
+        on_batch: Optional[Callable[[BatchProgress], None]],
+    ) -> BatchProgress:
+        if filter is None:
+            filter = {}
+        validate_filter_dict(cls, filter)
+
+        progress = BatchProgress(last_id=start_after)
+        client = cast(
+            AsyncMongoClient[Any],
+            get_client(cls._connection_alias(), is_async_action=True),
+        )
+
+        while True:
+            started_at = time.perf_counter()
+            ids = await cls._async_get_next_batch_ids(
+                filter, progress.last_id, batch_size
+            )
+            if not ids:
+                break
+
+            result = await operation(get_batch_filter(filter, ids))
+            progress.add_result(ids, result)
+            if on_batch is not None:
+                on_batch(progress)
+
+            if len(ids) < batch_size:
+                break
+            await throttle.async_wait(
+                client, len(ids), time.perf_counter() - started_at
+            )
+
+        return progress
+
+    @classmethod
+    def update_in_batches(
+        cls,
+        filter: Optional[DICT_TYPE],
+        data: DICT_TYPE,
+        batch_size: int = 1000,
+        start_after: Optional[Any] = None,
+        max_ops_per_second: Optional[float] = None,
+        max_replication_lag: Optional[float] = None,
+        on_batch: Optional[Callable[[BatchProgress], None]] = None,
+        **kwargs: Any,
+    ) -> BatchProgress:
+        """
+        Same as update_many but walk the matching '_id's in index order
+        and update them chunk by chunk.
+
+        The pace is limited by `max_ops_per_second` and `max_replication_lag`.
+        Store `progress.last_id` from `on_batch` and pass it as `start_after`
+        to resume an interrupted operation.
+        """
+        throttle = BatchThrottle(max_ops_per_second, max_replication_lag)
+
+        def operation(batch_filter: DICT_TYPE) -> UpdateResult:
+            return cls.update_many(batch_filter, data, **kwargs)
+
+        return cls._run_in_batches(
+            filter, operation, batch_size, start_after, throttle, on_batch
+        )
+
+    @classmethod
+    async def aupdate_in_batches(
+        cls,
+        filter: Optional[DICT_TYPE],
+        data: DICT_TYPE,
+        batch_size: int = 1000,
+        start_after: Optional[Any] = None,
+        max_ops_per_second: Optional[float] = None,
+        max_replication_lag: Optional[float] = None,
+        on_batch: Optional[Callable[[BatchProgress], None]] = None,
+        **kwargs: Any,
+    ) -> BatchProgress:
+        """Async version of update_in_batches."""
+        throttle = BatchThrottle(max_ops_per_second, max_replication_lag)
+
+        async def operation(batch_filter: DICT_TYPE) -> UpdateResult:
+            return await cls.aupdate_many(batch_filter, data, **kwargs)
+
+        return await cls._async_run_in_batches(
+            filter, operation, batch_size, start_after, throttle, on_batch
+        )
+
+    @classmethod
+    def delete_in_batches(
+        cls,
+        filter: Optional[DICT_TYPE],
+        batch_size: int = 1000,
+        start_after: Optional[Any] = None,
+        max_ops_per_second: Optional[float] = None,
+        max_replication_lag: Optional[float] = None,
+        on_batch: Optional[Callable[[BatchProgress], None]] = None,
+        **kwargs: Any,
+    ) -> BatchProgress:
+        """
+        Same as delete_many but delete the matching documents chunk by chunk.
+        Accept the same throttle and checkpoint options as update_in_batches.
+        """
+        throttle = BatchThrottle(max_ops_per_second, max_replication_lag)
+
+        def operation(batch_filter: DICT_TYPE) -> DeleteResult:
+            return cls.delete_many(batch_filter, **kwargs)
+
+        return cls._run_in_batches(
+            filter, operation, batch_size, start_after, throttle, on_batch
+        )
+
+    @classmethod
+    async def adelete_in_batches(
+        cls,
+        filter: Optional[DICT_TYPE],
+        batch_size: int = 1000,
+        start_after: Optional[Any] = None,
+        max_ops_per_second: Optional[float] = None,
+        max_replication_lag: Optional[float] = None,
+        on_batch: Optional[Callable[[BatchProgress], None]] = None,
+        **kwargs: Any,
+    ) -> BatchProgress:
+        """Async version of delete_in_batches."""
+        throttle = BatchThrottle(max_ops_per_second, max_replication_lag)
+
+        async def operation(batch_filter: DICT_TYPE) -> DeleteResult:
+            return await cls.adelete_many(batch_filter, **kwargs)
+
+        return await cls._async_run_in_batches(
+            filter, operation, batch_size, start_after, throttle, on_batch
+        )
 
     @classmethod
     def bulk_write(
         cls, requests: Sequence[WriteOp[Any]], **kwargs: Any
     ) -> BulkWriteResult:
-        _collection = cls._get_collection()
-        return _collection.bulk_write(requests, **kwargs)
+        with log_slow_query(cls, "bulk_write") as slow_query:
+            _collection = cls._get_collection(
+                **pop_collection_options(kwargs, WRITE_OPTIONS)
+            )
+            kwargs = cls._get_operation_kwargs(kwargs)
+            with cls._get_write_timeout():
+                result = _collection.bulk_write(requests, **kwargs)
+
+            if slow_query is not None:
+                slow_query.documents = get_write_count(result)
+        return result
 
     @classmethod
     async def abulk_write(
         cls, requests: Sequence[WriteOp[Any]], **kwargs: Any
     ) -> BulkWriteResult:
-        _collection = cls._async_get_collection()
+        with log_slow_query(cls, "bulk_write") as slow_query:
+            _collection = cls._async_get_collection(
+                **pop_collection_options(kwargs, WRITE_OPTIONS)
+            )
+            kwargs = cls._get_operation_kwargs(kwargs, is_async=True)
 
-        return await _collection.bulk_write(requests, **kwargs)
+            with cls._get_write_timeout():
+                result = await _collection.bulk_write(requests, **kwargs)
+
+            if slow_query is not None:
+                slow_query.documents = get_write_count(result)
+        return result
+
+    @classmethod
+    def sharded_counter(
+        cls, field: str, shards: int = 16, cache_ttl: Optional[float] = None
+    ) -> ShardedCounter:
+        """
+        Get a counter that spreads increments over multiple shard documents.
+        Use it instead of '$inc' on a single write-hot document.
+
+        Course.sharded_counter("likes").incr(course.id)
+        Course.sharded_counter("likes", cache_ttl=5).get(course.id)
+        """
+        global _cashed_counters
+        key = (cls, field, shards, cache_ttl)
+
+        if key not in _cashed_counters:
+            _cashed_counters[key] = ShardedCounter(
+                cls, field, shards=shards, cache_ttl=cache_ttl
+            )
+        return _cashed_counters[key]
 
     @classmethod
     def _get_loadable_fields_info(
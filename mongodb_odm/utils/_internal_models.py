@@ -1,3 +1,4 @@
+import weakref
 from typing import Any, Optional, Union
 
 from mongodb_odm.types import DICT_TYPE
@@ -13,6 +14,17 @@ class Connection:
     databases: Optional[set[str]] = None
     connection_kwargs: Optional[DICT_TYPE] = None
     async_is_enabled: bool = False
+    """Process that created the client"""
+    pid: Optional[int] = None
+    """Warm up the pool in connect(warmup=True), again after a fork"""
+    warmup: bool = False
+    """Dual mode: sync operations use client and async operations use async_client"""
+    dual_mode: bool = False
+    async_client: Optional[AsyncMongoClient[Any]] = None
+    """AsyncMongoClient of each event loop, closed before the loop is closed"""
+    loop_clients: Optional[weakref.WeakKeyDictionary[Any, AsyncMongoClient[Any]]] = None
+    """Clients that were given to an event loop, a client is used by one loop only"""
+    given_clients: Optional[weakref.WeakSet[AsyncMongoClient[Any]]] = None
 
 
 class RelationalFieldInfo(PydanticRepresentation):
@@ -29,4 +41,9 @@ class CollectionConfig(BaseModel):
     collection_name: str
     child_collection_name: Optional[str] = None
     database_name: Optional[str] = None
+    connection_alias: str = "default"
     has_children: bool = False
+    version_field: Optional[str] = None
+    max_time_ms: dict[str, int] = {}
+    """Collection.with_options() arguments"""
+    collection_options: DICT_TYPE = {}
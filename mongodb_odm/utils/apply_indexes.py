@@ -1,15 +1,32 @@
+import asyncio
+import hashlib
+import json
 import logging
-from collections.abc import MutableMapping
-from typing import Any, Optional, Union
+from collections.abc import Awaitable, Mapping, MutableMapping
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Callable, Optional, TypeVar, Union
 from typing import cast as type_cast
 
 from bson import SON
-from mongodb_odm.connection import db
+from mongodb_odm.connection import DEFAULT_CONNECTION_ALIAS, db
 from mongodb_odm.exceptions import ConnectionError, InvalidConnection
 from mongodb_odm.models import INHERITANCE_FIELD_NAME, Document
 from mongodb_odm.types import DICT_TYPE
+from mongodb_odm.utils.index_rollout import (
+    DEFAULT_DROP_GRACE_PERIOD,
+    amonitor_index_builds,
+    async_get_hidden_at,
+    async_save_staging,
+    get_utc_datetime,
+    monitor_index_builds,
+    sync_get_hidden_at,
+    sync_save_staging,
+)
+from mongodb_odm.utils.index_spec import IndexSpec, get_index_spec
 from pydantic import BaseModel
-from pymongo import ASCENDING, TEXT, IndexModel
+from pymongo import ASCENDING, IndexModel, UpdateOne
 from pymongo.asynchronous.collection import AsyncCollection
 from pymongo.asynchronous.command_cursor import AsyncCommandCursor
 from pymongo.collection import Collection
@@ -17,11 +34,123 @@ from pymongo.command_cursor import CommandCursor
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+R = TypeVar("R")
+
+"""Number of collections that are processed at the same time"""
+DEFAULT_MAX_WORKERS = 8
+
+"""Store the fingerprint of the applied indexes of each collection"""
+INDEX_METADATA_COLLECTION_NAME = "odm_index_fingerprints"
+
+"""(connection, database) and (connection, database, collection)"""
+DATABASE_KEY_TYPE = tuple[str, Optional[str]]
+COLLECTION_KEY_TYPE = tuple[str, Optional[str], str]
+
 
 class IndexOperation(BaseModel):
     collection_name: str
     model_indexes: list[Any]
     database_name: Optional[str] = None
+    connection: str = DEFAULT_CONNECTION_ALIAS
+
+
+class CollectionIndexPlan(BaseModel):
+    """Index changes of a single collection"""
+
+    collection_name: str
+    database_name: Optional[str] = None
+    connection: str = DEFAULT_CONNECTION_ALIAS
+    create: list[DICT_TYPE] = []
+    drop: list[str] = []
+    """Staged rollout: indexes that will be hidden now and dropped later"""
+    hide: list[str] = []
+    """Hidden indexes that are defined in the model again"""
+    unhide: list[str] = []
+    """Staged rollout: hidden indexes that are waiting for the grace period"""
+    pending_drop: list[str] = []
+    staged: bool = False
+    fingerprint: Optional[str] = None
+    """Skipped since the indexes of the model did not change after the last run"""
+    skipped: bool = False
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.create or self.drop or self.hide or self.unhide)
+
+    @property
+    def has_pending_drops(self) -> bool:
+        return bool(self.hide or self.pending_drop)
+
+    def get_new_indexes(self) -> list[IndexModel]:
+        new_indexes: list[IndexModel] = []
+        for index in self.create:
+            options = {key: value for key, value in index.items() if key != "key"}
+            new_indexes.append(IndexModel(list(index["key"].items()), **options))
+        return new_indexes
+
+    def __str__(self) -> str:
+        name = self.collection_name
+        if self.database_name:
+            name = f"{self.database_name}.{name}"
+
+        summary = f"{len(self.drop)} to delete, {len(self.create)} to add"
+        if self.hide or self.unhide:
+            summary += f", {len(self.hide)} to hide, {len(self.unhide)} to unhide"
+
+        lines = [f'"{name}": {summary}']
+        for index_name in self.drop:
+            lines.append(f"  - {index_name}")
+        for index_name in self.hide:
+            lines.append(f"  ~ {index_name} (hide)")
+        for index_name in self.unhide:
+            lines.append(f"  ^ {index_name} (unhide)")
+        for index_name in self.pending_drop:
+            lines.append(f"  . {index_name} (hidden, waiting to be dropped)")
+        for index in self.create:
+            lines.append(f"  + {index['name']} {json.dumps(index['key'])}")
+        return "\n".join(lines)
+
+
+class IndexPlan(BaseModel):
+    """
+    Result of the planning phase of apply_indexes.
+
+    Print it to review the changes or serialize it with `model_dump_json()`.
+    """
+
+    collections: list[CollectionIndexPlan] = []
+
+    @property
+    def create_count(self) -> int:
+        return sum(len(plan.create) for plan in self.collections)
+
+    @property
+    def drop_count(self) -> int:
+        return sum(len(plan.drop) for plan in self.collections)
+
+    @property
+    def has_changes(self) -> bool:
+        return any(plan.has_changes for plan in self.collections)
+
+    @property
+    def skipped_count(self) -> int:
+        return sum(1 for plan in self.collections if plan.skipped)
+
+    def get_changed_collections(self) -> list[CollectionIndexPlan]:
+        return [plan for plan in self.collections if plan.has_changes]
+
+    def get_checked_collections(self) -> list[CollectionIndexPlan]:
+        return [plan for plan in self.collections if not plan.skipped]
+
+    def __str__(self) -> str:
+        changed = [
+            plan for plan in self.collections if plan.has_changes or plan.pending_drop
+        ]
+        lines = [str(plan) for plan in changed] or ["No change detected."]
+        if self.skipped_count:
+            lines.append(f"{self.skipped_count} unchanged collection(s) skipped.")
+        return "\n".join(lines)
 
 
 def _get_dict_db_indexes(database_indexes: Any) -> list[DICT_TYPE]:
@@ -61,54 +190,34 @@ def _get_dict_model_indexes(
     return dict_model_indexes, model_indexes_map
 
 
-def _check_exists_in_model_indexes(
-    db_dict_index: DICT_TYPE, dict_model_indexes: list[Union[DICT_TYPE, None]]
-) -> bool:
-    def mark_as_exist(position: int) -> bool:
-        """
-        Since the index already exists in the model indexes,
-        we will mark it as None.
-        """
-        dict_model_indexes[position] = None
-
-        return True
-
-    # Iterate over the indexes that are currently assigned in the model
+def _get_model_index_positions(
+    dict_model_indexes: list[Union[DICT_TYPE, None]],
+) -> dict[IndexSpec, list[int]]:
+    """Positions of the model indexes by their canonical spec"""
+    positions: dict[IndexSpec, list[int]] = {}
     for idx, index_obj in enumerate(dict_model_indexes):
-        if not index_obj or not isinstance(index_obj, dict):
-            continue
+        if index_obj:
+            positions.setdefault(get_index_spec(index_obj), []).append(idx)
 
-        if db_dict_index == index_obj:
-            mark_as_exist(idx)
-            return True
+    return positions
 
-        if db_dict_index.get("name") == index_obj.get("name"):
-            # This condition will handle some of the special indexes like text-based indexes.
-            db_value, new_value = db_dict_index, index_obj
-            if TEXT in db_value["key"].values() and TEXT in new_value["key"].values():
-                """
-                based on condition this is a text-based index.
-                Check that if value is changed.
-                If not changed then assign null otherwise not.
-                NOTE:
-                The data check may not be sufficient enough.
-                Add conditions based on the issue.
-                """
 
-                new_keys = new_value["key"].keys()
-                default_language = new_value.get("default_language", "english")
-                new_weight = new_value.get("weights") or dict.fromkeys(new_keys, 1)
+def _check_exists_in_model_indexes(
+    db_dict_index: DICT_TYPE,
+    dict_model_indexes: list[Union[DICT_TYPE, None]],
+    model_index_positions: dict[IndexSpec, list[int]],
+) -> bool:
+    positions = model_index_positions.get(get_index_spec(db_dict_index))
+    if not positions:
+        return False
 
-                if (
-                    db_value["weights"].keys() == new_keys
-                    and new_weight == db_value["weights"]
-                    and db_value["default_language"] == default_language
-                ):
-                    """Check all key, weights, and default_language match with existing values"""
-                    mark_as_exist(idx)
-                    return True
+    """
+    Since the index already exists in the model indexes,
+    we will mark it as None.
+    """
+    dict_model_indexes[positions.pop()] = None
 
-    return False
+    return True
 
 
 def _get_calculated_indexes_for_collection(
@@ -117,12 +226,15 @@ def _get_calculated_indexes_for_collection(
 ) -> tuple[list[IndexModel], list[DICT_TYPE]]:
     dict_db_indexes = _get_dict_db_indexes(database_indexes)
     dict_model_indexes, model_indexes_map = _get_dict_model_indexes(model_indexes)
+    model_index_positions = _get_model_index_positions(dict_model_indexes)
 
     delete_db_indexes: list[DICT_TYPE] = []
 
     # Iterate over indexes that are already created for a collection
     for db_dict_index in dict_db_indexes:
-        is_matched = _check_exists_in_model_indexes(db_dict_index, dict_model_indexes)
+        is_matched = _check_exists_in_model_indexes(
+            db_dict_index, dict_model_indexes, model_index_positions
+        )
 
         if not is_matched:
             # If the index does not exist in model indexes then delete it.
@@ -156,6 +268,7 @@ def _get_all_indexes() -> list[IndexOperation]:
             collection_name=model._get_collection_name(),
             model_indexes=_get_model_indexes(model),
             database_name=model._database_name(),
+            connection=model._connection_alias(),
         )
 
     for model in Document.__subclasses__():
@@ -183,31 +296,269 @@ def _get_all_indexes() -> list[IndexOperation]:
     return operations
 
 
+def _get_collection_key(
+    operation: Union[IndexOperation, CollectionIndexPlan],
+) -> COLLECTION_KEY_TYPE:
+    return (operation.connection, operation.database_name, operation.collection_name)
+
+
 def _get_collection(
+    operation: Union[IndexOperation, CollectionIndexPlan],
+    is_async_action: Optional[bool] = None,
+) -> Union[Collection[Any], AsyncCollection[Any]]:
+    database = db(
+        operation.database_name,
+        is_async_action=is_async_action,
+        alias=operation.connection,
+    )
+    return database[operation.collection_name]
+
+
+def _get_index_fingerprint(model_indexes: list[IndexModel]) -> str:
+    """
+    Hash of the index definitions of a collection.
+    The order of the indexes and options does not change the hash,
+    but the order of the keys does.
+    """
+    specs: list[str] = []
+    for index in model_indexes:
+        document = dict(index.document)
+        key = document.pop("key")
+        if isinstance(key, Mapping):
+            key = [[field, value] for field, value in key.items()]
+        document["key"] = key
+        specs.append(json.dumps(document, sort_keys=True, default=str))
+
+    return hashlib.sha256("\n".join(sorted(specs)).encode()).hexdigest()
+
+
+def _get_reintroduced_indexes(
+    new_indexes: list[IndexModel], delete_db_indexes: list[DICT_TYPE]
+) -> tuple[list[IndexModel], list[DICT_TYPE], list[str]]:
+    """
+    A hidden index that is defined in the model again is unhidden
+    instead of being dropped and rebuilt.
+    """
+    positions: dict[IndexSpec, list[int]] = {}
+    for idx, index in enumerate(new_indexes):
+        positions.setdefault(get_index_spec(index.document), []).append(idx)
+
+    reused: set[int] = set()
+    remaining_db_indexes: list[DICT_TYPE] = []
+    unhide: list[str] = []
+
+    for db_index in delete_db_indexes:
+        matched = positions.get(get_index_spec({**db_index, "hidden": False}))
+        if db_index.get("hidden") and matched:
+            reused.add(matched.pop())
+            unhide.append(db_index["name"])
+        else:
+            remaining_db_indexes.append(db_index)
+
+    remaining_new_indexes = [
+        index for idx, index in enumerate(new_indexes) if idx not in reused
+    ]
+    return remaining_new_indexes, remaining_db_indexes, unhide
+
+
+def _stage_drops(
+    plan: CollectionIndexPlan,
+    delete_db_indexes: list[DICT_TYPE],
+    hidden_at: dict[str, datetime],
+    drop_grace_period: float,
+) -> None:
+    """
+    Hide the indexes that are not in the model anymore and drop them
+    once they were hidden for `drop_grace_period` seconds.
+    """
+    create_names = {index["name"] for index in plan.create}
+    plan.staged = True
+    plan.drop = []
+
+    for db_index in delete_db_indexes:
+        name = db_index["name"]
+        since = hidden_at.get(name)
+        if name in create_names:
+            # The new index can not be created while the old one holds its name.
+            plan.drop.append(name)
+        elif not db_index.get("hidden") or since is None:
+            plan.hide.append(name)
+        elif (
+            datetime.now(timezone.utc) - get_utc_datetime(since)
+        ).total_seconds() >= drop_grace_period:
+            plan.drop.append(name)
+        else:
+            plan.pending_drop.append(name)
+
+
+def _get_collection_plan(
     operation: IndexOperation,
+    database_indexes: Any,
+    staged: bool = False,
+    hidden_at: Optional[dict[str, datetime]] = None,
+    drop_grace_period: float = DEFAULT_DROP_GRACE_PERIOD,
+) -> CollectionIndexPlan:
+    fingerprint = _get_index_fingerprint(operation.model_indexes)
+    new_indexes, delete_db_indexes = _get_calculated_indexes_for_collection(
+        database_indexes, operation.model_indexes
+    )
+    new_indexes, delete_db_indexes, unhide = _get_reintroduced_indexes(
+        new_indexes, delete_db_indexes
+    )
+    plan = CollectionIndexPlan(
+        collection_name=operation.collection_name,
+        database_name=operation.database_name,
+        connection=operation.connection,
+        create=[index.document for index in new_indexes],
+        drop=[index["name"] for index in delete_db_indexes],
+        unhide=unhide,
+        fingerprint=fingerprint,
+    )
+    if staged:
+        _stage_drops(plan, delete_db_indexes, hidden_at or {}, drop_grace_period)
+
+    return plan
+
+
+def _group_by_database(
+    items: list[Any],
+) -> dict[DATABASE_KEY_TYPE, list[Any]]:
+    """Group by (connection, database)"""
+    groups: dict[DATABASE_KEY_TYPE, list[Any]] = {}
+    for item in items:
+        groups.setdefault((item.connection, item.database_name), []).append(item)
+    return groups
+
+
+def _get_metadata_collection(
+    key: DATABASE_KEY_TYPE,
+    is_async_action: Optional[bool] = None,
 ) -> Union[Collection[Any], AsyncCollection[Any]]:
-    return db(operation.database_name)[operation.collection_name]
+    connection, database_name = key
+    database = db(database_name, is_async_action=is_async_action, alias=connection)
+    return database[INDEX_METADATA_COLLECTION_NAME]
+
+
+def _get_fingerprint_updates(plans: list[CollectionIndexPlan]) -> list[UpdateOne]:
+    """
+    Collections with staged drops are not in sync with the model yet,
+    their fingerprint is removed so that the next run checks them again.
+    """
+    updates: list[UpdateOne] = []
+    for plan in plans:
+        if not plan.fingerprint:
+            continue
+        update: DICT_TYPE = {
+            "$set": {
+                "fingerprint": plan.fingerprint,
+                "updated_at": datetime.now(timezone.utc),
+            }
+        }
+        if plan.has_pending_drops:
+            update = {"$unset": {"fingerprint": ""}}
+        updates.append(UpdateOne({"_id": plan.collection_name}, update, upsert=True))
+
+    return updates
+
+
+def _split_unchanged_operations(
+    operations: list[IndexOperation],
+    stored_fingerprints: dict[COLLECTION_KEY_TYPE, str],
+) -> tuple[list[IndexOperation], list[CollectionIndexPlan]]:
+    """Separate the operations that need to be checked from the unchanged ones"""
+    pending: list[IndexOperation] = []
+    skipped: list[CollectionIndexPlan] = []
+
+    for operation in operations:
+        fingerprint = _get_index_fingerprint(operation.model_indexes)
+        stored = stored_fingerprints.get(_get_collection_key(operation))
+        if stored != fingerprint:
+            pending.append(operation)
+            continue
+
+        skipped.append(
+            CollectionIndexPlan(
+                collection_name=operation.collection_name,
+                database_name=operation.database_name,
+                connection=operation.connection,
+                fingerprint=fingerprint,
+                skipped=True,
+            )
+        )
+
+    return pending, skipped
 
 
 def _get_created_and_deleted_indexes_count(
-    operation: IndexOperation,
-    new_indexes: list[IndexModel],
-    delete_db_indexes: list[DICT_TYPE],
+    plan: CollectionIndexPlan,
 ) -> tuple[int, int]:
-    ne, de = len(new_indexes), len(delete_db_indexes)
+    ne, de = len(plan.create), len(plan.drop)
     if ne > 0 or de > 0:
+        logger.info(f'Applied for "{plan.collection_name}": {de} deleted, {ne} added')
+    if plan.hide or plan.unhide:
         logger.info(
-            f'Applied for "{operation.collection_name}": {de} deleted, {ne} added'
+            f'Applied for "{plan.collection_name}": '
+            f"{len(plan.hide)} hidden, {len(plan.unhide)} unhidden"
         )
 
     return ne, de
 
 
+def _get_hide_index_command(
+    plan: CollectionIndexPlan, index_name: str, hidden: bool
+) -> SON[str, Any]:
+    return SON(
+        [
+            ("collMod", plan.collection_name),
+            ("index", {"name": index_name, "hidden": hidden}),
+        ]
+    )
+
+
+def _get_create_indexes_kwargs(
+    commit_quorum: Optional[Union[int, str]],
+) -> DICT_TYPE:
+    if commit_quorum is None:
+        return {}
+    return {"commitQuorum": commit_quorum}
+
+
+def _run_in_threads(
+    func: Callable[[T], R], items: list[T], max_workers: int
+) -> list[R]:
+    if max_workers < 1:
+        raise ValueError("max_workers should be greater than zero")
+    if len(items) <= 1 or max_workers == 1:
+        return [func(item) for item in items]
+
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(items)),
+        thread_name_prefix="mongodb-odm-indexes",
+    ) as executor:
+        return list(executor.map(func, items))
+
+
+async def _gather_with_limit(
+    func: Callable[[T], Awaitable[R]], items: list[T], max_concurrency: int
+) -> list[R]:
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency should be greater than zero")
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(item: T) -> R:
+        async with semaphore:
+            return await func(item)
+
+    return list(await asyncio.gather(*[run(item) for item in items]))
+
+
 def _get_collection_and_indexes(
     operation: IndexOperation,
+    is_async_action: Optional[bool] = None,
 ) -> tuple[Union[Collection[Any], AsyncCollection[Any]], list[IndexModel]]:
     try:
-        collection = _get_collection(operation)
+        collection = _get_collection(operation, is_async_action)
         model_indexes = operation.model_indexes
     except Exception as e:
         raise InvalidConnection(
@@ -228,39 +579,83 @@ def _sync_get_database_indexes(
 
 
 def _sync_apply_indexes_to_db(
-    operation: IndexOperation,
-    new_indexes: list[IndexModel],
-    delete_db_indexes: list[DICT_TYPE],
+    plan: CollectionIndexPlan,
+    commit_quorum: Optional[Union[int, str]] = None,
+    progress_interval: Optional[float] = None,
 ) -> tuple[int, int]:
-    _collection = _get_collection(operation)
+    _collection = _get_collection(plan)
     collection = type_cast(Collection[Any], _collection)
 
-    for db_index in delete_db_indexes:
+    for index_name in plan.unhide:
+        collection.database.command(_get_hide_index_command(plan, index_name, False))
+
+    for index_name in plan.drop:
         # If the DB index does not exist in new_indexes then drop that index.
-        if db_index is not None:
-            collection.drop_index(db_index["name"])
+        collection.drop_index(index_name)
 
-    if len(new_indexes) > 0:
+    if len(plan.create) > 0:
         try:
-            collection.create_indexes(new_indexes)
+            with monitor_index_builds(collection, progress_interval):
+                collection.create_indexes(
+                    plan.get_new_indexes(), **_get_create_indexes_kwargs(commit_quorum)
+                )
         except Exception as e:
-            logger.error(f'\nProblem arise at "{operation.collection_name}": {e}\n')
+            logger.error(f'\nProblem arise at "{plan.collection_name}": {e}\n')
             raise e
 
-    return _get_created_and_deleted_indexes_count(
-        operation, new_indexes, delete_db_indexes
-    )
+    # Hide the old indexes after the new ones are ready
+    for index_name in plan.hide:
+        collection.database.command(_get_hide_index_command(plan, index_name, True))
+
+    if plan.staged or plan.unhide:
+        sync_save_staging(
+            plan.database_name,
+            plan.collection_name,
+            hidden=plan.hide,
+            removed=plan.drop + plan.unhide,
+            connection=plan.connection,
+        )
+
+    return _get_created_and_deleted_indexes_count(plan)
+
+
+def _sync_get_stored_fingerprints(
+    operations: list[IndexOperation],
+) -> dict[COLLECTION_KEY_TYPE, str]:
+    stored_fingerprints: dict[COLLECTION_KEY_TYPE, str] = {}
+
+    for key, items in _group_by_database(operations).items():
+        collection = _get_metadata_collection(key)
+        if not isinstance(collection, Collection):
+            raise ConnectionError("Use synchronous collection for indexes.")
+
+        names = [operation.collection_name for operation in items]
+        for obj in collection.find({"_id": {"$in": names}}, {"fingerprint": 1}):
+            stored_fingerprints[(*key, obj["_id"])] = obj["fingerprint"]
+
+    return stored_fingerprints
 
 
-def _sync_apply_indexes_for_a_collection(operation: IndexOperation) -> tuple[int, int]:
-    collection, model_indexes = _get_collection_and_indexes(operation)
+def _sync_save_fingerprints(plans: list[CollectionIndexPlan]) -> None:
+    for key, items in _group_by_database(plans).items():
+        updates = _get_fingerprint_updates(items)
+        if updates:
+            collection = type_cast(Collection[Any], _get_metadata_collection(key))
+            collection.bulk_write(updates, ordered=False)
+
+
+def _sync_plan_for_a_collection(
+    operation: IndexOperation,
+    staged: bool = False,
+    hidden_at: Optional[dict[str, datetime]] = None,
+    drop_grace_period: float = DEFAULT_DROP_GRACE_PERIOD,
+) -> CollectionIndexPlan:
+    collection, _ = _get_collection_and_indexes(operation)
     database_indexes = _sync_get_database_indexes(collection)
-    new_indexes, delete_db_indexes = _get_calculated_indexes_for_collection(
-        database_indexes, model_indexes
-    )
-    ne, de = _sync_apply_indexes_to_db(operation, new_indexes, delete_db_indexes)
 
-    return ne, de
+    return _get_collection_plan(
+        operation, database_indexes, staged, hidden_at, drop_grace_period
+    )
 
 
 async def _async_get_database_indexes(
@@ -274,43 +669,92 @@ async def _async_get_database_indexes(
 
 
 async def _async_apply_indexes_to_db(
-    operation: IndexOperation,
-    new_indexes: list[IndexModel],
-    delete_db_indexes: list[DICT_TYPE],
+    plan: CollectionIndexPlan,
+    commit_quorum: Optional[Union[int, str]] = None,
+    progress_interval: Optional[float] = None,
 ) -> tuple[int, int]:
-    _collection = _get_collection(operation)
+    _collection = _get_collection(plan, is_async_action=True)
     collection = type_cast(AsyncCollection[Any], _collection)
 
-    for db_index in delete_db_indexes:
+    for index_name in plan.unhide:
+        await collection.database.command(
+            _get_hide_index_command(plan, index_name, False)
+        )
+
+    for index_name in plan.drop:
         # If the DB index does not exist in new_indexes then drop that index.
-        if db_index is not None:
-            await collection.drop_index(db_index["name"])
+        await collection.drop_index(index_name)
 
-    if len(new_indexes) > 0:
+    if len(plan.create) > 0:
         try:
-            await collection.create_indexes(new_indexes)
+            async with amonitor_index_builds(collection, progress_interval):
+                await collection.create_indexes(
+                    plan.get_new_indexes(), **_get_create_indexes_kwargs(commit_quorum)
+                )
         except Exception as e:
-            logger.error(f'\nProblem arise at "{operation.collection_name}": {e}\n')
+            logger.error(f'\nProblem arise at "{plan.collection_name}": {e}\n')
             raise e
 
-    return _get_created_and_deleted_indexes_count(
-        operation, new_indexes, delete_db_indexes
-    )
+    # Hide the old indexes after the new ones are ready
+    for index_name in plan.hide:
+        await collection.database.command(
+            _get_hide_index_command(plan, index_name, True)
+        )
+
+    if plan.staged or plan.unhide:
+        await async_save_staging(
+            plan.database_name,
+            plan.collection_name,
+            hidden=plan.hide,
+            removed=plan.drop + plan.unhide,
+            connection=plan.connection,
+        )
+
+    return _get_created_and_deleted_indexes_count(plan)
+
+
+async def _async_get_stored_fingerprints(
+    operations: list[IndexOperation],
+) -> dict[COLLECTION_KEY_TYPE, str]:
+    stored_fingerprints: dict[COLLECTION_KEY_TYPE, str] = {}
+
+    for key, items in _group_by_database(operations).items():
+        collection = _get_metadata_collection(key, is_async_action=True)
+        if not isinstance(collection, AsyncCollection):
+            raise ConnectionError("Use asynchronous collection for indexes.")
+
+        names = [operation.collection_name for operation in items]
+        async for obj in collection.find({"_id": {"$in": names}}, {"fingerprint": 1}):
+            stored_fingerprints[(*key, obj["_id"])] = obj["fingerprint"]
+
+    return stored_fingerprints
+
 
+async def _async_save_fingerprints(plans: list[CollectionIndexPlan]) -> None:
+    for key, items in _group_by_database(plans).items():
+        updates = _get_fingerprint_updates(items)
+        if updates:
+            collection = type_cast(
+                AsyncCollection[Any],
+                _get_metadata_collection(key, is_async_action=True),
+            )
+            await collection.bulk_write(updates, ordered=False)
 
-async def _async_apply_indexes_for_a_collection(
+
+async def _async_plan_for_a_collection(
     operation: IndexOperation,
-) -> tuple[int, int]:
-    collection, model_indexes = _get_collection_and_indexes(operation)
+    staged: bool = False,
+    hidden_at: Optional[dict[str, datetime]] = None,
+    drop_grace_period: float = DEFAULT_DROP_GRACE_PERIOD,
+) -> CollectionIndexPlan:
+    collection, _ = _get_collection_and_indexes(operation, is_async_action=True)
     database_indexes = [
         obj async for obj in await _async_get_database_indexes(collection)
     ]
-    new_indexes, delete_db_indexes = _get_calculated_indexes_for_collection(
-        database_indexes, model_indexes
-    )
-    ne, de = await _async_apply_indexes_to_db(operation, new_indexes, delete_db_indexes)
 
-    return ne, de
+    return _get_collection_plan(
+        operation, database_indexes, staged, hidden_at, drop_grace_period
+    )
 
 
 def log_final_results(new_index: int, delete_index: int) -> None:
@@ -322,29 +766,207 @@ def log_final_results(new_index: int, delete_index: int) -> None:
         logger.info("No change detected.")
 
 
-def apply_indexes() -> None:
-    """First get all indexes from all model."""
-    operations = _get_all_indexes()
-
-    """Then execute each indexes operation for each model."""
+def _sum_results(results: list[tuple[int, int]]) -> tuple[int, int]:
     new_index, delete_index = 0, 0
-    for operation in operations:
-        ne, de = _sync_apply_indexes_for_a_collection(operation)
+    for ne, de in results:
         new_index += ne
         delete_index += de
+    return new_index, delete_index
+
+
+def _get_collection_names(
+    operations: list[IndexOperation],
+) -> dict[DATABASE_KEY_TYPE, list[str]]:
+    return {
+        key: [operation.collection_name for operation in items]
+        for key, items in _group_by_database(operations).items()
+    }
+
 
+def plan_indexes(
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    force: bool = False,
+    staged: bool = False,
+    drop_grace_period: float = DEFAULT_DROP_GRACE_PERIOD,
+) -> IndexPlan:
+    """
+    Compare the indexes of all models with the database without changing anything.
+    Collections are read concurrently by up to `max_workers` threads.
+
+    Collections whose index definitions did not change since the last
+    apply_indexes are skipped unless `force` is True.
+
+    staged: Hide the removed indexes instead of dropping them. Hidden indexes
+    are dropped by a later staged run once `drop_grace_period` seconds have passed.
+    """
+    operations = _get_all_indexes()
+    skipped: list[CollectionIndexPlan] = []
+    if not force and operations:
+        stored_fingerprints = _sync_get_stored_fingerprints(operations)
+        operations, skipped = _split_unchanged_operations(
+            operations, stored_fingerprints
+        )
+
+    hidden_at = sync_get_hidden_at(_get_collection_names(operations)) if staged else {}
+
+    def plan_collection(operation: IndexOperation) -> CollectionIndexPlan:
+        return _sync_plan_for_a_collection(
+            operation,
+            staged=staged,
+            hidden_at=hidden_at.get(_get_collection_key(operation)),
+            drop_grace_period=drop_grace_period,
+        )
+
+    plans = _run_in_threads(plan_collection, operations, max_workers)
+
+    return IndexPlan(collections=plans + skipped)
+
+
+def execute_index_plan(
+    plan: IndexPlan,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    commit_quorum: Optional[Union[int, str]] = None,
+    progress_interval: Optional[float] = None,
+) -> tuple[int, int]:
+    """
+    Apply the plan. Returns the number of created and deleted indexes.
+
+    commit_quorum: Passed to createIndexes as "commitQuorum", e.g. "majority".
+
+    progress_interval: Log the progress of the index builds every n seconds.
+    """
+    apply = partial(
+        _sync_apply_indexes_to_db,
+        commit_quorum=commit_quorum,
+        progress_interval=progress_interval,
+    )
+    results = _run_in_threads(apply, plan.get_changed_collections(), max_workers)
+    _sync_save_fingerprints(plan.get_checked_collections())
+
+    new_index, delete_index = _sum_results(results)
     log_final_results(new_index, delete_index)
 
+    return new_index, delete_index
+
+
+def apply_indexes(
+    dry_run: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    force: bool = False,
+    staged: bool = False,
+    drop_grace_period: float = DEFAULT_DROP_GRACE_PERIOD,
+    commit_quorum: Optional[Union[int, str]] = None,
+    progress_interval: Optional[float] = None,
+) -> IndexPlan:
+    """
+    First plan the changes for all models, then apply them.
+    With `dry_run` the plan is only logged and returned.
+
+    force: Check every collection even if its index definitions did not change,
+    e.g. after an index was dropped by hand.
 
-async def async_apply_indexes() -> None:
-    """First get all indexes from all model."""
+    See plan_indexes() and execute_index_plan() for the staged rollout options.
+    """
+    plan = plan_indexes(
+        max_workers=max_workers,
+        force=force,
+        staged=staged,
+        drop_grace_period=drop_grace_period,
+    )
+    if dry_run:
+        logger.info(f"Index plan (dry run):\n{plan}")
+        return plan
+
+    execute_index_plan(
+        plan,
+        max_workers=max_workers,
+        commit_quorum=commit_quorum,
+        progress_interval=progress_interval,
+    )
+
+    return plan
+
+
+async def async_plan_indexes(
+    max_concurrency: int = DEFAULT_MAX_WORKERS,
+    force: bool = False,
+    staged: bool = False,
+    drop_grace_period: float = DEFAULT_DROP_GRACE_PERIOD,
+) -> IndexPlan:
+    """Async version of plan_indexes()"""
     operations = _get_all_indexes()
+    skipped: list[CollectionIndexPlan] = []
+    if not force and operations:
+        stored_fingerprints = await _async_get_stored_fingerprints(operations)
+        operations, skipped = _split_unchanged_operations(
+            operations, stored_fingerprints
+        )
 
-    """Then execute each indexes operation for each model."""
-    new_index, delete_index = 0, 0
-    for operation in operations:
-        ne, de = await _async_apply_indexes_for_a_collection(operation)
-        new_index += ne
-        delete_index += de
+    hidden_at = (
+        await async_get_hidden_at(_get_collection_names(operations)) if staged else {}
+    )
+
+    async def plan_collection(operation: IndexOperation) -> CollectionIndexPlan:
+        return await _async_plan_for_a_collection(
+            operation,
+            staged=staged,
+            hidden_at=hidden_at.get(_get_collection_key(operation)),
+            drop_grace_period=drop_grace_period,
+        )
+
+    plans = await _gather_with_limit(plan_collection, operations, max_concurrency)
+
+    return IndexPlan(collections=plans + skipped)
+
+
+async def async_execute_index_plan(
+    plan: IndexPlan,
+    max_concurrency: int = DEFAULT_MAX_WORKERS,
+    commit_quorum: Optional[Union[int, str]] = None,
+    progress_interval: Optional[float] = None,
+) -> tuple[int, int]:
+    """Async version of execute_index_plan()"""
+    apply = partial(
+        _async_apply_indexes_to_db,
+        commit_quorum=commit_quorum,
+        progress_interval=progress_interval,
+    )
+    results = await _gather_with_limit(
+        apply, plan.get_changed_collections(), max_concurrency
+    )
+    await _async_save_fingerprints(plan.get_checked_collections())
 
+    new_index, delete_index = _sum_results(results)
     log_final_results(new_index, delete_index)
+
+    return new_index, delete_index
+
+
+async def async_apply_indexes(
+    dry_run: bool = False,
+    max_concurrency: int = DEFAULT_MAX_WORKERS,
+    force: bool = False,
+    staged: bool = False,
+    drop_grace_period: float = DEFAULT_DROP_GRACE_PERIOD,
+    commit_quorum: Optional[Union[int, str]] = None,
+    progress_interval: Optional[float] = None,
+) -> IndexPlan:
+    """Async version of apply_indexes()"""
+    plan = await async_plan_indexes(
+        max_concurrency=max_concurrency,
+        force=force,
+        staged=staged,
+        drop_grace_period=drop_grace_period,
+    )
+    if dry_run:
+        logger.info(f"Index plan (dry run):\n{plan}")
+        return plan
+
+    await async_execute_index_plan(
+        plan,
+        max_concurrency=max_concurrency,
+        commit_quorum=commit_quorum,
+        progress_interval=progress_interval,
+    )
+
+    return plan
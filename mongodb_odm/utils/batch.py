@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Optional, Union
+
+from mongodb_odm.types import DICT_TYPE
+from pydantic import BaseModel
+from pymongo import AsyncMongoClient, MongoClient
+from pymongo.errors import OperationFailure
+from pymongo.results import DeleteResult, UpdateResult
+
+logger = logging.getLogger(__name__)
+
+
+class BatchProgress(BaseModel):
+    """
+    Progress of update_in_batches/delete_in_batches.
+
+    Persist `last_id` as a checkpoint and pass it as `start_after`
+    to resume the operation from the next batch.
+    """
+
+    last_id: Optional[Any] = None
+    batches: int = 0
+    processed: int = 0
+    matched_count: int = 0
+    modified_count: int = 0
+    deleted_count: int = 0
+
+    def add_result(
+        self, ids: list[Any], result: Union[UpdateResult, DeleteResult]
+    ) -> None:
+        self.last_id = ids[-1]
+        self.batches += 1
+        self.processed += len(ids)
+
+        if isinstance(result, UpdateResult):
+            self.matched_count += result.matched_count
+            self.modified_count += result.modified_count
+        else:
+            self.deleted_count += result.deleted_count
+
+
+def get_batch_ids_filter(filter: DICT_TYPE, last_id: Optional[Any]) -> DICT_TYPE:
+    """Filter for the next chunk of _ids in the index order"""
+    if last_id is None:
+        return filter
+    if not filter:
+        return {"_id": {"$gt": last_id}}
+
+    return {"$and": [filter, {"_id": {"$gt": last_id}}]}
+
+
+def get_batch_filter(filter: DICT_TYPE, ids: list[Any]) -> DICT_TYPE:
+    """
+    Keep the user filter along with the _ids so that documents that no longer
+    match since the _ids were read are left untouched.
+    """
+    if not filter:
+        return {"_id": {"$in": ids}}
+
+    return {"$and": [filter, {"_id": {"$in": ids}}]}
+
+
+def _get_lag_from_status(status: DICT_TYPE) -> float:
+    primary_optime: Optional[datetime] = None
+    secondary_optimes: list[datetime] = []
+    for member in status.get("members", []):
+        if member.get("stateStr") == "PRIMARY":
+            primary_optime = member["optimeDate"]
+        elif member.get("stateStr") == "SECONDARY":
+            secondary_optimes.append(member["optimeDate"])
+
+    if primary_optime is None or not secondary_optimes:
+        return 0.0
+
+    return max(0.0, (primary_optime - min(secondary_optimes)).total_seconds())
+
+
+def get_replication_lag(client: MongoClient[Any]) -> float:
+    """Replication lag in seconds of the slowest secondary"""
+    try:
+        status = client.admin.command("replSetGetStatus")
+    except OperationFailure as e:
+        logger.warning(f"Unable to read replication lag: {e}")
+        return 0.0
+
+    return _get_lag_from_status(status)
+
+
+async def aget_replication_lag(client: AsyncMongoClient[Any]) -> float:
+    """Replication lag in seconds of the slowest secondary"""
+    try:
+        status = await client.admin.command("replSetGetStatus")
+    except OperationFailure as e:
+        logger.warning(f"Unable to read replication lag: {e}")
+        return 0.0
+
+    return _get_lag_from_status(status)
+
+
+class BatchThrottle:
+    def __init__(
+        self,
+        max_ops_per_second: Optional[float] = None,
+        max_replication_lag: Optional[float] = None,
+        lag_check_interval: float = 1.0,
+    ) -> None:
+        """
+        max_ops_per_second: Upper limit of processed documents per second.
+
+        max_replication_lag: Pause between batches while the slowest secondary
+        is more than n seconds behind the primary.
+
+        lag_check_interval: Seconds to wait before checking the replication lag again.
+        """
+        if max_ops_per_second is not None and max_ops_per_second <= 0:
+            raise ValueError("max_ops_per_second should be greater than zero")
+
+        self.max_ops_per_second = max_ops_per_second
+        self.max_replication_lag = max_replication_lag
+        self.lag_check_interval = lag_check_interval
+
+    def get_delay(self, count: int, elapsed: float) -> float:
+        """Seconds to sleep so that `count` operations take the targeted time"""
+        if not self.max_ops_per_second:
+            return 0.0
+
+        return max(0.0, count / self.max_ops_per_second - elapsed)
+
+    def wait(self, client: MongoClient[Any], count: int, elapsed: float) -> None:
+        delay = self.get_delay(count, elapsed)
+        if delay > 0:
+            time.sleep(delay)
+
+        if self.max_replication_lag is None:
+            return
+
+        while get_replication_lag(client) > self.max_replication_lag:
+            logger.info("Replication lag is over the budget. Waiting...")
+            time.sleep(self.lag_check_interval)
+
+    async def async_wait(
+        self, client: AsyncMongoClient[Any], count: int, elapsed: float
+    ) -> None:
+        delay = self.get_delay(count, elapsed)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self.max_replication_lag is None:
+            return
+
+        while await aget_replication_lag(client) > self.max_replication_lag:
+            logger.info("Replication lag is over the budget. Waiting...")
+            await asyncio.sleep(self.lag_check_interval)
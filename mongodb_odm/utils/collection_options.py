@@ -0,0 +1,139 @@
+from typing import Any, Optional, Union
+
+from mongodb_odm.exceptions import InvalidConfiguration
+from mongodb_odm.types import DICT_TYPE
+from pymongo.errors import ConfigurationError
+from pymongo.read_concern import ReadConcern
+from pymongo.read_preferences import (
+    _ServerMode,
+    make_read_preference,
+    read_pref_mode_from_name,
+)
+from pymongo.write_concern import WriteConcern
+
+READ_PREFERENCE_TYPE = Union[str, _ServerMode]
+"""The w value of a write concern like 1 or "majority" """
+WRITE_CONCERN_TYPE = Union[int, str, WriteConcern]
+"""The level of a read concern like "local" or "majority" """
+READ_CONCERN_TYPE = Union[str, ReadConcern]
+
+"""Per-call arguments of the ODM methods that select the collection options"""
+READ_OPTIONS = ("read_preference", "read_concern")
+WRITE_OPTIONS = ("write_concern",)
+
+
+def get_read_preference(
+    read_preference: READ_PREFERENCE_TYPE,
+    max_staleness_seconds: Optional[int] = None,
+    tags: Optional[list[dict[str, str]]] = None,
+) -> _ServerMode:
+    """
+    Build a pymongo read preference from a mode name like "secondaryPreferred".
+    A pymongo read preference object is returned as it is.
+    """
+    if isinstance(read_preference, _ServerMode):
+        return read_preference
+
+    try:
+        mode = read_pref_mode_from_name(read_preference)
+    except ValueError as e:
+        raise InvalidConfiguration(
+            f'Invalid read preference "{read_preference}"'
+        ) from e
+
+    try:
+        return make_read_preference(
+            mode,
+            tags,
+            max_staleness_seconds if max_staleness_seconds is not None else -1,
+        )
+    except ConfigurationError as e:
+        raise InvalidConfiguration(str(e)) from e
+
+
+def get_write_concern(
+    write_concern: Optional[WRITE_CONCERN_TYPE], journal: Optional[bool] = None
+) -> WriteConcern:
+    if isinstance(write_concern, WriteConcern):
+        return write_concern
+
+    try:
+        return WriteConcern(w=write_concern, j=journal)
+    except (ConfigurationError, TypeError, ValueError) as e:
+        raise InvalidConfiguration(str(e)) from e
+
+
+def get_read_concern(read_concern: READ_CONCERN_TYPE) -> ReadConcern:
+    if isinstance(read_concern, ReadConcern):
+        return read_concern
+
+    try:
+        return ReadConcern(read_concern)
+    except TypeError as e:
+        raise InvalidConfiguration(str(e)) from e
+
+
+def get_override_options(
+    overrides: DICT_TYPE, journal: Optional[bool] = None
+) -> DICT_TYPE:
+    """
+    Convert the per-call arguments into with_options() arguments.
+
+    journal: ODMConfig.journal of the model, applied to a write concern given
+        as a w value. A WriteConcern object is used as it is.
+    """
+    options: DICT_TYPE = {}
+    if overrides.get("read_preference") is not None:
+        options["read_preference"] = get_read_preference(overrides["read_preference"])
+    if overrides.get("read_concern") is not None:
+        options["read_concern"] = get_read_concern(overrides["read_concern"])
+    if overrides.get("write_concern") is not None:
+        options["write_concern"] = get_write_concern(
+            overrides["write_concern"], journal
+        )
+
+    return options
+
+
+def pop_collection_options(kwargs: DICT_TYPE, names: tuple[str, ...]) -> DICT_TYPE:
+    """Remove the collection options from the arguments of a pymongo method"""
+    return {name: kwargs.pop(name) for name in names if name in kwargs}
+
+
+def get_collection_options(model: Any) -> DICT_TYPE:
+    """
+    Get the `Collection.with_options()` arguments defined in ODMConfig.
+
+    model: Document type
+    """
+    config = model.ODMConfig
+    options: DICT_TYPE = {}
+
+    read_preference = getattr(config, "read_preference", None)
+    max_staleness_seconds = getattr(config, "max_staleness_seconds", None)
+    tags = getattr(config, "read_preference_tags", None)
+    if read_preference is not None:
+        options["read_preference"] = get_read_preference(
+            read_preference, max_staleness_seconds, tags
+        )
+    elif max_staleness_seconds is not None or tags:
+        raise InvalidConfiguration(
+            f"{model.__name__}: max_staleness_seconds and read_preference_tags "
+            "require a read_preference."
+        )
+
+    write_concern = getattr(config, "write_concern", None)
+    journal = getattr(config, "journal", None)
+    if write_concern is not None or journal is not None:
+        options["write_concern"] = get_write_concern(write_concern, journal)
+
+    read_concern = getattr(config, "read_concern", None)
+    if read_concern is not None:
+        options["read_concern"] = get_read_concern(read_concern)
+
+    return options
+
+
+def get_options_key(options: DICT_TYPE) -> tuple[tuple[str, str], ...]:
+    """Hashable key of with_options() arguments to cache the collection handles"""
+    return tuple(sorted((key, repr(value)) for key, value in options.items()))
@@ -0,0 +1,70 @@
+import asyncio
+import functools
+import inspect
+import logging
+import time
+from typing import Any, Callable, Optional, TypeVar, Union, cast
+
+from mongodb_odm.exceptions import VersionConflictError
+from mongodb_odm.utils.utils import get_backoff_delay
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def retry_on_conflict(
+    func: Optional[F] = None,
+    *,
+    max_retries: int = 3,
+    backoff: float = 0.01,
+    max_backoff: float = 1.0,
+) -> Union[F, Callable[[F], F]]:
+    """
+    Re-run a read-modify-write function when update() raises VersionConflictError.
+
+    The decorated function should load the document itself, so that every retry
+    works with the latest version. Works with both sync and async functions.
+
+    @retry_on_conflict(max_retries=5)
+    def deposit(account_id, amount):
+        account = Account.get({"_id": account_id})
+        account.balance += amount
+        account.update()
+    """
+
+    def decorator(fn: F) -> F:
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                for attempt in range(max_retries + 1):
+                    try:
+                        return await fn(*args, **kwargs)
+                    except VersionConflictError:
+                        if attempt >= max_retries:
+                            raise
+                        logger.debug(f"Version conflict in {fn.__name__}, retrying.")
+                        await asyncio.sleep(
+                            get_backoff_delay(attempt, backoff, max_backoff)
+                        )
+
+            return cast(F, async_wrapper)
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            for attempt in range(max_retries + 1):
+                try:
+                    return fn(*args, **kwargs)
+                except VersionConflictError:
+                    if attempt >= max_retries:
+                        raise
+                    logger.debug(f"Version conflict in {fn.__name__}, retrying.")
+                    time.sleep(get_backoff_delay(attempt, backoff, max_backoff))
+
+        return cast(F, wrapper)
+
+    if func is not None:
+        return decorator(func)
+
+    return decorator
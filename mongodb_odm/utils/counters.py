@@ -0,0 +1,194 @@
+import random
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Optional, cast
+
+from mongodb_odm.connection import db
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.collection import Collection
+
+if TYPE_CHECKING:
+    from mongodb_odm.models import Document
+
+COUNTERS_COLLECTION_SUFFIX = "_counters"
+
+_counters: "weakref.WeakSet[ShardedCounter]" = weakref.WeakSet()
+
+
+class ShardedCounter:
+    """
+    Counter for write-hot documents.
+
+    Increments are spread over `shards` documents of a side collection
+    "<collection_name>_counters", one picked at random for each increment,
+    so that concurrent writers do not contend on a single document.
+    The total is the sum of the shards and can be cached for `cache_ttl` seconds.
+
+    Shard documents use a deterministic "_id" ("<document_id>:<field>:<shard>"),
+    so increments and reads only touch the "_id" index.
+    """
+
+    def __init__(
+        self,
+        model: type["Document"],
+        field: str,
+        shards: int = 16,
+        cache_ttl: Optional[float] = None,
+    ) -> None:
+        """
+        model: Document type that owns the counter.
+
+        field: Name of the counter, e.g. "likes".
+
+        shards: Number of shard documents. More shards allow more concurrent writers
+        but make reads a bit more expensive. Should not be reduced later,
+        otherwise the values of the removed shards will be ignored.
+
+        cache_ttl: Cache the aggregated value in memory for n seconds.
+        """
+        if shards < 1:
+            raise ValueError("shards should be greater than zero")
+
+        self.model = model
+        self.field = field
+        self.shards = shards
+        self.cache_ttl = cache_ttl
+
+        """document_id -> (value, expires_at), ordered by expires_at"""
+        self._cache: OrderedDict[Any, tuple[int, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        _counters.add(self)
+
+    def _after_fork(self) -> None:
+        """The lock may have been held by another thread of the parent process"""
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_collection_name(self) -> str:
+        return f"{self.model._get_collection_name()}{COUNTERS_COLLECTION_SUFFIX}"
+
+    def _get_collection(self) -> Collection[Any]:
+        database = db(
+            self.model._database_name(),
+            is_async_action=False,
+            alias=self.model._connection_alias(),
+        )
+        return cast(Collection[Any], database[self._get_collection_name()])
+
+    def _async_get_collection(self) -> AsyncCollection[Any]:
+        database = db(
+            self.model._database_name(),
+            is_async_action=True,
+            alias=self.model._connection_alias(),
+        )
+        return cast(AsyncCollection[Any], database[self._get_collection_name()])
+
+    def _get_shard_id(self, document_id: Any, shard: int) -> str:
+        return f"{document_id}:{self.field}:{shard}"
+
+    def _get_shard_ids(self, document_id: Any) -> list[str]:
+        return [self._get_shard_id(document_id, i) for i in range(self.shards)]
+
+    def _get_increment_args(
+        self, document_id: Any, amount: int
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        shard = random.randrange(self.shards)
+        return (
+            {"_id": self._get_shard_id(document_id, shard)},
+            {"$inc": {"value": amount}},
+        )
+
+    def _evict_expired(self, now: float) -> None:
+        """Must be called with the lock acquired"""
+        while self._cache:
+            document_id, (_, expires_at) = next(iter(self._cache.items()))
+            if expires_at >= now:
+                # The entries are ordered by expiry, the rest are still fresh
+                return
+            del self._cache[document_id]
+
+    def _get_cached(self, document_id: Any) -> Optional[int]:
+        if not self.cache_ttl:
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            self._evict_expired(now)
+            cached = self._cache.get(document_id)
+        if cached is None:
+            return None
+
+        return cached[0]
+
+    def _set_cache(self, document_id: Any, value: int) -> None:
+        if not self.cache_ttl:
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            self._evict_expired(now)
+            self._cache[document_id] = (value, now + self.cache_ttl)
+            # Keep the entries ordered by expiry
+            self._cache.move_to_end(document_id)
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def incr(self, document_id: Any, amount: int = 1) -> None:
+        filter, update = self._get_increment_args(document_id, amount)
+        self._get_collection().update_one(filter, update, upsert=True)
+
+    async def aincr(self, document_id: Any, amount: int = 1) -> None:
+        filter, update = self._get_increment_args(document_id, amount)
+        await self._async_get_collection().update_one(filter, update, upsert=True)
+
+    def get(self, document_id: Any, use_cache: bool = True) -> int:
+        if use_cache:
+            cached = self._get_cached(document_id)
+            if cached is not None:
+                return cached
+
+        shards = self._get_collection().find(
+            {"_id": {"$in": self._get_shard_ids(document_id)}}, {"value": 1}
+        )
+        value: int = sum(shard["value"] for shard in shards)
+        self._set_cache(document_id, value)
+
+        return value
+
+    async def aget(self, document_id: Any, use_cache: bool = True) -> int:
+        if use_cache:
+            cached = self._get_cached(document_id)
+            if cached is not None:
+                return cached
+
+        shards = self._async_get_collection().find(
+            {"_id": {"$in": self._get_shard_ids(document_id)}}, {"value": 1}
+        )
+        value: int = sum([shard["value"] async for shard in shards])
+        self._set_cache(document_id, value)
+
+        return value
+
+    def reset(self, document_id: Any) -> None:
+        self._get_collection().delete_many(
+            {"_id": {"$in": self._get_shard_ids(document_id)}}
+        )
+        with self._lock:
+            self._cache.pop(document_id, None)
+
+    async def areset(self, document_id: Any) -> None:
+        await self._async_get_collection().delete_many(
+            {"_id": {"$in": self._get_shard_ids(document_id)}}
+        )
+        with self._lock:
+            self._cache.pop(document_id, None)
+
+
+def reset_counters_after_fork() -> None:
+    for counter in list(_counters):
+        counter._after_fork()
@@ -0,0 +1,65 @@
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Optional
+
+import pymongo
+from mongodb_odm.exceptions import DeadlineExceeded
+
+OPERATION_READ = "read"
+OPERATION_WRITE = "write"
+OPERATION_AGGREGATE = "aggregate"
+OPERATION_TYPES = (OPERATION_READ, OPERATION_WRITE, OPERATION_AGGREGATE)
+
+"""time.monotonic() value when the request of the current context must be done"""
+_deadline: ContextVar[Optional[float]] = ContextVar(
+    "mongodb_odm_deadline", default=None
+)
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """
+    Every ODM operation inside the block gets the remaining time as maxTimeMS.
+    Operations that start after the deadline raise DeadlineExceeded without
+    sending anything to the server. A nested deadline can only shorten it.
+
+    with deadline(0.5):
+        handle_request()
+    """
+    value = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        value = min(value, current)
+
+    token = _deadline.set(value)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def get_remaining_ms() -> Optional[int]:
+    """Remaining time of the current deadline. None if there is no deadline."""
+    value = _deadline.get()
+    if value is None:
+        return None
+
+    remaining = int((value - time.monotonic()) * 1000)
+    if remaining <= 0:
+        raise DeadlineExceeded("The deadline of the request has passed.")
+    return remaining
+
+
+def get_max_time_ms(*values: Optional[int]) -> Optional[int]:
+    """The shortest of the given limits and the remaining time of the deadline"""
+    limits = [value for value in (*values, get_remaining_ms()) if value is not None]
+    return min(limits) if limits else None
+
+
+def get_operation_timeout(max_time_ms: Optional[int]) -> AbstractContextManager[Any]:
+    """Client side timeout for operations that don't accept maxTimeMS, like writes"""
+    if max_time_ms is None:
+        return nullcontext()
+    return pymongo.timeout(max_time_ms / 1000)
@@ -0,0 +1,110 @@
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from mongodb_odm.types import DICT_TYPE
+from pydantic import BaseModel
+
+ID_INDEX_NAME = "_id_"
+COLLSCAN_STAGE = "COLLSCAN"
+INDEX_SCAN_STAGES = {"IXSCAN", "EXPRESS_IXSCAN", "IDHACK", "EXPRESS_CLUSTERED_IXSCAN"}
+
+"""Number of forbid_collection_scans() blocks of the current thread or task"""
+_collection_scan_guards: ContextVar[int] = ContextVar(
+    "mongodb_odm_collection_scan_guards", default=0
+)
+"""Number of active forbid_collection_scans() blocks in every thread"""
+_active_guards = 0
+_active_guards_lock = threading.Lock()
+
+
+class ExplainSummary(BaseModel):
+    collection_name: str
+    """Stages of the winning plan from the root to the leaves"""
+    stages: list[str] = []
+    index_name: Optional[str] = None
+    index_key: Optional[DICT_TYPE] = None
+    is_collscan: bool = False
+    keys_examined: Optional[int] = None
+    docs_examined: Optional[int] = None
+    n_returned: Optional[int] = None
+    execution_time_ms: Optional[int] = None
+    raw: DICT_TYPE = {}
+
+    def __str__(self) -> str:
+        plan = " <- ".join(self.stages)
+        if self.index_name:
+            plan += f" ({self.index_name})"
+        return (
+            f'"{self.collection_name}": {plan}, '
+            f"keys examined: {self.keys_examined}, "
+            f"docs examined: {self.docs_examined}, "
+            f"returned: {self.n_returned}"
+        )
+
+
+def _get_plan_stages(plan: DICT_TYPE) -> Iterator[DICT_TYPE]:
+    """Walk a plan tree depth first"""
+    # Slot based engine plans keep the classic tree in queryPlan
+    plan = plan.get("queryPlan", plan)
+    yield plan
+    if "inputStage" in plan:
+        yield from _get_plan_stages(plan["inputStage"])
+    for stage in plan.get("inputStages", []):
+        yield from _get_plan_stages(stage)
+
+
+def get_explain_summary(collection_name: str, explain: DICT_TYPE) -> ExplainSummary:
+    """Parse the output of the explain command of a find"""
+    query_planner = explain.get("queryPlanner", {})
+    stats = explain.get("executionStats", {})
+    summary = ExplainSummary(
+        collection_name=collection_name,
+        keys_examined=stats.get("totalKeysExamined"),
+        docs_examined=stats.get("totalDocsExamined"),
+        n_returned=stats.get("nReturned"),
+        execution_time_ms=stats.get("executionTimeMillis"),
+        raw=explain,
+    )
+
+    for stage in _get_plan_stages(query_planner.get("winningPlan", {})):
+        name = stage.get("stage", "")
+        summary.stages.append(name)
+        if name == COLLSCAN_STAGE:
+            summary.is_collscan = True
+        elif name in INDEX_SCAN_STAGES and summary.index_name is None:
+            summary.index_name = stage.get(
+                "indexName", ID_INDEX_NAME if name == "IDHACK" else None
+            )
+            summary.index_key = stage.get("keyPattern")
+
+    return summary
+
+
+@contextmanager
+def forbid_collection_scans() -> Iterator[None]:
+    """
+    Explain every find, find_one, count_documents and update_many made through
+    the ODM and raise CollectionScanError when the winning plan is a COLLSCAN
+    on a collection that has indexes defined in ODMConfig. Only the queries
+    of the current thread or task are checked. Queries with an empty filter
+    and no sort read the whole collection and are not checked.
+
+    It runs an extra explain for every query, use it in tests only.
+    """
+    global _active_guards
+    token = _collection_scan_guards.set(_collection_scan_guards.get() + 1)
+    with _active_guards_lock:
+        _active_guards += 1
+    try:
+        yield
+    finally:
+        with _active_guards_lock:
+            _active_guards -= 1
+        _collection_scan_guards.reset(token)
+
+
+def is_collection_scan_forbidden() -> bool:
+    return _active_guards > 0 and _collection_scan_guards.get() > 0
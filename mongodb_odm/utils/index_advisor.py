@@ -0,0 +1,359 @@
+import json
+from typing import Any, Optional, Union
+
+from mongodb_odm.utils.index_spec import get_index_keys
+from mongodb_odm.utils.index_usage import ID_INDEX_NAME, _get_collections
+from mongodb_odm.utils.query_shape import (
+    LOGICAL_OPERATORS,
+    VALUE_PLACEHOLDER,
+    QueryShape,
+    QueryShapeRecorder,
+)
+from pydantic import BaseModel
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+"""Every key of the index is used, the sort is done by the index"""
+STATUS_OPTIMAL = "optimal"
+"""An index is used but scans more keys than needed or sorts in memory"""
+STATUS_PARTIAL = "partial"
+"""No declared index can serve the query, it is a collection scan"""
+STATUS_UNINDEXED = "unindexed"
+"""The query can not be described with equality, sort and range fields"""
+STATUS_UNSUPPORTED = "unsupported"
+
+EQUALITY_OPERATORS = {"$eq", "$in"}
+
+"""Operators that need a special index or can not use an index at all"""
+UNSUPPORTED_OPERATORS = {
+    "$near",
+    "$nearSphere",
+    "$geoWithin",
+    "$geoIntersects",
+    "$where",
+}
+
+INDEX_KEY_TYPE = list[tuple[str, int]]
+DECLARED_INDEX_TYPE = tuple[str, tuple[tuple[str, Any], ...]]
+
+
+class _Predicates(BaseModel):
+    equality: list[str] = []
+    sort: INDEX_KEY_TYPE = []
+    range: list[str] = []
+    supported: bool = True
+
+    def get_esr_key(self) -> INDEX_KEY_TYPE:
+        """Equality fields first, then the sort fields and the range fields last"""
+        keys: INDEX_KEY_TYPE = [(field, ASCENDING) for field in self.equality]
+        used = set(self.equality)
+        for field, direction in self.sort:
+            if field not in used:
+                keys.append((field, direction))
+                used.add(field)
+        for field in self.range:
+            if field not in used:
+                keys.append((field, ASCENDING))
+                used.add(field)
+
+        return keys
+
+
+class QueryIndexAdvice(BaseModel):
+    shape: QueryShape
+    status: str
+    """Best declared index for each branch of the query"""
+    index_names: list[str] = []
+    """ESR ordered key for each branch of the query that is not served optimally"""
+    suggested_keys: list[INDEX_KEY_TYPE] = []
+
+    def __str__(self) -> str:
+        text = f"[{self.status}] {self.shape}"
+        if self.index_names:
+            text += f" using {', '.join(self.index_names)}"
+        for key in self.suggested_keys:
+            text += f"\n    suggested index: {json.dumps(key)}"
+        return text
+
+
+class SuggestedIndex(BaseModel):
+    model_name: str
+    collection_name: str
+    database_name: Optional[str] = None
+    key: INDEX_KEY_TYPE
+    """Number of recorded queries that would use the index"""
+    query_count: int = 0
+
+    def get_index_model(self) -> IndexModel:
+        return IndexModel(self.key)
+
+    def __str__(self) -> str:
+        return (
+            f'"{self.collection_name}" ({self.model_name}): {json.dumps(self.key)} '
+            f"for {self.query_count} queries"
+        )
+
+
+class IndexAdvisorReport(BaseModel):
+    """
+    Recorded query shapes compared with the indexes declared in ODMConfig.
+
+    Serialize it with `model_dump_json()` or print it for a summary.
+    """
+
+    advice: list[QueryIndexAdvice] = []
+
+    def get_unindexed(self) -> list[QueryIndexAdvice]:
+        return [obj for obj in self.advice if obj.status == STATUS_UNINDEXED]
+
+    def get_partial(self) -> list[QueryIndexAdvice]:
+        return [obj for obj in self.advice if obj.status == STATUS_PARTIAL]
+
+    def get_suggested_indexes(self) -> list[SuggestedIndex]:
+        """
+        One index for every suggested key. A suggestion that is a prefix of
+        another suggestion for the same collection is served by the longer one.
+        """
+        suggestions: dict[str, SuggestedIndex] = {}
+        for obj in self.advice:
+            for key in obj.suggested_keys:
+                shape = obj.shape
+                id = json.dumps(
+                    [shape.database_name, shape.collection_name, key], default=str
+                )
+                if id not in suggestions:
+                    suggestions[id] = SuggestedIndex(
+                        model_name=shape.model_name,
+                        collection_name=shape.collection_name,
+                        database_name=shape.database_name,
+                        key=key,
+                    )
+                suggestions[id].query_count += shape.count
+
+        indexes = sorted(suggestions.values(), key=lambda obj: -len(obj.key))
+        results: list[SuggestedIndex] = []
+        for index in indexes:
+            longer = next(
+                (
+                    obj
+                    for obj in results
+                    if obj.collection_name == index.collection_name
+                    and obj.database_name == index.database_name
+                    and obj.key[: len(index.key)] == index.key
+                ),
+                None,
+            )
+            if longer is None:
+                results.append(index)
+            else:
+                longer.query_count += index.query_count
+
+        return sorted(results, key=lambda obj: -obj.query_count)
+
+    def __str__(self) -> str:
+        flagged = [obj for obj in self.advice if obj.status != STATUS_OPTIMAL]
+        if not flagged:
+            return f"All {len(self.advice)} query shapes are served by an index."
+        return "\n".join(str(obj) for obj in flagged)
+
+
+def _is_equality(value: Any) -> bool:
+    if value == VALUE_PLACEHOLDER:
+        return True
+    return (
+        isinstance(value, dict)
+        and len(value) > 0
+        and set(value).issubset(EQUALITY_OPERATORS)
+    )
+
+
+def _add_field(predicates: _Predicates, field: str, value: Any) -> None:
+    if isinstance(value, dict) and UNSUPPORTED_OPERATORS.intersection(value):
+        predicates.supported = False
+    elif _is_equality(value):
+        if field not in predicates.equality:
+            predicates.equality.append(field)
+    elif field not in predicates.range:
+        predicates.range.append(field)
+
+
+def _merge(base: _Predicates, other: _Predicates) -> _Predicates:
+    merged = base.model_copy(deep=True)
+    for field in other.equality:
+        _add_field(merged, field, VALUE_PLACEHOLDER)
+    for field in other.range:
+        if field not in merged.equality:
+            _add_field(merged, field, {})
+    merged.supported = base.supported and other.supported
+    return merged
+
+
+def _get_predicates(filter_shape: dict[str, Any]) -> list[_Predicates]:
+    """One set of predicates for every branch of an $or"""
+    predicates = _Predicates()
+    branches: list[list[_Predicates]] = []
+    for key, value in filter_shape.items():
+        if key in LOGICAL_OPERATORS and not isinstance(value, list):
+            predicates.supported = False
+        elif key == "$and":
+            for branch in value:
+                branches.append(_get_predicates(branch))
+        elif key == "$or":
+            branches.append(
+                [predicate for branch in value for predicate in _get_predicates(branch)]
+            )
+        elif key == "$nor":
+            # Negations are not selective, treat every field as a range
+            for branch in value:
+                for field in branch:
+                    if field not in LOGICAL_OPERATORS:
+                        _add_field(predicates, field, {})
+        elif key.startswith("$"):
+            predicates.supported = False
+        else:
+            _add_field(predicates, key, value)
+
+    results = [predicates]
+    for branch in branches:
+        results = [_merge(base, other) for base in results for other in branch]
+
+    return results
+
+
+def _get_sort(sort: list[tuple[str, Any]]) -> Optional[INDEX_KEY_TYPE]:
+    keys: INDEX_KEY_TYPE = []
+    for field, direction in sort:
+        if direction not in (ASCENDING, DESCENDING):
+            # {"$meta": "textScore"}
+            return None
+        keys.append((field, int(direction)))
+    return keys
+
+
+def _get_index_status(
+    index_key: tuple[tuple[str, Any], ...], predicates: _Predicates
+) -> Optional[str]:
+    """How well an index with the key serves the predicates. None if it can't."""
+    if not all(direction in (ASCENDING, DESCENDING) for _, direction in index_key):
+        return None
+
+    equality = set(predicates.equality)
+    sort = [(field, d) for field, d in predicates.sort if field not in equality]
+    range_fields = set(predicates.range) - equality
+
+    position = 0
+    while position < len(index_key) and index_key[position][0] in equality:
+        position += 1
+    equality_count = position
+
+    sorted_by_index = not sort
+    if sort:
+        window = list(index_key[position : position + len(sort)])
+        directions = [d for _, d in window]
+        if [field for field, _ in window] == [field for field, _ in sort] and (
+            directions == [d for _, d in sort] or directions == [-d for _, d in sort]
+        ):
+            sorted_by_index = True
+            position += len(sort)
+
+    range_start = position
+    while position < len(index_key) and index_key[position][0] in range_fields:
+        position += 1
+    range_count = position - range_start
+
+    if position == 0:
+        return None
+    if (
+        equality_count == len(equality)
+        and sorted_by_index
+        and range_count == len(range_fields)
+    ):
+        return STATUS_OPTIMAL
+    return STATUS_PARTIAL
+
+
+def _get_best_index(
+    indexes: list[DECLARED_INDEX_TYPE], predicates: _Predicates
+) -> tuple[str, Optional[str]]:
+    """(status, index name) of the declared index that serves the predicates best"""
+    best: tuple[str, Optional[str]] = (STATUS_UNINDEXED, None)
+    for name, key in indexes:
+        status = _get_index_status(key, predicates)
+        if status == STATUS_OPTIMAL:
+            return status, name
+        if status == STATUS_PARTIAL and best[1] is None:
+            best = (status, name)
+
+    return best
+
+
+def _get_declared_indexes() -> dict[
+    tuple[Optional[str], str], list[DECLARED_INDEX_TYPE]
+]:
+    """(name, key) of the usable declared indexes by (database, collection)"""
+    declared: dict[tuple[Optional[str], str], list[DECLARED_INDEX_TYPE]] = {}
+    for collection in _get_collections():
+        indexes: list[DECLARED_INDEX_TYPE] = [(ID_INDEX_NAME, (("_id", ASCENDING),))]
+        for _, index in collection.declared:
+            document = index.document
+            # Partial and hidden indexes can't serve every query on the fields
+            if document.get("hidden") or "partialFilterExpression" in document:
+                continue
+            indexes.append((document["name"], get_index_keys(document)))
+        declared[(collection.database_name, collection.collection_name)] = indexes
+
+    return declared
+
+
+def _advise_shape(
+    shape: QueryShape, indexes: list[DECLARED_INDEX_TYPE]
+) -> Optional[QueryIndexAdvice]:
+    sort = _get_sort(shape.sort)
+    all_predicates = _get_predicates(shape.filter)
+    if sort is None or not all(predicates.supported for predicates in all_predicates):
+        return QueryIndexAdvice(shape=shape, status=STATUS_UNSUPPORTED)
+
+    advice = QueryIndexAdvice(shape=shape, status=STATUS_OPTIMAL)
+    for predicates in all_predicates:
+        predicates.sort = sort
+        if not predicates.get_esr_key():
+            # Read the whole collection without filter and sort
+            continue
+
+        status, index_name = _get_best_index(indexes, predicates)
+        if index_name is not None and index_name not in advice.index_names:
+            advice.index_names.append(index_name)
+        if status != STATUS_OPTIMAL:
+            advice.suggested_keys.append(predicates.get_esr_key())
+        if status == STATUS_UNINDEXED or advice.status == STATUS_OPTIMAL:
+            advice.status = status
+
+    if not advice.index_names and not advice.suggested_keys:
+        return None
+    return advice
+
+
+def advise_indexes(
+    shapes: Union[QueryShapeRecorder, list[QueryShape]],
+) -> IndexAdvisorReport:
+    """
+    Compare the recorded query shapes with the indexes declared in ODMConfig.
+
+    Every query is described by its equality, sort and range fields and an index
+    is suggested in that order (ESR). Queries that no declared index can serve are
+    reported as unindexed. It doesn't connect to the database.
+    """
+    if isinstance(shapes, QueryShapeRecorder):
+        shapes = shapes.get_shapes()
+
+    declared = _get_declared_indexes()
+    advice: list[QueryIndexAdvice] = []
+    for shape in shapes:
+        indexes = declared.get(
+            (shape.database_name, shape.collection_name),
+            [(ID_INDEX_NAME, (("_id", ASCENDING),))],
+        )
+        obj = _advise_shape(shape, indexes)
+        if obj is not None:
+            advice.append(obj)
+
+    return IndexAdvisorReport(advice=advice)
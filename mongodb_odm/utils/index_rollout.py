@@ -0,0 +1,274 @@
+import asyncio
+import logging
+import threading
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timezone
+from typing import Any, Optional, Union
+from typing import cast as type_cast
+
+from mongodb_odm.connection import DEFAULT_CONNECTION_ALIAS, db
+from mongodb_odm.exceptions import ConnectionError
+from mongodb_odm.types import DICT_TYPE
+from pydantic import BaseModel
+from pymongo import DeleteMany, UpdateOne
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.collection import Collection
+
+logger = logging.getLogger(__name__)
+
+"""Keep the time when an index was hidden by a staged apply_indexes"""
+INDEX_STAGING_COLLECTION_NAME = "odm_hidden_indexes"
+
+"""Hidden indexes are dropped one day after they were hidden by default"""
+DEFAULT_DROP_GRACE_PERIOD = 24 * 60 * 60.0
+
+"""Hidden indexes by (connection, database, collection)"""
+HIDDEN_AT_TYPE = dict[tuple[str, Optional[str], str], dict[str, datetime]]
+
+
+class IndexBuildProgress(BaseModel):
+    collection_name: str
+    indexes: list[str] = []
+    message: Optional[str] = None
+    done: Optional[int] = None
+    total: Optional[int] = None
+
+    @property
+    def percent(self) -> Optional[float]:
+        if not self.total or self.done is None:
+            return None
+        return round(self.done * 100 / self.total, 2)
+
+    def __str__(self) -> str:
+        status = self.message or "in progress"
+        if self.percent is not None:
+            status = f"{self.done}/{self.total} ({self.percent}%)"
+        return (
+            f'Building {", ".join(self.indexes)} on "{self.collection_name}": {status}'
+        )
+
+
+def _get_staging_collection(
+    database_name: Optional[str],
+    connection: str = DEFAULT_CONNECTION_ALIAS,
+    is_async_action: Optional[bool] = None,
+) -> Union[Collection[Any], AsyncCollection[Any]]:
+    database = db(database_name, is_async_action=is_async_action, alias=connection)
+    return database[INDEX_STAGING_COLLECTION_NAME]
+
+
+def get_utc_datetime(value: datetime) -> datetime:
+    """
+    Aware UTC datetime. The server stores UTC, a client without tz_aware=True
+    returns it as a naive datetime.
+    """
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _get_staging_id(collection_name: str, index_name: str) -> str:
+    return f"{collection_name}.{index_name}"
+
+
+def get_staging_updates(
+    collection_name: str, hidden: list[str], removed: list[str]
+) -> list[Union[UpdateOne, DeleteMany]]:
+    """Record newly hidden indexes and forget the dropped or unhidden ones"""
+    requests: list[Union[UpdateOne, DeleteMany]] = [
+        UpdateOne(
+            {"_id": _get_staging_id(collection_name, index_name)},
+            {
+                "$set": {"collection": collection_name, "index": index_name},
+                "$setOnInsert": {"hidden_at": datetime.now(timezone.utc)},
+            },
+            upsert=True,
+        )
+        for index_name in hidden
+    ]
+    if removed:
+        ids = [_get_staging_id(collection_name, name) for name in removed]
+        requests.append(DeleteMany({"_id": {"$in": ids}}))
+
+    return requests
+
+
+def _add_hidden_at(
+    hidden_at: HIDDEN_AT_TYPE,
+    connection: str,
+    database_name: Optional[str],
+    obj: DICT_TYPE,
+) -> None:
+    key = (connection, database_name, obj["collection"])
+    hidden_at.setdefault(key, {})[obj["index"]] = get_utc_datetime(obj["hidden_at"])
+
+
+def sync_get_hidden_at(
+    collection_names: dict[tuple[str, Optional[str]], list[str]],
+) -> HIDDEN_AT_TYPE:
+    """
+    Time when each staged index was hidden.
+    `collection_names` are grouped by (connection, database).
+    """
+    hidden_at: HIDDEN_AT_TYPE = {}
+    for (connection, database_name), names in collection_names.items():
+        collection = _get_staging_collection(database_name, connection)
+        if not isinstance(collection, Collection):
+            raise ConnectionError("Use synchronous collection for indexes.")
+
+        for obj in collection.find({"collection": {"$in": names}}):
+            _add_hidden_at(hidden_at, connection, database_name, obj)
+
+    return hidden_at
+
+
+async def async_get_hidden_at(
+    collection_names: dict[tuple[str, Optional[str]], list[str]],
+) -> HIDDEN_AT_TYPE:
+    hidden_at: HIDDEN_AT_TYPE = {}
+    for (connection, database_name), names in collection_names.items():
+        collection = _get_staging_collection(database_name, connection, True)
+        if not isinstance(collection, AsyncCollection):
+            raise ConnectionError("Use asynchronous collection for indexes.")
+
+        async for obj in collection.find({"collection": {"$in": names}}):
+            _add_hidden_at(hidden_at, connection, database_name, obj)
+
+    return hidden_at
+
+
+def sync_save_staging(
+    database_name: Optional[str],
+    collection_name: str,
+    hidden: list[str],
+    removed: list[str],
+    connection: str = DEFAULT_CONNECTION_ALIAS,
+) -> None:
+    requests = get_staging_updates(collection_name, hidden, removed)
+    if requests:
+        collection = type_cast(
+            Collection[Any], _get_staging_collection(database_name, connection)
+        )
+        collection.bulk_write(requests, ordered=False)
+
+
+async def async_save_staging(
+    database_name: Optional[str],
+    collection_name: str,
+    hidden: list[str],
+    removed: list[str],
+    connection: str = DEFAULT_CONNECTION_ALIAS,
+) -> None:
+    requests = get_staging_updates(collection_name, hidden, removed)
+    if requests:
+        collection = type_cast(
+            AsyncCollection[Any],
+            _get_staging_collection(database_name, connection, True),
+        )
+        await collection.bulk_write(requests, ordered=False)
+
+
+def _get_current_op_pipeline(
+    collection: Union[Collection[Any], AsyncCollection[Any]],
+) -> list[DICT_TYPE]:
+    return [
+        {"$currentOp": {"allUsers": True, "idleConnections": False}},
+        {
+            "$match": {
+                "command.createIndexes": collection.name,
+                "ns": {
+                    "$in": [collection.full_name, f"{collection.database.name}.$cmd"]
+                },
+            }
+        },
+    ]
+
+
+def _get_build_progress(
+    collection_name: str, operation: DICT_TYPE
+) -> IndexBuildProgress:
+    indexes = operation.get("command", {}).get("indexes", [])
+    progress = operation.get("progress", {})
+    return IndexBuildProgress(
+        collection_name=collection_name,
+        indexes=[index.get("name", "") for index in indexes],
+        message=operation.get("msg"),
+        done=progress.get("done"),
+        total=progress.get("total"),
+    )
+
+
+def get_index_build_progress(collection: Collection[Any]) -> list[IndexBuildProgress]:
+    """In-progress index builds of a collection read from $currentOp"""
+    operations = collection.database.client.admin.aggregate(
+        _get_current_op_pipeline(collection)
+    )
+    return [_get_build_progress(collection.name, op) for op in operations]
+
+
+async def aget_index_build_progress(
+    collection: AsyncCollection[Any],
+) -> list[IndexBuildProgress]:
+    operations = await collection.database.client.admin.aggregate(
+        _get_current_op_pipeline(collection)
+    )
+    return [_get_build_progress(collection.name, op) async for op in operations]
+
+
+@contextmanager
+def monitor_index_builds(
+    collection: Collection[Any], interval: Optional[float]
+) -> Iterator[None]:
+    """Log the progress of the index builds every `interval` seconds"""
+    if not interval:
+        yield
+        return
+
+    stop = threading.Event()
+
+    def run() -> None:
+        while not stop.wait(interval):
+            try:
+                for progress in get_index_build_progress(collection):
+                    logger.info(str(progress))
+            except Exception as e:
+                logger.warning(f"Unable to read index build progress: {e}")
+
+    thread = threading.Thread(
+        target=run, name="mongodb-odm-index-build-monitor", daemon=True
+    )
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+@asynccontextmanager
+async def amonitor_index_builds(
+    collection: AsyncCollection[Any], interval: Optional[float]
+) -> AsyncIterator[None]:
+    if not interval:
+        yield
+        return
+
+    async def run() -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                for progress in await aget_index_build_progress(collection):
+                    logger.info(str(progress))
+            except Exception as e:
+                logger.warning(f"Unable to read index build progress: {e}")
+
+    task = asyncio.get_running_loop().create_task(run())
+    try:
+        yield
+    finally:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,132 @@
+from collections.abc import Mapping
+from typing import Any, Optional
+
+from pymongo import TEXT
+
+"""Hashable and order independent representation of an index"""
+IndexSpec = tuple[tuple[str, Any], ...]
+
+"""Added by the server or only meaningful at build time"""
+IGNORED_INDEX_OPTIONS = {
+    "v",
+    "ns",
+    "name",
+    "key",
+    "background",
+    "textIndexVersion",
+    "2dsphereIndexVersion",
+}
+
+DEFAULT_INDEX_OPTIONS: dict[str, Any] = {
+    "unique": False,
+    "sparse": False,
+    "hidden": False,
+    "default_language": "english",
+    "language_override": "language",
+}
+BOOLEAN_INDEX_OPTIONS = {"unique", "sparse", "hidden"}
+
+"""The server returns every collation option along with the ICU version"""
+DEFAULT_COLLATION_OPTIONS: dict[str, Any] = {
+    "caseLevel": False,
+    "caseFirst": "off",
+    "strength": 3,
+    "numericOrdering": False,
+    "alternate": "non-ignorable",
+    "maxVariable": "punct",
+    "normalization": False,
+    "backwards": False,
+}
+
+TEXT_INDEX_KEYS = (("_fts", TEXT), ("_ftsx", 1))
+
+
+def _freeze(value: Any) -> Any:
+    """Convert a value into a hashable value where the order of mapping keys is ignored"""
+    if isinstance(value, Mapping):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+
+    return value
+
+
+def _get_key_items(document: Mapping[str, Any]) -> list[tuple[str, Any]]:
+    return [(str(field), _freeze(value)) for field, value in document["key"].items()]
+
+
+def get_text_weights(document: Mapping[str, Any]) -> dict[str, Any]:
+    """Weights of a text index. Every text field has weight 1 by default."""
+    weights = {field: 1 for field, value in _get_key_items(document) if value == TEXT}
+    weights.update(document.get("weights") or {})
+    return weights
+
+
+def get_index_keys(document: Mapping[str, Any]) -> tuple[tuple[str, Any], ...]:
+    """
+    Keys of the index in the form that the server stores them.
+    The fields of a text index are replaced with "_fts" and "_ftsx",
+    the text fields are stored as weights.
+    """
+    keys: list[tuple[str, Any]] = []
+    for field, value in _get_key_items(document):
+        if field == "_ftsx":
+            continue
+        if value != TEXT:
+            keys.append((field, value))
+        elif TEXT_INDEX_KEYS[0] not in keys:
+            keys.extend(TEXT_INDEX_KEYS)
+
+    return tuple(keys)
+
+
+def is_text_index(document: Mapping[str, Any]) -> bool:
+    return any(
+        field == "_fts" or value == TEXT for field, value in _get_key_items(document)
+    )
+
+
+def _get_collation(collation: Optional[Mapping[str, Any]]) -> Optional[Any]:
+    if not collation or collation.get("locale") == "simple":
+        return None
+
+    options = {
+        key: value
+        for key, value in collation.items()
+        if key != "version" and DEFAULT_COLLATION_OPTIONS.get(key) != value
+    }
+    return _freeze(options)
+
+
+def get_index_spec(document: Mapping[str, Any]) -> IndexSpec:
+    """
+    Canonical form of an index document of the model (IndexModel.document)
+    or of the database (list_indexes). Two indexes that the server treats
+    as the same index have the same spec, regardless of the option order,
+    default values, server-added fields and the index name.
+    """
+    options: dict[str, Any] = {}
+    for key, value in document.items():
+        if key in IGNORED_INDEX_OPTIONS or key == "weights":
+            continue
+        if key in BOOLEAN_INDEX_OPTIONS:
+            value = bool(value)
+        if key == "collation":
+            value = _get_collation(value)
+            if value is None:
+                continue
+        elif DEFAULT_INDEX_OPTIONS.get(key, ...) == value:
+            continue
+
+        options[key] = _freeze(value)
+
+    if is_text_index(document):
+        weights = document.get("weights") if "_fts" in document["key"] else None
+        options["weights"] = _freeze(weights or get_text_weights(document))
+    else:
+        for key in ("default_language", "language_override"):
+            options.pop(key, None)
+
+    return (("key", get_index_keys(document)), *sorted(options.items()))
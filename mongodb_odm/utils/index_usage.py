@@ -0,0 +1,321 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from mongodb_odm.models import INHERITANCE_FIELD_NAME, Document
+from mongodb_odm.types import DICT_TYPE
+from mongodb_odm.utils.apply_indexes import (
+    DEFAULT_MAX_WORKERS,
+    _gather_with_limit,
+    _get_model_indexes,
+    _run_in_threads,
+)
+from mongodb_odm.utils.index_spec import IndexSpec, get_index_keys, get_index_spec
+from pydantic import BaseModel
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReadPreference
+
+ID_INDEX_NAME = "_id_"
+
+"""A prefix index with one of these options is not covered by the longer index"""
+PREFIX_BLOCKING_OPTIONS = {
+    "unique",
+    "sparse",
+    "partialFilterExpression",
+    "expireAfterSeconds",
+    "collation",
+}
+
+
+class IndexUsage(BaseModel):
+    collection_name: str
+    database_name: Optional[str] = None
+    name: str
+    key: list[tuple[str, Any]]
+    """Model that declares the index. None if the index only exists in the database."""
+    model_name: Optional[str] = None
+    """Name of the matching IndexModel of the model"""
+    declared_name: Optional[str] = None
+    accesses: int = 0
+    since: Optional[datetime] = None
+    """Members that reported the accesses"""
+    hosts: list[str] = []
+
+    unused: bool = False
+    """Name of the index that starts with the same keys and can serve the same queries"""
+    redundant_of: Optional[str] = None
+    """Name of another index with the same keys"""
+    duplicate_of: Optional[str] = None
+
+    @property
+    def declared(self) -> bool:
+        return self.model_name is not None
+
+    @property
+    def is_flagged(self) -> bool:
+        return bool(self.unused or self.redundant_of or self.duplicate_of)
+
+    def __str__(self) -> str:
+        reasons: list[str] = []
+        if self.unused:
+            reasons.append(f"unused since {self.since}")
+        if self.redundant_of:
+            reasons.append(f"prefix of {self.redundant_of}")
+        if self.duplicate_of:
+            reasons.append(f"duplicate of {self.duplicate_of}")
+
+        owner = self.model_name or "not declared"
+        return (
+            f'"{self.collection_name}".{self.name} ({owner}): '
+            f"{self.accesses} accesses, {', '.join(reasons) or 'ok'}"
+        )
+
+
+class IndexUsageReport(BaseModel):
+    """
+    Usage of the indexes of every Document collection.
+
+    $indexStats only counts the accesses of the member that runs it, the
+    report covers the primary only. An index that only serves the reads of
+    the secondaries looks unused.
+
+    Serialize it with `model_dump_json()` or print it for a summary.
+    """
+
+    indexes: list[IndexUsage] = []
+
+    def get_hosts(self) -> list[str]:
+        return sorted({host for index in self.indexes for host in index.hosts})
+
+    def get_unused(self) -> list[IndexUsage]:
+        return [index for index in self.indexes if index.unused]
+
+    def get_redundant(self) -> list[IndexUsage]:
+        return [index for index in self.indexes if index.redundant_of]
+
+    def get_duplicates(self) -> list[IndexUsage]:
+        return [index for index in self.indexes if index.duplicate_of]
+
+    def get_flagged(self) -> list[IndexUsage]:
+        return [index for index in self.indexes if index.is_flagged]
+
+    def __str__(self) -> str:
+        lines: list[str] = []
+        hosts = self.get_hosts()
+        if hosts:
+            lines.append(
+                f"Accesses of {', '.join(hosts)} only, "
+                "the reads of the other members are not counted."
+            )
+
+        flagged = self.get_flagged()
+        if not flagged:
+            lines.append(f"All {len(self.indexes)} indexes are in use.")
+        lines += [str(index) for index in flagged]
+        return "\n".join(lines)
+
+
+class _CollectionIndexes(BaseModel):
+    model: Any
+    collection_name: str
+    database_name: Optional[str] = None
+    """(model name, index) of every index declared for the collection"""
+    declared: list[tuple[str, Any]] = []
+
+
+def _get_collections() -> list[_CollectionIndexes]:
+    collections: list[_CollectionIndexes] = []
+
+    for model in Document.__subclasses__():
+        obj = _CollectionIndexes(
+            model=model,
+            collection_name=model._get_collection_name(),
+            database_name=model._database_name(),
+            declared=[(model.__name__, index) for index in _get_model_indexes(model)],
+        )
+        if getattr(model.ODMConfig, "allow_inheritance", False) is True:
+            if model.ODMConfig.index_inheritance_field is True:
+                inheritance_index = IndexModel([(INHERITANCE_FIELD_NAME, ASCENDING)])
+                obj.declared.append((model.__name__, inheritance_index))
+            for child_model in model.__subclasses__():
+                obj.declared += [
+                    (child_model.__name__, index)
+                    for index in _get_model_indexes(child_model)
+                ]
+        collections.append(obj)
+
+    return collections
+
+
+def _merge_index_stats(index_stats: list[DICT_TYPE]) -> list[DICT_TYPE]:
+    """$indexStats returns one document per host. Sum the accesses by index."""
+    merged: dict[str, DICT_TYPE] = {}
+    for stats in index_stats:
+        accesses = stats.get("accesses", {})
+        name = stats["name"]
+        if name not in merged:
+            merged[name] = {
+                "name": name,
+                "key": stats["key"],
+                "spec": stats.get("spec") or {"key": stats["key"], "name": name},
+                "ops": 0,
+                "since": accesses.get("since"),
+                "hosts": [],
+            }
+        obj = merged[name]
+        obj["ops"] += int(accesses.get("ops", 0))
+        host = stats.get("host")
+        if host is not None and host not in obj["hosts"]:
+            obj["hosts"].append(host)
+        since = accesses.get("since")
+        if since is not None and (obj["since"] is None or since < obj["since"]):
+            obj["since"] = since
+
+    return list(merged.values())
+
+
+def _get_visible_spec(document: DICT_TYPE) -> IndexSpec:
+    return get_index_spec({**document, "hidden": False})
+
+
+def _is_simple_key(key: tuple[tuple[str, Any], ...]) -> bool:
+    return all(value in (ASCENDING, DESCENDING) for _, value in key)
+
+
+def _is_prefix_of(
+    prefix: DICT_TYPE, prefix_key: tuple[tuple[str, Any], ...], other: DICT_TYPE
+) -> bool:
+    other_key = get_index_keys(other)
+    if len(prefix_key) >= len(other_key) or other_key[: len(prefix_key)] != prefix_key:
+        return False
+    if not _is_simple_key(prefix_key) or not _is_simple_key(other_key):
+        return False
+    if any(option in prefix for option in PREFIX_BLOCKING_OPTIONS):
+        return False
+
+    # The longer index can not serve every query of the prefix if it is partial.
+    return "partialFilterExpression" not in other and "collation" not in other
+
+
+def _can_be_replaced(spec: DICT_TYPE) -> bool:
+    """Unique and TTL indexes do more than serving queries"""
+    return not spec.get("unique") and "expireAfterSeconds" not in spec
+
+
+def _is_preferred(
+    usage: IndexUsage,
+    spec: DICT_TYPE,
+    position: int,
+    other: IndexUsage,
+    other_position: int,
+) -> bool:
+    """Out of two indexes with the same keys keep the constrained or the most used one"""
+    if not _can_be_replaced(spec):
+        return True
+    return (usage.accesses, -position) > (other.accesses, -other_position)
+
+
+def _flag_indexes(usages: list[IndexUsage], specs: list[DICT_TYPE]) -> None:
+    for idx, (usage, spec) in enumerate(zip(usages, specs)):
+        if usage.name == ID_INDEX_NAME or not _can_be_replaced(spec):
+            continue
+
+        key = get_index_keys(spec)
+        for other_idx, (other, other_spec) in enumerate(zip(usages, specs)):
+            if other_idx == idx or other_spec.get("hidden"):
+                continue
+            if get_index_keys(other_spec) == key:
+                if _is_preferred(other, other_spec, other_idx, usage, idx):
+                    usage.duplicate_of = other.name
+                    break
+            elif _is_prefix_of(spec, key, other_spec):
+                usage.redundant_of = other.name
+                break
+
+
+def _analyze_collection(
+    collection: _CollectionIndexes,
+    index_stats: list[DICT_TYPE],
+    unused_threshold: int = 0,
+) -> list[IndexUsage]:
+    """Map $indexStats results back to the declared indexes and flag them"""
+    declared_specs: dict[IndexSpec, list[tuple[str, IndexModel]]] = {}
+    for model_name, index in collection.declared:
+        spec = _get_visible_spec(index.document)
+        declared_specs.setdefault(spec, []).append((model_name, index))
+
+    usages: list[IndexUsage] = []
+    db_specs: list[DICT_TYPE] = []
+    for stats in _merge_index_stats(index_stats):
+        db_spec = dict(stats["spec"])
+        declared = declared_specs.get(_get_visible_spec(db_spec))
+        declared_by: Optional[str] = None
+        declared_name: Optional[str] = None
+        if declared:
+            declared_by, index = declared.pop(0)
+            declared_name = index.document["name"]
+
+        usages.append(
+            IndexUsage(
+                collection_name=collection.collection_name,
+                database_name=collection.database_name,
+                name=stats["name"],
+                key=list(stats["key"].items()),
+                model_name=declared_by,
+                declared_name=declared_name,
+                accesses=stats["ops"],
+                since=stats["since"],
+                hosts=stats["hosts"],
+                unused=stats["name"] != ID_INDEX_NAME
+                and stats["ops"] <= unused_threshold,
+            )
+        )
+        db_specs.append(db_spec)
+
+    _flag_indexes(usages, db_specs)
+
+    return usages
+
+
+def _get_index_stats_pipeline() -> list[DICT_TYPE]:
+    return [{"$indexStats": {}}]
+
+
+def get_index_usage_report(
+    unused_threshold: int = 0, max_workers: int = DEFAULT_MAX_WORKERS
+) -> IndexUsageReport:
+    """
+    Run $indexStats for the collection of every Document model and flag
+    the indexes that are unused, a prefix of another index or a duplicate.
+
+    unused_threshold: Indexes with this many accesses or fewer are unused.
+    Accesses are counted since the server started or the index was created.
+
+    It runs on the primary, whatever the read preference of the model is.
+    The accesses of the secondaries are not counted, see IndexUsageReport.
+    """
+
+    def analyze(collection: _CollectionIndexes) -> list[IndexUsage]:
+        index_stats = collection.model._get_collection(
+            read_preference=ReadPreference.PRIMARY
+        ).aggregate(_get_index_stats_pipeline())
+        return _analyze_collection(collection, list(index_stats), unused_threshold)
+
+    results = _run_in_threads(analyze, _get_collections(), max_workers)
+
+    return IndexUsageReport(indexes=[usage for usages in results for usage in usages])
+
+
+async def aget_index_usage_report(
+    unused_threshold: int = 0, max_concurrency: int = DEFAULT_MAX_WORKERS
+) -> IndexUsageReport:
+    """Async version of get_index_usage_report()"""
+
+    async def analyze(collection: _CollectionIndexes) -> list[IndexUsage]:
+        cursor = await collection.model._async_get_collection(
+            read_preference=ReadPreference.PRIMARY
+        ).aggregate(_get_index_stats_pipeline())
+        index_stats = [obj async for obj in cursor]
+        return _analyze_collection(collection, index_stats, unused_threshold)
+
+    results = await _gather_with_limit(analyze, _get_collections(), max_concurrency)
+
+    return IndexUsageReport(indexes=[usage for usages in results for usage in usages])
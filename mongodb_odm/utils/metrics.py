@@ -0,0 +1,411 @@
+import threading
+from typing import Any, Optional, Union
+
+import bson
+from pydantic import BaseModel
+from pymongo import monitoring
+
+"""Upper bounds of the latency histogram buckets in milliseconds"""
+LATENCY_BUCKETS_MS = (
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    25.0,
+    50.0,
+    100.0,
+    250.0,
+    500.0,
+    1000.0,
+    2500.0,
+    5000.0,
+    10000.0,
+)
+
+METRIC_PREFIX = "mongodb_odm"
+
+"""Commands that name the collection in another field than the command name"""
+COLLECTION_FIELDS = {"getMore": "collection"}
+
+COMMAND_KEY_TYPE = tuple[str, Optional[str], str]
+
+
+class LatencyHistogram(BaseModel):
+    """
+    counts[i] is the number of observations in (bounds[i - 1], bounds[i]],
+    the last count is for the observations above the last bound.
+    """
+
+    bounds: list[float] = list(LATENCY_BUCKETS_MS)
+    counts: list[int] = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+    count: int = 0
+    total_ms: float = 0
+    max_ms: float = 0
+
+    def observe(self, value_ms: float) -> None:
+        position = 0
+        while position < len(self.bounds) and value_ms > self.bounds[position]:
+            position += 1
+        self.counts[position] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+
+    @property
+    def mean_ms(self) -> Optional[float]:
+        return self.total_ms / self.count if self.count else None
+
+    def get_percentile(self, percentile: float) -> Optional[float]:
+        """Upper bound of the bucket of the percentile, max_ms for the last one"""
+        if not self.count:
+            return None
+        rank = self.count * percentile / 100
+        seen = 0
+        for position, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                if position < len(self.bounds):
+                    return min(self.bounds[position], self.max_ms)
+                return self.max_ms
+        return self.max_ms
+
+
+class CommandMetrics(BaseModel):
+    database_name: str
+    collection_name: Optional[str] = None
+    command_name: str
+    count: int = 0
+    errors: int = 0
+    latency: LatencyHistogram = LatencyHistogram()
+    """BSON size of the commands and replies, see measure_bytes"""
+    request_bytes: int = 0
+    reply_bytes: int = 0
+
+
+class PoolMetrics(BaseModel):
+    address: str
+    connections_created: int = 0
+    connections_closed: int = 0
+    """Connections in use right now"""
+    checked_out: int = 0
+    checkouts: int = 0
+    checkout_failures: int = 0
+    """Time spent waiting for a connection of the pool"""
+    checkout_wait: LatencyHistogram = LatencyHistogram()
+    cleared: int = 0
+
+
+class ServerMetrics(BaseModel):
+    address: str
+    heartbeats: int = 0
+    heartbeat_failures: int = 0
+    last_rtt_ms: Optional[float] = None
+    rtt: LatencyHistogram = LatencyHistogram()
+
+
+def _get_labels(**labels: Any) -> str:
+    values = [
+        f'{name}="{value}"' for name, value in labels.items() if value is not None
+    ]
+    return "{" + ",".join(values) + "}"
+
+
+def _get_histogram_lines(
+    name: str, histogram: LatencyHistogram, **labels: Any
+) -> list[str]:
+    lines: list[str] = []
+    cumulative = 0
+    for bound, count in zip([*histogram.bounds, "+Inf"], histogram.counts):
+        cumulative += count
+        lines.append(f"{name}_bucket{_get_labels(**labels, le=bound)} {cumulative}")
+    lines.append(f"{name}_sum{_get_labels(**labels)} {histogram.total_ms}")
+    lines.append(f"{name}_count{_get_labels(**labels)} {histogram.count}")
+    return lines
+
+
+class MetricsSnapshot(BaseModel):
+    commands: list[CommandMetrics] = []
+    pools: list[PoolMetrics] = []
+    servers: list[ServerMetrics] = []
+
+    def get_command(
+        self, collection_name: Optional[str], command_name: str
+    ) -> Optional[CommandMetrics]:
+        return next(
+            (
+                obj
+                for obj in self.commands
+                if obj.collection_name == collection_name
+                and obj.command_name == command_name
+            ),
+            None,
+        )
+
+    def to_text(self) -> str:
+        """Prometheus text exposition format"""
+        lines = _get_command_lines(self.commands)
+        lines += _get_pool_lines(self.pools)
+        lines += _get_server_lines(self.servers)
+        return "\n".join(lines) + "\n"
+
+
+def _get_command_lines(commands: list[CommandMetrics]) -> list[str]:
+    name = f"{METRIC_PREFIX}_command"
+    lines = [f"# TYPE {name}_duration_ms histogram"]
+    for obj in commands:
+        labels = {
+            "database": obj.database_name,
+            "collection": obj.collection_name,
+            "command": obj.command_name,
+        }
+        text_labels = _get_labels(**labels)
+        lines += _get_histogram_lines(f"{name}_duration_ms", obj.latency, **labels)
+        lines.append(f"{name}_errors_total{text_labels} {obj.errors}")
+        if obj.request_bytes or obj.reply_bytes:
+            lines.append(f"{name}_request_bytes_total{text_labels} {obj.request_bytes}")
+            lines.append(f"{name}_reply_bytes_total{text_labels} {obj.reply_bytes}")
+
+    return lines
+
+
+def _get_pool_lines(pools: list[PoolMetrics]) -> list[str]:
+    name = f"{METRIC_PREFIX}_pool"
+    lines = [f"# TYPE {name}_checkout_wait_ms histogram"]
+    for obj in pools:
+        labels = _get_labels(address=obj.address)
+        lines += _get_histogram_lines(
+            f"{name}_checkout_wait_ms", obj.checkout_wait, address=obj.address
+        )
+        lines += [
+            f"{name}_checked_out{labels} {obj.checked_out}",
+            f"{name}_checkout_failures_total{labels} {obj.checkout_failures}",
+            f"{name}_connections_created_total{labels} {obj.connections_created}",
+            f"{name}_connections_closed_total{labels} {obj.connections_closed}",
+            f"{name}_cleared_total{labels} {obj.cleared}",
+        ]
+
+    return lines
+
+
+def _get_server_lines(servers: list[ServerMetrics]) -> list[str]:
+    name = f"{METRIC_PREFIX}_server"
+    lines = [f"# TYPE {name}_heartbeat_rtt_ms histogram"]
+    for obj in servers:
+        labels = _get_labels(address=obj.address)
+        lines += _get_histogram_lines(
+            f"{name}_heartbeat_rtt_ms", obj.rtt, address=obj.address
+        )
+        lines.append(
+            f"{name}_heartbeat_failures_total{labels} {obj.heartbeat_failures}"
+        )
+
+    return lines
+
+
+def _get_address(address: Any) -> str:
+    if isinstance(address, tuple):
+        return f"{address[0]}:{address[1]}"
+    return str(address)
+
+
+def _get_collection_name(command_name: str, command: Any) -> Optional[str]:
+    value = command.get(COLLECTION_FIELDS.get(command_name, command_name))
+    return value if isinstance(value, str) else None
+
+
+class MetricsRegistry:
+    """
+    In-process aggregates of the driver events. Register its listeners with
+    connect(metrics=True) and read them with snapshot() or to_text().
+    """
+
+    def __init__(self, measure_bytes: bool = False) -> None:
+        """measure_bytes: Encode every command and reply to sum their BSON size"""
+        self.measure_bytes = measure_bytes
+        self._lock = threading.Lock()
+        self._commands: dict[COMMAND_KEY_TYPE, CommandMetrics] = {}
+        self._pools: dict[str, PoolMetrics] = {}
+        self._servers: dict[str, ServerMetrics] = {}
+        """Collection and size of the started commands by (request id, connection)"""
+        self._started: dict[tuple[int, Any], tuple[Optional[str], int]] = {}
+        self._listeners: Optional[list[monitoring._EventListener]] = None
+
+    def get_listeners(self) -> list[monitoring._EventListener]:
+        if self._listeners is None:
+            self._listeners = [
+                CommandMetricsListener(self),
+                PoolMetricsListener(self),
+                ServerMetricsListener(self),
+            ]
+        return self._listeners
+
+    def _get_pool(self, address: Any) -> PoolMetrics:
+        key = _get_address(address)
+        if key not in self._pools:
+            self._pools[key] = PoolMetrics(address=key)
+        return self._pools[key]
+
+    def _get_server(self, address: Any) -> ServerMetrics:
+        key = _get_address(address)
+        if key not in self._servers:
+            self._servers[key] = ServerMetrics(address=key)
+        return self._servers[key]
+
+    def _command_started(self, event: monitoring.CommandStartedEvent) -> None:
+        collection_name = _get_collection_name(event.command_name, event.command)
+        size = len(bson.encode(event.command)) if self.measure_bytes else 0
+        with self._lock:
+            self._started[(event.request_id, event.connection_id)] = (
+                collection_name,
+                size,
+            )
+
+    def _command_finished(
+        self,
+        event: Union[monitoring.CommandSucceededEvent, monitoring.CommandFailedEvent],
+        reply: Optional[Any] = None,
+    ) -> None:
+        size = len(bson.encode(reply)) if self.measure_bytes and reply else 0
+        with self._lock:
+            collection_name, request_size = self._started.pop(
+                (event.request_id, event.connection_id), (None, 0)
+            )
+            key = (event.database_name, collection_name, event.command_name)
+            if key not in self._commands:
+                self._commands[key] = CommandMetrics(
+                    database_name=event.database_name,
+                    collection_name=collection_name,
+                    command_name=event.command_name,
+                )
+            obj = self._commands[key]
+            obj.count += 1
+            obj.latency.observe(event.duration_micros / 1000)
+            obj.request_bytes += request_size
+            obj.reply_bytes += size
+            if isinstance(event, monitoring.CommandFailedEvent):
+                obj.errors += 1
+
+    def snapshot(self) -> MetricsSnapshot:
+        with self._lock:
+            return MetricsSnapshot(
+                commands=[obj.model_copy(deep=True) for obj in self._commands.values()],
+                pools=[obj.model_copy(deep=True) for obj in self._pools.values()],
+                servers=[obj.model_copy(deep=True) for obj in self._servers.values()],
+            )
+
+    def to_text(self) -> str:
+        return self.snapshot().to_text()
+
+    def reset(self) -> None:
+        """Forget the aggregates, the connections in use are still counted"""
+        with self._lock:
+            self._commands.clear()
+            self._servers.clear()
+            for address, pool in list(self._pools.items()):
+                self._pools[address] = PoolMetrics(
+                    address=address, checked_out=pool.checked_out
+                )
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    def __init__(self, registry: MetricsRegistry) -> None:
+        self.registry = registry
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        self.registry._command_started(event)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self.registry._command_finished(event, event.reply)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self.registry._command_finished(event)
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    def __init__(self, registry: MetricsRegistry) -> None:
+        self.registry = registry
+
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None:
+        with self.registry._lock:
+            self.registry._get_pool(event.address)
+
+    def pool_ready(self, event: monitoring.PoolReadyEvent) -> None:
+        pass
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None:
+        with self.registry._lock:
+            self.registry._get_pool(event.address).cleared += 1
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent) -> None:
+        pass
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None:
+        with self.registry._lock:
+            self.registry._get_pool(event.address).connections_created += 1
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent) -> None:
+        pass
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None:
+        with self.registry._lock:
+            self.registry._get_pool(event.address).connections_closed += 1
+
+    def connection_check_out_started(
+        self, event: monitoring.ConnectionCheckOutStartedEvent
+    ) -> None:
+        pass
+
+    def connection_check_out_failed(
+        self, event: monitoring.ConnectionCheckOutFailedEvent
+    ) -> None:
+        with self.registry._lock:
+            pool = self.registry._get_pool(event.address)
+            pool.checkout_failures += 1
+            if event.duration is not None:
+                pool.checkout_wait.observe(event.duration * 1000)
+
+    def connection_checked_out(
+        self, event: monitoring.ConnectionCheckedOutEvent
+    ) -> None:
+        with self.registry._lock:
+            pool = self.registry._get_pool(event.address)
+            pool.checkouts += 1
+            pool.checked_out += 1
+            if event.duration is not None:
+                pool.checkout_wait.observe(event.duration * 1000)
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        with self.registry._lock:
+            pool = self.registry._get_pool(event.address)
+            pool.checked_out = max(pool.checked_out - 1, 0)
+
+
+class ServerMetricsListener(monitoring.ServerHeartbeatListener):
+    def __init__(self, registry: MetricsRegistry) -> None:
+        self.registry = registry
+
+    def started(self, event: monitoring.ServerHeartbeatStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: monitoring.ServerHeartbeatSucceededEvent) -> None:
+        # The duration is in seconds
+        rtt_ms = event.duration * 1000
+        with self.registry._lock:
+            server = self.registry._get_server(event.connection_id)
+            server.heartbeats += 1
+            server.last_rtt_ms = rtt_ms
+            server.rtt.observe(rtt_ms)
+
+    def failed(self, event: monitoring.ServerHeartbeatFailedEvent) -> None:
+        with self.registry._lock:
+            server = self.registry._get_server(event.connection_id)
+            server.heartbeats += 1
+            server.heartbeat_failures += 1
+
+
+"""Registry of connect(metrics=True)"""
+_metrics_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    return _metrics_registry
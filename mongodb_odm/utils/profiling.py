@@ -0,0 +1,262 @@
+import threading
+import time
+from collections.abc import AsyncIterator, Iterable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from types import TracebackType
+from typing import Any, Optional, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+"""Filter validation and the preparation of the cursor or the pipeline"""
+PHASE_VALIDATION = "validation"
+"""Driver calls and cursor batches, the server time is included"""
+PHASE_NETWORK = "network"
+"""Model instances built from the documents"""
+PHASE_HYDRATION = "hydration"
+"""Documents built from the model instances on writes"""
+PHASE_SERIALIZATION = "serialization"
+
+PHASES = (PHASE_VALIDATION, PHASE_NETWORK, PHASE_HYDRATION, PHASE_SERIALIZATION)
+
+"""Reports of the profile() blocks of the current thread or task"""
+_reports: ContextVar[tuple["ProfileReport", ...]] = ContextVar(
+    "mongodb_odm_profile_reports", default=()
+)
+"""Number of active profile() blocks in every thread"""
+_active_reports = 0
+_active_reports_lock = threading.Lock()
+
+_no_timer: AbstractContextManager[None] = nullcontext()
+
+
+class PhaseTiming(BaseModel):
+    model_name: str
+    method: str
+    phase: str
+    calls: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+
+    @property
+    def total_ms(self) -> float:
+        return self.total_ns / 1_000_000
+
+    def __str__(self) -> str:
+        return (
+            f"{self.model_name}.{self.method} {self.phase}: "
+            f"{self.total_ms:.3f}ms in {self.calls} calls"
+        )
+
+
+class ProfileReport:
+    """
+    Time spent in each phase of the ODM, by model and method.
+
+    A find is timed once for the validation and once for every step of the
+    cursor (network) and every document (hydration).
+    """
+
+    def __init__(self) -> None:
+        self._timings: dict[tuple[str, str, str], PhaseTiming] = {}
+        self._lock = threading.Lock()
+
+    def add(self, model_name: str, method: str, phase: str, duration_ns: int) -> None:
+        key = (model_name, method, phase)
+        with self._lock:
+            timing = self._timings.get(key)
+            if timing is None:
+                timing = self._timings[key] = PhaseTiming(
+                    model_name=model_name, method=method, phase=phase
+                )
+            timing.calls += 1
+            timing.total_ns += duration_ns
+            timing.max_ns = max(timing.max_ns, duration_ns)
+
+    def get_timings(
+        self,
+        model_name: Optional[str] = None,
+        method: Optional[str] = None,
+        phase: Optional[str] = None,
+    ) -> list[PhaseTiming]:
+        with self._lock:
+            timings = [timing.model_copy() for timing in self._timings.values()]
+        return [
+            timing
+            for timing in timings
+            if (model_name is None or timing.model_name == model_name)
+            and (method is None or timing.method == method)
+            and (phase is None or timing.phase == phase)
+        ]
+
+    def get_total_ns(
+        self,
+        model_name: Optional[str] = None,
+        method: Optional[str] = None,
+        phase: Optional[str] = None,
+    ) -> int:
+        return sum(
+            timing.total_ns for timing in self.get_timings(model_name, method, phase)
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._timings.clear()
+
+    def __str__(self) -> str:
+        calls: dict[tuple[str, str], dict[str, float]] = {}
+        for timing in self.get_timings():
+            key = (timing.model_name, timing.method)
+            calls.setdefault(key, {})[timing.phase] = timing.total_ms
+
+        lines = []
+        for (model_name, method), phases in sorted(calls.items()):
+            durations = ", ".join(
+                f"{phase} {phases[phase]:.3f}ms" for phase in PHASES if phase in phases
+            )
+            lines.append(f"{model_name}.{method}: {durations}")
+        return "\n".join(lines)
+
+
+class ProfileRegistry(ProfileReport):
+    """
+    Cumulative timings of the whole process. It only records while enabled.
+
+    get_profile_registry().enable()
+    ...
+    print(get_profile_registry())
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.is_enabled = False
+
+    def enable(self) -> None:
+        self.is_enabled = True
+
+    def disable(self) -> None:
+        self.is_enabled = False
+
+
+_profile_registry = ProfileRegistry()
+
+
+def get_profile_registry() -> ProfileRegistry:
+    return _profile_registry
+
+
+@contextmanager
+def profile() -> Iterator[ProfileReport]:
+    """
+    Time the ODM phases of the calls made in the block by the current thread
+    or task. Blocks can be nested, the outer reports include the inner calls.
+
+    with profile() as report:
+        list(Player.find({"country_code": "BD"}))
+
+    report.get_total_ns("Player", "find", PHASE_HYDRATION)
+    """
+    global _active_reports
+    report = ProfileReport()
+    token = _reports.set((*_reports.get(), report))
+    with _active_reports_lock:
+        _active_reports += 1
+    try:
+        yield report
+    finally:
+        with _active_reports_lock:
+            _active_reports -= 1
+        _reports.reset(token)
+
+
+def is_profiling() -> bool:
+    return _active_reports > 0 or _profile_registry.is_enabled
+
+
+def record_phase(model: Any, method: str, phase: str, duration_ns: int) -> None:
+    model_name = model.__name__
+    if _profile_registry.is_enabled:
+        _profile_registry.add(model_name, method, phase, duration_ns)
+    for report in _reports.get():
+        report.add(model_name, method, phase, duration_ns)
+
+
+class _PhaseTimer:
+    __slots__ = ("model", "method", "phase", "started_at")
+
+    def __init__(self, model: Any, method: str, phase: str) -> None:
+        self.model = model
+        self.method = method
+        self.phase = phase
+        self.started_at = 0
+
+    def __enter__(self) -> None:
+        self.started_at = time.perf_counter_ns()
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        record_phase(
+            self.model,
+            self.method,
+            self.phase,
+            time.perf_counter_ns() - self.started_at,
+        )
+
+
+def time_phase(model: Any, method: str, phase: str) -> AbstractContextManager[None]:
+    """Time the block when profiling, a shared no-op context otherwise"""
+    if not is_profiling():
+        return _no_timer
+    return _PhaseTimer(model, method, phase)
+
+
+def time_iteration(model: Any, method: str, iterable: Iterable[T]) -> Iterator[T]:
+    """Time every step of a cursor as network"""
+    iterator = iter(iterable)
+    if not is_profiling():
+        return iterator
+    return _time_iteration(model, method, iterator)
+
+
+def _time_iteration(model: Any, method: str, iterator: Iterator[T]) -> Iterator[T]:
+    while True:
+        started_at = time.perf_counter_ns()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            record_phase(
+                model, method, PHASE_NETWORK, time.perf_counter_ns() - started_at
+            )
+        yield item
+
+
+def atime_iteration(
+    model: Any, method: str, iterable: AsyncIterator[T]
+) -> AsyncIterator[T]:
+    if not is_profiling():
+        return iterable
+    return _atime_iteration(model, method, iterable)
+
+
+async def _atime_iteration(
+    model: Any, method: str, iterator: AsyncIterator[T]
+) -> AsyncIterator[T]:
+    while True:
+        started_at = time.perf_counter_ns()
+        try:
+            item = await iterator.__anext__()
+        except StopAsyncIteration:
+            return
+        finally:
+            record_phase(
+                model, method, PHASE_NETWORK, time.perf_counter_ns() - started_at
+            )
+        yield item
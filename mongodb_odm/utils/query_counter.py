@@ -0,0 +1,247 @@
+import logging
+import threading
+from contextvars import ContextVar, Token
+from functools import lru_cache
+from types import TracebackType
+from typing import Optional
+
+from mongodb_odm.connection import _get_connection, get_connection_aliases
+from mongodb_odm.exceptions import InvalidAction, QueryBudgetExceeded
+from mongodb_odm.models import Document
+from mongodb_odm.utils.metrics import _get_collection_name
+from pydantic import BaseModel
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+"""Handshake, authentication and session cleanup are not queries of the application"""
+IGNORED_COMMANDS = {
+    "hello",
+    "ismaster",
+    "isMaster",
+    "ping",
+    "saslStart",
+    "saslContinue",
+    "authenticate",
+    "getnonce",
+    "buildInfo",
+    "endSessions",
+}
+
+COUNT_KEY_TYPE = tuple[Optional[str], Optional[str], str]
+
+"""Counters of the current thread or task"""
+_counters: ContextVar[tuple["QueryCounter", ...]] = ContextVar(
+    "mongodb_odm_query_counters", default=()
+)
+"""Number of active counters in every thread"""
+_active_counters = 0
+_active_counters_lock = threading.Lock()
+
+
+class QueryCount(BaseModel):
+    """model_name is None for the collections that no model is defined for"""
+
+    model_name: Optional[str] = None
+    collection_name: Optional[str] = None
+    command_name: str
+    count: int = 0
+
+    def __str__(self) -> str:
+        target = self.model_name or self.collection_name or "-"
+        return f"{target}.{self.command_name}: {self.count}"
+
+
+@lru_cache(maxsize=1024)
+def _get_model_name(
+    database_name: str, collection_name: Optional[str]
+) -> Optional[str]:
+    """
+    Name of the model of the collection, the parent one for inherited models.
+    The names depend on the databases of the connections, connect() and
+    disconnect() clear the cache.
+    """
+    if collection_name is None:
+        return None
+
+    pending = list(Document.__subclasses__())
+    while pending:
+        model = pending.pop(0)
+        pending.extend(model.__subclasses__())
+        if model._get_collection_name() != collection_name:
+            continue
+        if model._database_name() in (None, database_name):
+            return model.__name__
+
+    return None
+
+
+class QueryCounter:
+    """
+    Count the round trips to the server made in the block by the current
+    thread or task, by model and command. getMore and killCursors are counted,
+    a find that needs three batches is three round trips.
+
+    with odm_query_counter(max_queries=3) as counter:
+        course.load_related()
+
+    counter.total, counter.get_count("Course", "find")
+
+    max_queries: raise QueryBudgetExceeded at the end of the block when more
+        round trips were made. With raise_error=False a warning is logged instead.
+    """
+
+    def __init__(
+        self, max_queries: Optional[int] = None, raise_error: bool = True
+    ) -> None:
+        self.max_queries = max_queries
+        self.raise_error = raise_error
+        self._counts: dict[COUNT_KEY_TYPE, int] = {}
+        self._lock = threading.Lock()
+        self._token: Optional[Token[tuple[QueryCounter, ...]]] = None
+
+    @property
+    def total(self) -> int:
+        with self._lock:
+            return sum(self._counts.values())
+
+    @property
+    def is_over_budget(self) -> bool:
+        return self.max_queries is not None and self.total > self.max_queries
+
+    def add(
+        self, model_name: Optional[str], collection_name: Optional[str], command: str
+    ) -> None:
+        key = (model_name, collection_name, command)
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def get_counts(self) -> list[QueryCount]:
+        with self._lock:
+            items = list(self._counts.items())
+        return [
+            QueryCount(
+                model_name=model_name,
+                collection_name=collection_name,
+                command_name=command_name,
+                count=count,
+            )
+            for (model_name, collection_name, command_name), count in items
+        ]
+
+    def get_count(
+        self, model_name: Optional[str] = None, command_name: Optional[str] = None
+    ) -> int:
+        return sum(
+            obj.count
+            for obj in self.get_counts()
+            if (model_name is None or obj.model_name == model_name)
+            and (command_name is None or obj.command_name == command_name)
+        )
+
+    def __str__(self) -> str:
+        lines = [f"{self.total} queries"]
+        lines += [f"  {obj}" for obj in self.get_counts()]
+        return "\n".join(lines)
+
+    def start(self) -> None:
+        global _active_counters
+        if not _is_listener_registered():
+            raise InvalidAction(
+                "Count the queries after connect(..., query_counter=True)."
+            )
+        self._token = _counters.set((*_counters.get(), self))
+        with _active_counters_lock:
+            _active_counters += 1
+
+    def stop(self) -> None:
+        global _active_counters
+        if self._token is None:
+            return
+        with _active_counters_lock:
+            _active_counters -= 1
+        _counters.reset(self._token)
+        self._token = None
+
+    def _check_budget(self, exc_type: Optional[type[BaseException]]) -> None:
+        if not self.is_over_budget:
+            return
+
+        message = (
+            f"{self.total} queries were made, the budget is {self.max_queries}.\n{self}"
+        )
+        if self.raise_error and exc_type is None:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+    def __enter__(self) -> "QueryCounter":
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.stop()
+        self._check_budget(exc_type)
+
+    async def __aenter__(self) -> "QueryCounter":
+        return self.__enter__()
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.__exit__(exc_type, exc_value, traceback)
+
+
+def odm_query_counter(
+    max_queries: Optional[int] = None, raise_error: bool = True
+) -> QueryCounter:
+    """
+    Use it with `with` or `async with`.
+
+    async with odm_query_counter(max_queries=3) as counter:
+        await course.aload_related()
+    """
+    return QueryCounter(max_queries=max_queries, raise_error=raise_error)
+
+
+class QueryCounterListener(monitoring.CommandListener):
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if _active_counters == 0:
+            return
+        counters = _counters.get()
+        if not counters or event.command_name in IGNORED_COMMANDS:
+            return
+
+        collection_name = _get_collection_name(event.command_name, event.command)
+        model_name = _get_model_name(event.database_name, collection_name)
+        for counter in counters:
+            counter.add(model_name, collection_name, event.command_name)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        pass
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        pass
+
+
+_query_counter_listener = QueryCounterListener()
+
+
+def get_query_counter_listener() -> QueryCounterListener:
+    return _query_counter_listener
+
+
+def _is_listener_registered() -> bool:
+    for alias in get_connection_aliases():
+        connection_kwargs = _get_connection(alias).connection_kwargs or {}
+        if _query_counter_listener in connection_kwargs.get("event_listeners", []):
+            return True
+
+    return False
@@ -0,0 +1,197 @@
+import json
+import threading
+from collections.abc import Mapping
+from types import TracebackType
+from typing import Any, Optional
+
+from mongodb_odm.types import DICT_TYPE, SORT_TYPE
+from pydantic import BaseModel
+from pymongo import ASCENDING
+
+"""Replaces every value of a query shape"""
+VALUE_PLACEHOLDER = "?"
+
+LOGICAL_OPERATORS = {"$and", "$or", "$nor"}
+
+"""Operators whose value is a sub-query instead of a value"""
+NESTED_QUERY_OPERATORS = {"$elemMatch", "$not"}
+
+"""Active recorders. Empty unless recording was started explicitly."""
+_recorders: list["QueryShapeRecorder"] = []
+_recorders_lock = threading.Lock()
+
+
+def _get_value_shape(value: Any) -> Any:
+    if (
+        isinstance(value, Mapping)
+        and value
+        and all(str(key).startswith("$") for key in value)
+    ):
+        shape: DICT_TYPE = {}
+        for operator, operand in value.items():
+            if operator in NESTED_QUERY_OPERATORS and isinstance(operand, Mapping):
+                shape[operator] = (
+                    get_filter_shape(operand)
+                    if operator == "$elemMatch"
+                    else _get_value_shape(operand)
+                )
+            else:
+                shape[operator] = VALUE_PLACEHOLDER
+        return shape
+
+    return VALUE_PLACEHOLDER
+
+
+def get_filter_shape(filter: Optional[Mapping[str, Any]]) -> DICT_TYPE:
+    """
+    Field names and operators of a filter with the values stripped.
+
+    {"age": {"$gt": 18}, "name": "John"} -> {"age": {"$gt": "?"}, "name": "?"}
+    """
+    shape: DICT_TYPE = {}
+    for key, value in (filter or {}).items():
+        if key in LOGICAL_OPERATORS and isinstance(value, (list, tuple)):
+            shape[key] = [get_filter_shape(branch) for branch in value]
+        elif str(key).startswith("$"):
+            # $text, $expr, $where... can not be described by field names
+            shape[key] = VALUE_PLACEHOLDER
+        else:
+            shape[key] = _get_value_shape(value)
+
+    return shape
+
+
+def get_sort_shape(sort: Optional[SORT_TYPE]) -> list[tuple[str, Any]]:
+    if not sort:
+        return []
+    if isinstance(sort, str):
+        return [(sort, ASCENDING)]
+    if isinstance(sort, Mapping):
+        return list(sort.items())
+
+    return [(field, direction) for field, direction in sort]
+
+
+class QueryShape(BaseModel):
+    model_name: str
+    collection_name: str
+    database_name: Optional[str] = None
+    operation: str
+    filter: DICT_TYPE = {}
+    sort: list[tuple[str, Any]] = []
+    """Number of times the shape was recorded"""
+    count: int = 0
+
+    def get_key(self) -> str:
+        return json.dumps(
+            [
+                self.model_name,
+                self.collection_name,
+                self.database_name,
+                self.operation,
+                self.filter,
+                self.sort,
+            ],
+            sort_keys=True,
+            default=str,
+        )
+
+    def __str__(self) -> str:
+        text = f"{self.model_name}.{self.operation}({json.dumps(self.filter)}"
+        if self.sort:
+            text += f", sort={json.dumps(self.sort)}"
+        return f"{text}) x{self.count}"
+
+
+class QueryShapeRecorder:
+    """
+    Record the normalized shape of the queries made through the ODM.
+
+    with QueryShapeRecorder() as recorder:
+        run_the_application_or_the_tests()
+
+    report = advise_indexes(recorder)
+
+    Recording is process-wide while the recorder is active.
+    Only find, find_one, count_documents and update_many (and the async versions)
+    are recorded.
+    """
+
+    def __init__(self) -> None:
+        self._shapes: dict[str, QueryShape] = {}
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with _recorders_lock:
+            if self not in _recorders:
+                _recorders.append(self)
+
+    def stop(self) -> None:
+        with _recorders_lock:
+            if self in _recorders:
+                _recorders.remove(self)
+
+    def __enter__(self) -> "QueryShapeRecorder":
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.stop()
+
+    def add(self, shape: QueryShape) -> None:
+        key = shape.get_key()
+        with self._lock:
+            if key not in self._shapes:
+                self._shapes[key] = shape
+            self._shapes[key].count += 1
+
+    def get_shapes(self, model_name: Optional[str] = None) -> list[QueryShape]:
+        with self._lock:
+            shapes = list(self._shapes.values())
+        if model_name is not None:
+            shapes = [shape for shape in shapes if shape.model_name == model_name]
+        return shapes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._shapes.clear()
+
+
+def is_recording() -> bool:
+    return len(_recorders) > 0
+
+
+def record_query(
+    model: Any,
+    operation: str,
+    filter: Optional[Mapping[str, Any]],
+    sort: Optional[SORT_TYPE] = None,
+) -> None:
+    """
+    Add the query to every active recorder.
+    model: Document type, filter: the filter as passed to the model method
+    """
+    recorders = list(_recorders)
+    if not recorders:
+        return
+
+    filter = dict(filter or {})
+    if model._get_child() is not None:
+        filter = {**model.get_inheritance_key(), **filter}
+
+    for recorder in recorders:
+        recorder.add(
+            QueryShape(
+                model_name=model.__name__,
+                collection_name=model._get_collection_name(),
+                database_name=model._database_name(),
+                operation=operation,
+                filter=get_filter_shape(filter),
+                sort=get_sort_shape(sort),
+            )
+        )
@@ -0,0 +1,180 @@
+import asyncio
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any, Optional, cast
+
+from mongodb_odm.connection import db
+from pymongo import ReturnDocument
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.collection import Collection
+
+if TYPE_CHECKING:
+    from mongodb_odm.models import Document
+
+COUNTERS_COLLECTION_NAME = "odm_counters"
+
+_sequences: "weakref.WeakSet[FieldSequence]" = weakref.WeakSet()
+
+
+class FieldSequence:
+    """
+    Monotonically increasing integer values for a model field (hi-lo allocation).
+
+    A block of `block_size` values is reserved from the counters collection
+    with a single round trip, then the values are handed out locally.
+    Values are unique across processes but may have gaps,
+    since the unused values of a block are lost when the process stops.
+
+    class Invoice(Document):
+        number: Optional[int] = None
+
+        class ODMConfig(Document.ODMConfig):
+            sequences = [FieldSequence("number", block_size=50)]
+
+    The field is assigned on create() if its value is None.
+    """
+
+    def __init__(
+        self, field: str, block_size: int = 100, name: Optional[str] = None
+    ) -> None:
+        """
+        field: Model field that receives the value.
+
+        block_size: Number of values reserved per round trip.
+
+        name: Counter document key. Default is "<collection_name>.<field>".
+        """
+        if block_size < 1:
+            raise ValueError("block_size should be greater than zero")
+
+        self.field = field
+        self.block_size = block_size
+        self.name = name
+
+        """Store [next_value, last_value] of the reserved block for each counter"""
+        self._ranges: dict[str, list[int]] = {}
+        self._lock = threading.Lock()
+        self._async_locks: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Lock
+        ] = weakref.WeakKeyDictionary()
+
+        _sequences.add(self)
+
+    def get_name(self, model: type["Document"]) -> str:
+        if self.name:
+            return self.name
+        return f"{model._get_collection_name()}.{self.field}"
+
+    def reset(self) -> None:
+        """Forget the reserved blocks. The next value will reserve a new block."""
+        with self._lock:
+            self._ranges.clear()
+
+    def _after_fork(self) -> None:
+        """
+        The reserved blocks belong to the parent process and its lock may have
+        been held by another thread of the parent when it forked.
+        """
+        self._ranges = {}
+        self._lock = threading.Lock()
+        self._async_locks = weakref.WeakKeyDictionary()
+
+    def _take(self, name: str) -> Optional[int]:
+        """Must be called with the lock acquired"""
+        value_range = self._ranges.get(name)
+        if value_range is None or value_range[0] > value_range[1]:
+            return None
+
+        value = value_range[0]
+        value_range[0] += 1
+        return value
+
+    def _set_range(self, name: str, last_value: int) -> None:
+        self._ranges[name] = [last_value - self.block_size + 1, last_value]
+
+    def _get_update(self) -> dict[str, Any]:
+        return {"$inc": {"value": self.block_size}}
+
+    def next_value(self, model: type["Document"]) -> int:
+        name = self.get_name(model)
+
+        with self._lock:
+            value = self._take(name)
+            if value is not None:
+                return value
+
+            collection = cast(
+                Collection[Any],
+                db(
+                    model._database_name(),
+                    is_async_action=False,
+                    alias=model._connection_alias(),
+                )[COUNTERS_COLLECTION_NAME],
+            )
+            counter = collection.find_one_and_update(
+                {"_id": name},
+                self._get_update(),
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+            self._set_range(name, cast(dict[str, Any], counter)["value"])
+
+            return cast(int, self._take(name))
+
+    def _get_async_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if loop not in self._async_locks:
+                self._async_locks[loop] = asyncio.Lock()
+            return self._async_locks[loop]
+
+    async def anext_value(self, model: type["Document"]) -> int:
+        name = self.get_name(model)
+
+        with self._lock:
+            value = self._take(name)
+        if value is not None:
+            return value
+
+        async with self._get_async_lock():
+            """Another task may have reserved a new block while waiting for the lock."""
+            with self._lock:
+                value = self._take(name)
+            if value is not None:
+                return value
+
+            collection = cast(
+                AsyncCollection[Any],
+                db(
+                    model._database_name(),
+                    is_async_action=True,
+                    alias=model._connection_alias(),
+                )[COUNTERS_COLLECTION_NAME],
+            )
+            counter = await collection.find_one_and_update(
+                {"_id": name},
+                self._get_update(),
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+
+            with self._lock:
+                self._set_range(name, cast(dict[str, Any], counter)["value"])
+                return cast(int, self._take(name))
+
+
+def get_model_sequences(model: Any) -> list[FieldSequence]:
+    if hasattr(model.ODMConfig, "sequences"):
+        return list(model.ODMConfig.sequences)
+    return []
+
+
+def reset_sequences() -> None:
+    """Forget the reserved blocks of every sequence, see FieldSequence.reset()"""
+    for sequence in list(_sequences):
+        sequence.reset()
+
+
+def reset_sequences_after_fork() -> None:
+    for sequence in list(_sequences):
+        sequence._after_fork()
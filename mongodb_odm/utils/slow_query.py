@@ -0,0 +1,301 @@
+import contextlib
+import json
+import logging
+import os
+import random
+import sys
+import time
+from collections.abc import AsyncIterator, Iterator, Mapping
+from typing import Any, Optional, TypeVar, Union
+
+from mongodb_odm.exceptions import InvalidConfiguration
+from mongodb_odm.types import DICT_TYPE, SORT_TYPE
+from mongodb_odm.utils.query_shape import get_filter_shape, get_sort_shape
+from pydantic import BaseModel
+from pymongo.results import BulkWriteResult, UpdateResult
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+"""Frames of the package are skipped when looking for the call site"""
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+"""log_slow_query() runs its exit code from the frames of contextlib"""
+SKIPPED_FILES = {contextlib.__file__}
+
+
+class SlowQueryLogConfig(BaseModel):
+    threshold_ms: float
+    """Fraction of the operations that are timed"""
+    sample_rate: float = 1.0
+    level: int = logging.WARNING
+
+
+"""None while the slow query log is disabled"""
+_config: Optional[SlowQueryLogConfig] = None
+
+
+class SlowQuery(BaseModel):
+    model_name: str
+    collection_name: str
+    operation: str
+    filter: DICT_TYPE = {}
+    sort: list[tuple[str, Any]] = []
+    projection: Optional[DICT_TYPE] = None
+    duration_ms: float
+    """Documents returned by reads, affected by writes"""
+    documents: int = 0
+    """file:line of the application code that made the call"""
+    call_site: Optional[str] = None
+    """Class name of the exception raised by the operation, e.g. ExecutionTimeout"""
+    error: Optional[str] = None
+
+    def __str__(self) -> str:
+        text = (
+            f"Slow query {self.model_name}.{self.operation} "
+            f"{self.duration_ms:.1f}ms: filter={json.dumps(self.filter)}"
+        )
+        if self.sort:
+            text += f", sort={json.dumps(self.sort)}"
+        if self.projection:
+            text += f", projection={json.dumps(self.projection, default=str)}"
+        text += f", documents={self.documents}"
+        if self.error:
+            text += f", error={self.error}"
+        if self.call_site:
+            text += f" at {self.call_site}"
+        return text
+
+
+def get_pipeline_filter(pipeline: list[Any]) -> Optional[DICT_TYPE]:
+    """The filter of the leading $match stage of an aggregation pipeline"""
+    if pipeline and isinstance(pipeline[0], Mapping) and "$match" in pipeline[0]:
+        return dict(pipeline[0]["$match"])
+    return None
+
+
+def get_write_count(result: Union[UpdateResult, BulkWriteResult]) -> int:
+    """Documents affected by a write, 0 for unacknowledged writes"""
+    if not result.acknowledged:
+        return 0
+    if isinstance(result, UpdateResult):
+        return result.modified_count
+    return (
+        result.inserted_count
+        + result.upserted_count
+        + result.modified_count
+        + result.deleted_count
+    )
+
+
+def enable_slow_query_log(
+    threshold_ms: float = 100,
+    sample_rate: float = 1.0,
+    level: int = logging.WARNING,
+) -> None:
+    """
+    Log find (consumed to exhaustion), aggregate, update_many and bulk_write
+    calls (and the async versions) that take longer than `threshold_ms`,
+    including the ones that raise, e.g. with ExecutionTimeout.
+
+    Only a `sample_rate` fraction of the calls are timed.
+    """
+    global _config
+    if threshold_ms < 0:
+        raise InvalidConfiguration("threshold_ms can not be negative.")
+    if not 0 < sample_rate <= 1:
+        raise InvalidConfiguration("sample_rate must be in (0, 1].")
+
+    _config = SlowQueryLogConfig(
+        threshold_ms=threshold_ms, sample_rate=sample_rate, level=level
+    )
+
+
+def disable_slow_query_log() -> None:
+    global _config
+    _config = None
+
+
+def _get_call_site() -> Optional[str]:
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if not filename.startswith(PACKAGE_DIR) and filename not in SKIPPED_FILES:
+            return f"{filename}:{frame.f_lineno}"
+        frame = frame.f_back  # type: ignore[assignment]
+
+    return None
+
+
+class SlowQueryTimer:
+    """Add up the time spent in an operation and log it when it is slow"""
+
+    __slots__ = (
+        "config",
+        "model",
+        "operation",
+        "filter",
+        "sort",
+        "projection",
+        "duration_ns",
+        "started_at",
+        "documents",
+    )
+
+    def __init__(
+        self,
+        config: SlowQueryLogConfig,
+        model: Any,
+        operation: str,
+        filter: Optional[Mapping[str, Any]],
+        sort: Optional[SORT_TYPE],
+        projection: Optional[DICT_TYPE],
+    ) -> None:
+        self.config = config
+        self.model = model
+        self.operation = operation
+        self.filter = filter
+        self.sort = sort
+        self.projection = projection
+        self.duration_ns = 0
+        self.started_at = time.perf_counter_ns()
+        """Documents returned by reads, affected by writes"""
+        self.documents = 0
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter_ns()
+
+    def stop(self) -> None:
+        self.duration_ns += time.perf_counter_ns() - self.started_at
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """Log the operation if it was slow, whether it succeeded or raised"""
+        duration_ms = self.duration_ns / 1_000_000
+        if duration_ms < self.config.threshold_ms:
+            return
+
+        slow_query = SlowQuery(
+            model_name=self.model.__name__,
+            collection_name=self.model._get_collection_name(),
+            operation=self.operation,
+            filter=get_filter_shape(self.filter),
+            sort=get_sort_shape(self.sort),
+            projection=self.projection or None,
+            duration_ms=duration_ms,
+            documents=self.documents,
+            call_site=_get_call_site(),
+            error=type(error).__name__ if error is not None else None,
+        )
+        logger.log(self.config.level, str(slow_query), extra={"slow_query": slow_query})
+
+
+def get_slow_query_timer(
+    model: Any,
+    operation: str,
+    filter: Optional[Mapping[str, Any]] = None,
+    sort: Optional[SORT_TYPE] = None,
+    projection: Optional[DICT_TYPE] = None,
+) -> Optional[SlowQueryTimer]:
+    """A started timer, None when the log is disabled or the call is not sampled"""
+    config = _config
+    if config is None:
+        return None
+    if config.sample_rate < 1 and random.random() >= config.sample_rate:
+        return None
+
+    return SlowQueryTimer(config, model, operation, filter, sort, projection)
+
+
+@contextlib.contextmanager
+def log_slow_query(
+    model: Any, operation: str, filter: Optional[Mapping[str, Any]] = None
+) -> Iterator[Optional[SlowQueryTimer]]:
+    """
+    Time the block, including the operations that raise. Set the documents
+    of the timer in the block, the timer is None when the call isn't timed.
+    """
+    timer = get_slow_query_timer(model, operation, filter)
+    if timer is None:
+        yield None
+        return
+
+    error: Optional[BaseException] = None
+    try:
+        yield timer
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        timer.stop()
+        timer.finish(error)
+
+
+def log_slow_iteration(
+    model: Any,
+    operation: str,
+    iterator: Iterator[T],
+    filter: Optional[Mapping[str, Any]] = None,
+    sort: Optional[SORT_TYPE] = None,
+    projection: Optional[DICT_TYPE] = None,
+) -> Iterator[T]:
+    """
+    Time the steps of the iterator, the time spent by the caller between the
+    steps is excluded. Iterators that are not consumed to the end are not logged,
+    the ones that raise are logged with the error.
+    """
+    timer = get_slow_query_timer(model, operation, filter, sort, projection)
+    if timer is None:
+        return iterator
+    return _log_slow_iteration(timer, iterator)
+
+
+def _log_slow_iteration(timer: SlowQueryTimer, iterator: Iterator[T]) -> Iterator[T]:
+    while True:
+        timer.start()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            timer.stop()
+            timer.finish()
+            return
+        except Exception as e:
+            timer.stop()
+            timer.finish(e)
+            raise
+        timer.stop()
+        timer.documents += 1
+        yield item
+
+
+def alog_slow_iteration(
+    model: Any,
+    operation: str,
+    iterator: AsyncIterator[T],
+    filter: Optional[Mapping[str, Any]] = None,
+    sort: Optional[SORT_TYPE] = None,
+    projection: Optional[DICT_TYPE] = None,
+) -> AsyncIterator[T]:
+    timer = get_slow_query_timer(model, operation, filter, sort, projection)
+    if timer is None:
+        return iterator
+    return _alog_slow_iteration(timer, iterator)
+
+
+async def _alog_slow_iteration(
+    timer: SlowQueryTimer, iterator: AsyncIterator[T]
+) -> AsyncIterator[T]:
+    while True:
+        timer.start()
+        try:
+            item = await iterator.__anext__()
+        except StopAsyncIteration:
+            timer.stop()
+            timer.finish()
+            return
+        except Exception as e:
+            timer.stop()
+            timer.finish(e)
+            raise
+        timer.stop()
+        timer.documents += 1
+        yield item
@@ -0,0 +1,323 @@
+import asyncio
+import functools
+import inspect
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from types import TracebackType
+from typing import Any, Callable, Optional, TypeVar, Union, cast
+
+from mongodb_odm.connection import DEFAULT_CONNECTION_ALIAS, get_client
+from mongodb_odm.exceptions import InvalidConfiguration
+from mongodb_odm.utils.utils import get_backoff_delay
+from pymongo import AsyncMongoClient, MongoClient
+from pymongo.asynchronous.client_session import AsyncClientSession
+from pymongo.client_session import ClientSession
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+TRANSIENT_TRANSACTION_ERROR = "TransientTransactionError"
+UNKNOWN_COMMIT_RESULT = "UnknownTransactionCommitResult"
+
+"""Session of the transaction that is running in the current context"""
+_current_session: ContextVar[Optional[Union[ClientSession, AsyncClientSession]]] = (
+    ContextVar("mongodb_odm_current_session", default=None)
+)
+
+
+def get_current_session() -> Optional[Union[ClientSession, AsyncClientSession]]:
+    return _current_session.get()
+
+
+@contextmanager
+def outside_transaction() -> Iterator[None]:
+    """The ODM operations started in the block don't join the current transaction"""
+    token = _current_session.set(None)
+    try:
+        yield
+    finally:
+        _current_session.reset(token)
+
+
+def _is_error_with_label(error: BaseException, label: str) -> bool:
+    return isinstance(error, PyMongoError) and error.has_error_label(label)
+
+
+class _BaseTransaction:
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff: float = 0.05,
+        max_backoff: float = 1.0,
+        session_kwargs: Optional[dict[str, Any]] = None,
+        alias: str = DEFAULT_CONNECTION_ALIAS,
+        **transaction_kwargs: Any,
+    ) -> None:
+        self.alias = alias
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.session_kwargs = session_kwargs or {}
+        self.transaction_kwargs = transaction_kwargs
+
+        self._token: Optional[Token[Any]] = None
+        self._is_nested = False
+
+    def _copy(self) -> Any:
+        """Each run needs its own state to allow concurrent and recursive calls"""
+        return type(self)(
+            max_retries=self.max_retries,
+            backoff=self.backoff,
+            max_backoff=self.max_backoff,
+            session_kwargs=self.session_kwargs,
+            alias=self.alias,
+            **self.transaction_kwargs,
+        )
+
+    def _get_delay(self, attempt: int) -> float:
+        return get_backoff_delay(attempt, self.backoff, self.max_backoff)
+
+    def _should_retry(self, error: BaseException, attempt: int) -> bool:
+        return (
+            not self._is_nested
+            and attempt < self.max_retries
+            and _is_error_with_label(error, TRANSIENT_TRANSACTION_ERROR)
+        )
+
+
+class _Transaction(_BaseTransaction):
+    _session: Optional[ClientSession] = None
+
+    def __enter__(self) -> ClientSession:
+        current_session = get_current_session()
+        if isinstance(current_session, ClientSession):
+            """Join the outer transaction instead of starting a new one."""
+            self._is_nested = True
+            return current_session
+
+        client = get_client(self.alias, is_async_action=False)
+        if not isinstance(client, MongoClient):
+            raise InvalidConfiguration(
+                "Client is not configured for sync operations use 'atransaction' instead."
+            )
+
+        self._session = client.start_session(**self.session_kwargs)
+        self._session.start_transaction(**self.transaction_kwargs)
+        self._token = _current_session.set(self._session)
+
+        return self._session
+
+    def _commit(self, session: ClientSession) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                session.commit_transaction()
+                return
+            except PyMongoError as e:
+                if attempt >= self.max_retries or not _is_error_with_label(
+                    e, UNKNOWN_COMMIT_RESULT
+                ):
+                    raise
+                logger.debug("Unknown transaction commit result, retrying commit.")
+                time.sleep(self._get_delay(attempt))
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        if self._is_nested or self._session is None:
+            return
+
+        session = self._session
+        try:
+            if not session.in_transaction:
+                """The transaction was committed or aborted manually."""
+                return
+            if exc_type is not None:
+                session.abort_transaction()
+            else:
+                self._commit(session)
+        finally:
+            if self._token is not None:
+                _current_session.reset(self._token)
+            session.end_session()
+
+    def __call__(self, func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            attempt = 0
+            while True:
+                run = self._copy()
+                try:
+                    with run:
+                        return func(*args, **kwargs)
+                except Exception as e:
+                    if not run._should_retry(e, attempt):
+                        raise
+                    logger.debug(f"Transient transaction error in {func.__name__}.")
+                    time.sleep(self._get_delay(attempt))
+                    attempt += 1
+
+        return cast(F, wrapper)
+
+
+class _AsyncTransaction(_BaseTransaction):
+    _session: Optional[AsyncClientSession] = None
+
+    async def __aenter__(self) -> AsyncClientSession:
+        current_session = get_current_session()
+        if isinstance(current_session, AsyncClientSession):
+            """Join the outer transaction instead of starting a new one."""
+            self._is_nested = True
+            return current_session
+
+        client = get_client(self.alias, is_async_action=True)
+        if not isinstance(client, AsyncMongoClient):
+            raise InvalidConfiguration(
+                "Client is not configured for async operations use 'transaction' instead."
+            )
+
+        self._session = client.start_session(**self.session_kwargs)
+        await self._session.start_transaction(**self.transaction_kwargs)
+        self._token = _current_session.set(self._session)
+
+        return self._session
+
+    async def _commit(self, session: AsyncClientSession) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                await session.commit_transaction()
+                return
+            except PyMongoError as e:
+                if attempt >= self.max_retries or not _is_error_with_label(
+                    e, UNKNOWN_COMMIT_RESULT
+                ):
+                    raise
+                logger.debug("Unknown transaction commit result, retrying commit.")
+                await asyncio.sleep(self._get_delay(attempt))
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        if self._is_nested or self._session is None:
+            return
+
+        session = self._session
+        try:
+            if not session.in_transaction:
+                """The transaction was committed or aborted manually."""
+                return
+            if exc_type is not None:
+                await session.abort_transaction()
+            else:
+                await self._commit(session)
+        finally:
+            if self._token is not None:
+                _current_session.reset(self._token)
+            await session.end_session()
+
+    def __call__(self, func: F) -> F:
+        if not inspect.iscoroutinefunction(func):
+            raise InvalidConfiguration("atransaction can only decorate async functions")
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            attempt = 0
+            while True:
+                run = self._copy()
+                try:
+                    async with run:
+                        return await func(*args, **kwargs)
+                except Exception as e:
+                    if not run._should_retry(e, attempt):
+                        raise
+                    logger.debug(f"Transient transaction error in {func.__name__}.")
+                    await asyncio.sleep(self._get_delay(attempt))
+                    attempt += 1
+
+        return cast(F, wrapper)
+
+
+def transaction(
+    func: Optional[F] = None,
+    *,
+    max_retries: int = 3,
+    backoff: float = 0.05,
+    max_backoff: float = 1.0,
+    session_kwargs: Optional[dict[str, Any]] = None,
+    alias: str = DEFAULT_CONNECTION_ALIAS,
+    **transaction_kwargs: Any,
+) -> Any:
+    """
+    Run ODM operations in a transaction without passing `session` by hand.
+
+    The session is bound to the current context, so every ODM call inside the
+    block uses it automatically. The transaction is committed on success and
+    aborted on error. A commit with an unknown result is retried.
+
+    Used as a decorator, the whole function is re-run when the transaction
+    fails with a TransientTransactionError, up to `max_retries` times.
+    Nested transactions join the outer transaction.
+
+    with transaction() as session:
+        Course(...).create()
+
+    @transaction(max_retries=5)
+    def transfer(...):
+        ...
+
+    alias: Connection of the transaction. Only the models that use this
+    connection run in the transaction.
+
+    transaction_kwargs: Passed to ClientSession.start_transaction
+    (read_concern, write_concern, read_preference, max_commit_time_ms).
+    """
+    obj = _Transaction(
+        max_retries=max_retries,
+        backoff=backoff,
+        max_backoff=max_backoff,
+        session_kwargs=session_kwargs,
+        alias=alias,
+        **transaction_kwargs,
+    )
+    if func is not None:
+        return obj(func)
+
+    return obj
+
+
+def atransaction(
+    func: Optional[F] = None,
+    *,
+    max_retries: int = 3,
+    backoff: float = 0.05,
+    max_backoff: float = 1.0,
+    session_kwargs: Optional[dict[str, Any]] = None,
+    alias: str = DEFAULT_CONNECTION_ALIAS,
+    **transaction_kwargs: Any,
+) -> Any:
+    """
+    Async version of transaction(). Use it with `async with` or to decorate
+    an async function.
+    """
+    obj = _AsyncTransaction(
+        max_retries=max_retries,
+        backoff=backoff,
+        max_backoff=max_backoff,
+        session_kwargs=session_kwargs,
+        alias=alias,
+        **transaction_kwargs,
+    )
+    if func is not None:
+        return obj(func)
+
+    return obj
@@ -1,7 +1,9 @@
+import random
 import re
 import types
 from typing import Any, Optional, Union
 
+from mongodb_odm.connection import DEFAULT_CONNECTION_ALIAS
 from mongodb_odm.fields import RelationshipInfo
 from mongodb_odm.utils._internal_models import RelationalFieldInfo
 from pydantic import BaseModel
@@ -16,6 +18,17 @@ def camel_to_snake(string: str) -> str:
     return pattern.sub("_", string).lower()
 
 
+def get_backoff_delay(attempt: int, backoff: float, max_backoff: float) -> float:
+    """
+    Exponential backoff with jitter to avoid retrying conflicting operations
+    at the same moment.
+
+    attempt: zero-based retry count
+    """
+    delay = min(max_backoff, backoff * (2**attempt))
+    return float(delay * random.uniform(0.5, 1))
+
+
 def get_database_name(model: Any) -> Optional[Any]:
     """
     Get the database name if the model ODMConfig has a user-defined database name.
@@ -28,6 +41,47 @@ def get_database_name(model: Any) -> Optional[Any]:
     return None
 
 
+def get_connection_alias(model: Any) -> str:
+    """
+    Get the connection alias if the model uses a named connection.
+
+    model: Document type
+    """
+    alias = getattr(model.ODMConfig, "connection", None)
+    if alias is not None:
+        return str(alias)
+
+    return DEFAULT_CONNECTION_ALIAS
+
+
+def get_version_field(model: Any) -> Optional[str]:
+    """
+    Get the version field name if the model enables optimistic concurrency control.
+
+    model: Document type
+    """
+    if hasattr(model.ODMConfig, "version_field"):
+        version_field: Optional[str] = model.ODMConfig.version_field
+        return version_field
+
+    return None
+
+
+def get_max_time_ms_options(model: Any) -> dict[str, int]:
+    """
+    Get the default time limit of each operation type defined in ODMConfig.
+
+    model: Document type
+    """
+    options: dict[str, int] = {}
+    for operation_type in ("read", "write", "aggregate"):
+        value = getattr(model.ODMConfig, f"{operation_type}_max_time_ms", None)
+        if value is not None:
+            options[operation_type] = value
+
+    return options
+
+
 def convert_model_to_collection(model: Any) -> str:
     """
     Get the collection name from the model.
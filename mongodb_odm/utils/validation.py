@@ -17,7 +17,7 @@ def validate_filter_dict(model: Any, filter: DICT_TYPE) -> bool:
         if key[0] == "$":
             # this is should be mongodb reserved keys like $or, $and, $text etc
             continue
-        if key in fields or key == "_id":
+        if key in fields or key == "_id" or key == model._get_version_field():
             # Valid single field
             continue
         if "." in key:
@@ -0,0 +1,195 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Any
+
+from mongodb_odm.connection import (
+    DEFAULT_CONNECTION_ALIAS,
+    _get_connection,
+    get_client,
+)
+from mongodb_odm.exceptions import InvalidAction, InvalidConnection
+from mongodb_odm.models import _get_connection_models
+from pydantic import BaseModel
+from pymongo import AsyncMongoClient, MongoClient, monitoring
+
+logger = logging.getLogger(__name__)
+
+
+"""Seconds to wait for the pool to reach minPoolSize"""
+WARMUP_TIMEOUT = 10.0
+POLL_INTERVAL = 0.05
+
+
+class PoolConnectionListener(monitoring.ConnectionPoolListener):
+    """
+    Count the open connections of the pools of a client, registered by
+    connect(..., warmup=True). A connection is open once it is ready to be
+    used, after the handshakes.
+    """
+
+    def __init__(self) -> None:
+        self._connections: set[tuple[Any, int]] = set()
+        self._condition = threading.Condition()
+
+    @property
+    def connections(self) -> int:
+        return len(self._connections)
+
+    def wait_for(self, connections: int, timeout: float) -> bool:
+        """Block until `connections` are open, False on timeout"""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: len(self._connections) >= connections, timeout
+            )
+
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None:
+        pass
+
+    def pool_ready(self, event: monitoring.PoolReadyEvent) -> None:
+        pass
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None:
+        pass
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent) -> None:
+        pass
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None:
+        pass
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent) -> None:
+        with self._condition:
+            self._connections.add((event.address, event.connection_id))
+            self._condition.notify_all()
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None:
+        with self._condition:
+            self._connections.discard((event.address, event.connection_id))
+
+    def connection_check_out_started(
+        self, event: monitoring.ConnectionCheckOutStartedEvent
+    ) -> None:
+        pass
+
+    def connection_check_out_failed(
+        self, event: monitoring.ConnectionCheckOutFailedEvent
+    ) -> None:
+        pass
+
+    def connection_checked_out(
+        self, event: monitoring.ConnectionCheckedOutEvent
+    ) -> None:
+        pass
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        pass
+
+
+class WarmupResult(BaseModel):
+    alias: str
+    """Open connections of the pool after the warm up"""
+    connections: int = 0
+    """Models whose collection handles were resolved and cached"""
+    models: list[str] = []
+    duration: float = 0
+
+    def __str__(self) -> str:
+        return (
+            f'Warmed up "{self.alias}": {self.connections} connections and '
+            f"{len(self.models)} collections in {self.duration:.3f}s"
+        )
+
+
+def _cache_collections(alias: str, is_async_action: bool) -> list[str]:
+    """Resolve and cache the collection handles, return the model names"""
+    names: list[str] = []
+    for model in _get_connection_models(alias):
+        try:
+            if is_async_action:
+                model._async_get_collection()
+            else:
+                model._get_collection()
+        except InvalidConnection as e:
+            logger.warning(f"Skip the collection of {model.__name__}: {e}")
+            continue
+        names.append(model.__name__)
+
+    return names
+
+
+def _get_pool_listener(alias: str) -> PoolConnectionListener:
+    connection_kwargs = _get_connection(alias).connection_kwargs or {}
+    for listener in connection_kwargs.get("event_listeners", []):
+        if isinstance(listener, PoolConnectionListener):
+            return listener
+
+    raise InvalidAction("Warm up the pool after connect(..., warmup=True).")
+
+
+def _log_unfilled_pool(alias: str, connections: int, min_pool_size: int) -> None:
+    logger.warning(
+        f'The pool of "{alias}" has {connections} of {min_pool_size} '
+        "(minPoolSize) connections after the warm up."
+    )
+
+
+def warmup_pool(
+    alias: str = DEFAULT_CONNECTION_ALIAS, timeout: float = WARMUP_TIMEOUT
+) -> WarmupResult:
+    """
+    Select a server and ping it, then wait up to `timeout` seconds until the
+    pool has minPoolSize connections, so that the first requests don't pay the
+    TCP, TLS and auth handshakes. The driver opens the connections of
+    minPoolSize in the background, at most maxConnecting at a time. The
+    collections of the models of the connection are resolved and cached as well.
+    """
+    started_at = time.perf_counter()
+    client = get_client(alias, is_async_action=False)
+    if not isinstance(client, MongoClient):
+        raise InvalidAction("The client is configured as async. Use awarmup_pool().")
+
+    listener = _get_pool_listener(alias)
+    # The ping selects the server and authenticates the first connection
+    client.admin.command("ping")
+    min_pool_size = client.options.pool_options.min_pool_size
+    if not listener.wait_for(min_pool_size, timeout):
+        _log_unfilled_pool(alias, listener.connections, min_pool_size)
+
+    result = WarmupResult(
+        alias=alias,
+        connections=listener.connections,
+        models=_cache_collections(alias, is_async_action=False),
+        duration=time.perf_counter() - started_at,
+    )
+    logger.info(str(result))
+    return result
+
+
+async def awarmup_pool(
+    alias: str = DEFAULT_CONNECTION_ALIAS, timeout: float = WARMUP_TIMEOUT
+) -> WarmupResult:
+    started_at = time.perf_counter()
+    client = get_client(alias, is_async_action=True)
+    if not isinstance(client, AsyncMongoClient):
+        raise InvalidAction("The client is configured as sync. Use warmup_pool().")
+
+    listener = _get_pool_listener(alias)
+    await client.admin.command("ping")
+    min_pool_size = client.options.pool_options.min_pool_size
+    # The pool events are published by the tasks of this loop, don't block it
+    deadline = time.monotonic() + timeout
+    while listener.connections < min_pool_size and time.monotonic() < deadline:
+        await asyncio.sleep(POLL_INTERVAL)
+    if listener.connections < min_pool_size:
+        _log_unfilled_pool(alias, listener.connections, min_pool_size)
+
+    result = WarmupResult(
+        alias=alias,
+        connections=listener.connections,
+        models=_cache_collections(alias, is_async_action=True),
+        duration=time.perf_counter() - started_at,
+    )
+    logger.info(str(result))
+    return result
@@ -0,0 +1,417 @@
+import asyncio
+import logging
+import queue
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any, Callable, Optional, cast
+
+from mongodb_odm.exceptions import InvalidAction, WriteBufferFull
+from mongodb_odm.types import DICT_TYPE
+from pymongo.errors import BulkWriteError
+
+if TYPE_CHECKING:
+    from mongodb_odm.models import Document
+
+logger = logging.getLogger(__name__)
+
+ERROR_CALLBACK_TYPE = Callable[[Exception, list["Document"]], None]
+
+"""Keep track of every live buffer so that disconnect can flush them"""
+_sync_buffers: "weakref.WeakSet[WriteBuffer]" = weakref.WeakSet()
+_async_buffers: "weakref.WeakSet[AsyncWriteBuffer]" = weakref.WeakSet()
+
+
+def _log_write_error(error: Exception, objects: list["Document"]) -> None:
+    logger.error(f"Failed to write {len(objects)} buffered documents: {error}")
+
+
+class _BaseWriteBuffer:
+    def __init__(
+        self,
+        model: type["Document"],
+        max_batch_size: int = 1000,
+        flush_interval: float = 1.0,
+        max_queue_size: int = 10000,
+        block: bool = True,
+        put_timeout: Optional[float] = None,
+        ordered: bool = False,
+        on_error: Optional[ERROR_CALLBACK_TYPE] = None,
+    ) -> None:
+        """
+        model: Document type, required
+            All queued objects should be an instance of this model.
+
+        max_batch_size: Flush once this many objects are waiting in the queue.
+
+        flush_interval: Flush whatever is queued at least every n seconds.
+
+        max_queue_size: Backpressure limit. Producers block (or fail if `block`
+        is False) once this many objects are waiting to be written.
+
+        put_timeout: Maximum seconds to wait for free space while blocking.
+
+        ordered: Passed to insert_many. Unordered inserts continue after a failure.
+
+        on_error: Called with the exception and the objects of the failed batch.
+        By default, the error is only logged.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size should be greater than zero")
+        if max_queue_size < max_batch_size:
+            raise ValueError("max_queue_size should not be less than max_batch_size")
+
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self.block = block
+        self.put_timeout = put_timeout
+        self.ordered = ordered
+        self.on_error = on_error or _log_write_error
+
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def _validate_object(self, obj: "Document") -> None:
+        if self._closed:
+            raise InvalidAction("Write buffer is already closed.")
+        if not isinstance(obj, self.model):
+            raise ValueError(f"Expected an instance of {self.model.__name__}")
+
+    def _handle_error(self, error: Exception, objects: list["Document"]) -> None:
+        try:
+            self.on_error(error, objects)
+        except Exception as e:
+            # A broken callback should never kill the writer.
+            logger.error(f"Write buffer error callback failed: {e}")
+
+    def _handle_insert_error(
+        self, error: Exception, batch: list["Document"], data: list[DICT_TYPE]
+    ) -> None:
+        """
+        A BulkWriteError reports the failed documents by index, the others were
+        inserted. Ordered inserts stop at the first error, unordered inserts
+        try every document. Only the failed objects are passed to on_error,
+        the inserted ones get their ids.
+        """
+        if not isinstance(error, BulkWriteError):
+            self._handle_error(error, batch)
+            return
+
+        failed = sorted(
+            {write_error["index"] for write_error in error.details["writeErrors"]}
+        )
+        if self.ordered and failed:
+            failed = list(range(failed[0], len(batch)))
+
+        for idx, (obj, document) in enumerate(zip(batch, data)):
+            if idx not in failed and "_id" in document:
+                obj._update_new_id(document["_id"])
+
+        if failed:
+            self._handle_error(error, [batch[idx] for idx in failed])
+        else:
+            # Only the write concern failed, the documents are inserted
+            _log_write_error(error, [])
+
+
+class WriteBuffer(_BaseWriteBuffer):
+    """
+    Queue model instances and insert them in batches from a background thread.
+
+    The caller only pays the cost of a queue append. Queued objects are written
+    with insert_many when `max_batch_size` objects are waiting
+    or `flush_interval` seconds have passed, whichever comes first.
+    """
+
+    def __init__(self, model: type["Document"], **kwargs: Any) -> None:
+        super().__init__(model, **kwargs)
+
+        self._queue: queue.Queue[Document] = queue.Queue(maxsize=self.max_queue_size)
+        self._wakeup = threading.Event()
+        self._start_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+        _sync_buffers.add(self)
+
+    def _after_fork(self) -> None:
+        """
+        The writer thread does not exist in the child process. The objects queued
+        before the fork are written by the parent.
+        """
+        self._queue = queue.Queue(maxsize=self.max_queue_size)
+        self._wakeup = threading.Event()
+        self._start_lock = threading.Lock()
+        self._thread = None
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run,
+                name=f"mongodb-odm-write-buffer-{self.model.__name__}",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def put(self, obj: "Document") -> None:
+        self._validate_object(obj)
+
+        if self._thread is None or not self._thread.is_alive():
+            self._start()
+
+        try:
+            self._queue.put(obj, block=self.block, timeout=self.put_timeout)
+        except queue.Full as e:
+            raise WriteBufferFull(
+                f"Write buffer for {self.model.__name__} is full."
+            ) from e
+
+        if self._queue.qsize() >= self.max_batch_size:
+            self._wakeup.set()
+
+    def _get_batch(self) -> list["Document"]:
+        batch: list[Document] = []
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: list["Document"]) -> None:
+        try:
+            for obj in batch:
+                obj._assign_sequence_values()
+            data = [obj._prepare_crate_data() for obj in batch]
+        except Exception as e:
+            self._handle_error(e, batch)
+            return
+
+        try:
+            # insert_many sets the _id of the documents in place
+            result = self.model._get_collection().insert_many(
+                data, ordered=self.ordered
+            )
+        except Exception as e:
+            self._handle_insert_error(e, batch, data)
+            return
+
+        for obj, inserted_id in zip(batch, result.inserted_ids):
+            obj._update_new_id(inserted_id)
+
+    def _drain(self) -> None:
+        while True:
+            batch = self._get_batch()
+            if not batch:
+                return
+            self._write(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self._drain()
+
+            if self._closed:
+                return
+
+    def flush(self) -> None:
+        """Block until every object queued so far has been written."""
+        if self._thread is None or not self._thread.is_alive():
+            self._drain()
+            return
+
+        self._wakeup.set()
+        self._queue.join()
+
+    def close(self) -> None:
+        """Stop the background thread after writing all the queued objects."""
+        if self._closed:
+            return
+
+        self._closed = True
+        if self._thread is not None:
+            self._wakeup.set()
+            self._thread.join()
+
+        self._drain()
+        _sync_buffers.discard(self)
+
+
+class AsyncWriteBuffer(_BaseWriteBuffer):
+    """
+    Async version of WriteBuffer.
+    The writer runs as an asyncio task on the loop that queues the first object.
+    """
+
+    def __init__(self, model: type["Document"], **kwargs: Any) -> None:
+        super().__init__(model, **kwargs)
+
+        # The queue and event are created on the running loop by _start()
+        self._queue: Optional[asyncio.Queue[Document]] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task[None]] = None
+
+        _async_buffers.add(self)
+
+    def _after_fork(self) -> None:
+        """The writer task and its loop belong to the parent process"""
+        self._queue = None
+        self._wakeup = None
+        self._task = None
+
+    def _start(self) -> tuple["asyncio.Queue[Document]", asyncio.Event]:
+        if self._queue is None or self._wakeup is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._wakeup = asyncio.Event()
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+        return self._queue, self._wakeup
+
+    async def put(self, obj: "Document") -> None:
+        self._validate_object(obj)
+
+        if not self.block:
+            self.put_nowait(obj)
+            return
+
+        _queue, wakeup = self._start()
+        try:
+            await asyncio.wait_for(_queue.put(obj), timeout=self.put_timeout)
+        except asyncio.TimeoutError as e:
+            raise WriteBufferFull(
+                f"Write buffer for {self.model.__name__} is full."
+            ) from e
+
+        if _queue.qsize() >= self.max_batch_size:
+            wakeup.set()
+
+    def put_nowait(self, obj: "Document") -> None:
+        self._validate_object(obj)
+        _queue, wakeup = self._start()
+
+        try:
+            _queue.put_nowait(obj)
+        except asyncio.QueueFull as e:
+            raise WriteBufferFull(
+                f"Write buffer for {self.model.__name__} is full."
+            ) from e
+
+        if _queue.qsize() >= self.max_batch_size:
+            wakeup.set()
+
+    def _get_batch(self) -> list["Document"]:
+        batch: list[Document] = []
+        while self._queue is not None and len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    async def _write(self, batch: list["Document"]) -> None:
+        try:
+            for obj in batch:
+                await obj._async_assign_sequence_values()
+            data = [obj._prepare_crate_data() for obj in batch]
+        except Exception as e:
+            self._handle_error(e, batch)
+            return
+
+        try:
+            result = await self.model._async_get_collection().insert_many(
+                data, ordered=self.ordered
+            )
+        except Exception as e:
+            self._handle_insert_error(e, batch, data)
+            return
+
+        for obj, inserted_id in zip(batch, result.inserted_ids):
+            obj._update_new_id(inserted_id)
+
+    async def _drain(self) -> None:
+        while True:
+            batch = self._get_batch()
+            if not batch:
+                return
+            await self._write(batch)
+            for _ in batch:
+                cast(asyncio.Queue[Any], self._queue).task_done()
+
+    async def _run(self) -> None:
+        wakeup = cast(asyncio.Event, self._wakeup)
+        while True:
+            try:
+                await asyncio.wait_for(wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            wakeup.clear()
+            await self._drain()
+
+            if self._closed:
+                return
+
+    async def flush(self) -> None:
+        """Wait until every object queued so far has been written."""
+        if self._queue is None or self._wakeup is None:
+            return
+        if self._task is None or self._task.done():
+            await self._drain()
+            return
+
+        self._wakeup.set()
+        await self._queue.join()
+
+    async def aclose(self) -> None:
+        """Stop the writer task after writing all the queued objects."""
+        if self._closed:
+            return
+
+        self._closed = True
+        if self._task is not None and not self._task.done():
+            cast(asyncio.Event, self._wakeup).set()
+            await self._task
+
+        await self._drain()
+        _async_buffers.discard(self)
+
+
+def _is_buffer_of(buffer: _BaseWriteBuffer, alias: Optional[str]) -> bool:
+    return alias is None or buffer.model._connection_alias() == alias
+
+
+def close_write_buffers(alias: Optional[str] = None) -> None:
+    """
+    Flush and close the sync write buffers of the models of `alias`, of every
+    model if it's None. Called from disconnect().
+    """
+    for buffer in list(_sync_buffers):
+        if _is_buffer_of(buffer, alias):
+            buffer.close()
+
+    if any(_is_buffer_of(buffer, alias) for buffer in list(_async_buffers)):
+        logger.warning(
+            "Async write buffers can not be flushed from disconnect(). Use adisconnect() instead."
+        )
+
+
+async def aclose_write_buffers(alias: Optional[str] = None) -> None:
+    """Flush and close the async write buffers. Called from adisconnect()."""
+    for buffer in list(_async_buffers):
+        if _is_buffer_of(buffer, alias):
+            await buffer.aclose()
+
+
+def reset_write_buffers_after_fork() -> None:
+    for buffer in list(_sync_buffers):
+        buffer._after_fork()
+    for async_buffer in list(_async_buffers):
+        async_buffer._after_fork()
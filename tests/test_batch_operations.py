@@ -0,0 +1,143 @@
+from datetime import datetime, timedelta
+
+import pytest
+from mongodb_odm import ODMObjectId
+from mongodb_odm.utils.batch import (
+    BatchProgress,
+    BatchThrottle,
+    _get_lag_from_status,
+    get_batch_filter,
+    get_batch_ids_filter,
+)
+
+from tests.conftest import INIT_CONFIG
+from tests.models.course import ContentDescription, ContentImage, Course
+
+
+def create_courses(author_id, total):
+    for i in range(total):
+        Course(author_id=author_id, title=f"Course {i}").create()
+
+
+def test_batch_filters():
+    assert get_batch_ids_filter({}, None) == {}
+    assert get_batch_ids_filter({}, 5) == {"_id": {"$gt": 5}}
+    assert get_batch_ids_filter({"title": "one"}, 5) == {
+        "$and": [{"title": "one"}, {"_id": {"$gt": 5}}]
+    }
+
+    assert get_batch_filter({}, [1, 2]) == {"_id": {"$in": [1, 2]}}
+    assert get_batch_filter({"title": "one"}, [1, 2]) == {
+        "$and": [{"title": "one"}, {"_id": {"$in": [1, 2]}}]
+    }
+
+
+def test_batch_throttle_delay():
+    throttle = BatchThrottle(max_ops_per_second=100)
+
+    assert throttle.get_delay(100, 0.25) == pytest.approx(0.75)
+    assert throttle.get_delay(100, 2) == 0
+    assert BatchThrottle().get_delay(100, 0) == 0
+
+    with pytest.raises(ValueError):
+        BatchThrottle(max_ops_per_second=0)
+
+
+def test_replication_lag_from_status():
+    now = datetime.now()
+    status = {
+        "members": [
+            {"stateStr": "PRIMARY", "optimeDate": now},
+            {"stateStr": "SECONDARY", "optimeDate": now - timedelta(seconds=2)},
+            {"stateStr": "SECONDARY", "optimeDate": now - timedelta(seconds=5)},
+            {"stateStr": "ARBITER"},
+        ]
+    }
+
+    assert _get_lag_from_status(status) == 5
+    assert _get_lag_from_status({"members": status["members"][:1]}) == 0
+
+
+@pytest.mark.usefixtures(INIT_CONFIG)
+def test_update_in_batches():
+    author_id = ODMObjectId()
+    create_courses(author_id, 25)
+    create_courses(ODMObjectId(), 5)
+
+    checkpoints = []
+    progress = Course.update_in_batches(
+        {Course.author_id: author_id},
+        {"$set": {Course.cover_image: "/media/cover.png"}},
+        batch_size=10,
+        on_batch=lambda progress: checkpoints.append(progress.last_id),
+    )
+
+    assert progress.batches == 3
+    assert progress.processed == 25
+    assert progress.modified_count == 25
+    assert len(checkpoints) == 3
+    assert checkpoints == sorted(checkpoints), "_ids should be walked in order"
+
+    assert Course.count_documents({Course.cover_image: "/media/cover.png"}) == 25
+
+
+@pytest.mark.usefixtures(INIT_CONFIG)
+def test_update_in_batches_resume_from_checkpoint():
+    author_id = ODMObjectId()
+    create_courses(author_id, 10)
+
+    ids = [obj.id for obj in Course.find({Course.author_id: author_id}, sort="_id")]
+
+    progress = Course.update_in_batches(
+        {Course.author_id: author_id},
+        {"$set": {Course.cover_image: "/media/cover.png"}},
+        batch_size=3,
+        start_after=ids[3],
+    )
+
+    assert progress.processed == 6
+    assert progress.last_id == ids[-1]
+    assert Course.count_documents({Course.cover_image: "/media/cover.png"}) == 6
+
+
+@pytest.mark.usefixtures(INIT_CONFIG)
+def test_delete_in_batches():
+    author_id = ODMObjectId()
+    create_courses(author_id, 12)
+    create_courses(ODMObjectId(), 3)
+
+    progress = Course.delete_in_batches(
+        {Course.author_id: author_id}, batch_size=5, max_ops_per_second=10000
+    )
+
+    assert progress.batches == 3
+    assert progress.deleted_count == 12
+    assert Course.count_documents() == 3
+
+
+@pytest.mark.usefixtures(INIT_CONFIG)
+def test_delete_in_batches_for_child_model():
+    course_id = ODMObjectId()
+    for _ in range(4):
+        ContentDescription(course_id=course_id, description="Description").create()
+        ContentImage(course_id=course_id, image_path="/media/image.png").create()
+
+    progress = ContentImage.delete_in_batches({}, batch_size=3)
+
+    assert progress.deleted_count == 4
+    assert ContentDescription.count_documents() == 4
+
+
+@pytest.mark.usefixtures(INIT_CONFIG)
+def test_update_in_batches_with_replication_lag_budget():
+    create_courses(ODMObjectId(), 3)
+
+    progress = Course.update_in_batches(
+        None,
+        {"$set": {Course.cover_image: "/media/cover.png"}},
+        batch_size=1,
+        max_replication_lag=60,
+    )
+
+    assert isinstance(progress, BatchProgress)
+    assert progress.modified_count == 3
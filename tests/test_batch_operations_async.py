@@ -0,0 +1,68 @@
+import pytest
+from mongodb_odm import ODMObjectId
+
+from tests.conftest import ASYNC_INIT_CONFIG
+from tests.models.course import Course
+
+
+async def async_create_courses(author_id, total):
+    for i in range(total):
+        await Course(author_id=author_id, title=f"Course {i}").acreate()
+
+
+@pytest.mark.usefixtures(ASYNC_INIT_CONFIG)
+async def test_aupdate_in_batches():
+    author_id = ODMObjectId()
+    await async_create_courses(author_id, 25)
+    await async_create_courses(ODMObjectId(), 5)
+
+    checkpoints = []
+    progress = await Course.aupdate_in_batches(
+        {Course.author_id: author_id},
+        {"$set": {Course.cover_image: "/media/cover.png"}},
+        batch_size=10,
+        on_batch=lambda progress: checkpoints.append(progress.last_id),
+    )
+
+    assert progress.batches == 3
+    assert progress.modified_count == 25
+    assert checkpoints == sorted(checkpoints), "_ids should be walked in order"
+
+    total = await Course.acount_documents({Course.cover_image: "/media/cover.png"})
+    assert total == 25
+
+
+@pytest.mark.usefixtures(ASYNC_INIT_CONFIG)
+async def test_aupdate_in_batches_resume_from_checkpoint():
+    author_id = ODMObjectId()
+    await async_create_courses(author_id, 10)
+
+    ids = [
+        obj.id async for obj in Course.afind({Course.author_id: author_id}, sort="_id")
+    ]
+
+    progress = await Course.aupdate_in_batches(
+        {Course.author_id: author_id},
+        {"$set": {Course.cover_image: "/media/cover.png"}},
+        batch_size=3,
+        start_after=ids[3],
+        max_replication_lag=60,
+    )
+
+    assert progress.processed == 6
+    assert progress.last_id == ids[-1]
+
+
+@pytest.mark.usefixtures(ASYNC_INIT_CONFIG)
+async def test_adelete_in_batches():
+    author_id = ODMObjectId()
+    await async_create_courses(author_id, 12)
+    await async_create_courses(ODMObjectId(), 3)
+
+    progress = await Course.adelete_in_batches(
+        {Course.author_id: author_id}, batch_size=5, max_ops_per_second=10000
+    )
+
+    assert progress.batches == 3
+    assert progress.deleted_count == 12
+    assert await Course.acount_documents() == 3
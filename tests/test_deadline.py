@@ -0,0 +1,97 @@
+import time
+from typing import Optional
+
+import pytest
+from mongodb_odm import Document, Field
+from mongodb_odm.exceptions import DeadlineExceeded
+from mongodb_odm.utils.deadline import (
+    OPERATION_AGGREGATE,
+    OPERATION_WRITE,
+    deadline,
+    get_max_time_ms,
+    get_remaining_ms,
+)
+
+from tests.conftest import INIT_CONFIG
+
+
+class DeadlineModel(Document):
+    title: str = Field(...)
+    author: Optional[str] = None
+
+    class ODMConfig(Document.ODMConfig):
+        collection_name = "test_deadline"
+        read_max_time_ms = 200
+        aggregate_max_time_ms = 5000
+
+
+def test_deadline_remaining_time():
+    assert get_remaining_ms() is None
+    assert get_max_time_ms(None) is None
+    assert get_max_time_ms(100, None) == 100
+
+    with deadline(10):
+        assert 9000 < get_remaining_ms() <= 10000
+        assert get_max_time_ms(100) == 100
+
+        # A nested deadline can only shorten the outer one
+        with deadline(60):
+            assert get_remaining_ms() <= 10000
+        with deadline(1):
+            assert get_remaining_ms() <= 1000
+
+    assert get_remaining_ms() is None
+
+    with deadline(0.001):
+        time.sleep(0.002)
+        with pytest.raises(DeadlineExceeded):
+            get_remaining_ms()
+
+
+def test_operation_max_time_ms():
+    kwargs = DeadlineModel._get_operation_kwargs({}, max_time_ms_key="max_time_ms")
+    assert kwargs == {"max_time_ms": 200}
+
+    kwargs = DeadlineModel._get_operation_kwargs(
+        {"maxTimeMS": 50}, max_time_ms_key="maxTimeMS"
+    )
+    assert kwargs == {"maxTimeMS": 50}
+
+    kwargs = DeadlineModel._get_operation_kwargs(
+        {}, max_time_ms_key="maxTimeMS", operation_type=OPERATION_AGGREGATE
+    )
+    assert kwargs == {"maxTimeMS": 5000}
+
+    assert DeadlineModel._get_max_time_ms(OPERATION_WRITE) is None
+    assert DeadlineModel._get_operation_kwargs({}) == {}
+
+    with deadline(1):
+        kwargs = DeadlineModel._get_operation_kwargs(
+            {}, max_time_ms_key="maxTimeMS", operation_type=OPERATION_AGGREGATE
+        )
+        assert kwargs["maxTimeMS"] <= 1000
+        assert DeadlineModel._get_max_time_ms(OPERATION_WRITE) <= 1000
+
+
+def test_passed_deadline_fails_fast():
+    with deadline(0.001):
+        time.sleep(0.002)
+        with pytest.raises(DeadlineExceeded):
+            DeadlineModel._get_operation_kwargs({}, max_time_ms_key="max_time_ms")
+        with pytest.raises(DeadlineExceeded):
+            DeadlineModel._get_write_timeout()
+
+
+@pytest.mark.usefixtures(INIT_CONFIG)
+def test_operations_with_deadline():
+    with deadline(5):
+        DeadlineModel(title="Hello").create()
+        assert DeadlineModel.count_documents({"title": "Hello"}) == 1
+        assert len(list(DeadlineModel.find({"title": "Hello"}))) == 1
+
+    with deadline(0.001):
+        time.sleep(0.002)
+        with pytest.raises(DeadlineExceeded):
+            DeadlineModel.find_one({"title": "Hello"})
+        with pytest.raises(DeadlineExceeded):
+            DeadlineModel.update_many({}, {"$set": {"author": "a"}})
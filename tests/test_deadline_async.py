@@ -0,0 +1,33 @@
+import asyncio
+from typing import Optional
+
+import pytest
+from mongodb_odm import Document, Field
+from mongodb_odm.exceptions import DeadlineExceeded
+from mongodb_odm.utils.deadline import deadline
+
+from tests.conftest import ASYNC_INIT_CONFIG
+
+
+class AsyncDeadlineModel(Document):
+    title: str = Field(...)
+    author: Optional[str] = None
+
+    class ODMConfig(Document.ODMConfig):
+        collection_name = "test_async_deadline"
+        read_max_time_ms = 200
+        write_max_time_ms = 1000
+
+
+@pytest.mark.usefixtures(ASYNC_INIT_CONFIG)
+async def test_async_operations_with_deadline():
+    with deadline(5):
+        await AsyncDeadlineModel(title="Hello").acreate()
+        assert await AsyncDeadlineModel.acount_documents({"title": "Hello"}) == 1
+
+    with deadline(0.001):
+        await asyncio.sleep(0.002)
+        with pytest.raises(DeadlineExceeded):
+            await AsyncDeadlineModel.afind_one({"title": "Hello"})
+        with pytest.raises(DeadlineExceeded):
+            await AsyncDeadlineModel.aupdate_many({}, {"$set": {"author": "a"}})
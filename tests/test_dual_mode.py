@@ -0,0 +1,100 @@
+import asyncio
+import time
+from typing import Optional
+from unittest.mock import patch
+
+import pytest
+from mongodb_odm import Document, Field, WriteBuffer
+from mongodb_odm.connection import (
+    adisconnect,
+    connect,
+    db,
+    disconnect,
+    get_client,
+    get_connection_aliases,
+)
+from mongodb_odm.exceptions import InvalidAction
+from pymongo import AsyncMongoClient, MongoClient
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.collection import Collection
+from pymongo.database import Database
+
+from tests.constants import MONGO_URL
+
+
+class DualModeModel(Document):
+    title: str = Field(...)
+    author: Optional[str] = None
+
+    class ODMConfig(Document.ODMConfig):
+        collection_name = "test_dual_mode"
+
+
+@pytest.fixture(autouse=True)
+async def cleanup_connection():
+    await adisconnect(raise_error=False)
+
+    yield
+
+    await adisconnect(raise_error=False)
+
+
+async def test_dual_mode_clients():
+    # The clients connect on the first operation, no server is needed
+    client = connect(MONGO_URL, dual_mode=True)
+    assert isinstance(client, MongoClient)
+    assert get_client() is client
+
+    async_client = get_client(is_async_action=True)
+    assert isinstance(async_client, AsyncMongoClient)
+    assert get_client(is_async_action=True) is async_client
+
+    assert isinstance(db(), Database)
+    assert isinstance(db(is_async_action=True), AsyncDatabase)
+    assert isinstance(DualModeModel._get_collection(), Collection)
+    collection = DualModeModel._async_get_collection()
+    assert isinstance(collection, AsyncCollection)
+    assert collection.database.client is async_client
+
+
+async def test_dual_mode_disconnect():
+    connect(MONGO_URL, dual_mode=True)
+    get_client(is_async_action=True)
+
+    with pytest.raises(InvalidAction):
+        disconnect()
+
+    assert await adisconnect() is True
+    assert get_connection_aliases() == []
+
+
+def test_dual_mode_sync_disconnect():
+    connect(MONGO_URL, dual_mode=True)
+    assert disconnect() is True
+
+    with pytest.raises(InvalidAction):
+        connect(MONGO_URL, async_is_enabled=True, dual_mode=True)
+
+
+async def test_dual_mode_disconnect_does_not_block_the_loop():
+    connect(MONGO_URL, dual_mode=True)
+    buffer = WriteBuffer(DualModeModel)
+    ticks = 0
+
+    async def tick() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    # The last flush of the writer thread is slow
+    task = asyncio.create_task(tick())
+    with patch.object(WriteBuffer, "_drain", side_effect=lambda: time.sleep(0.2)):
+        await asyncio.sleep(0)
+        ticks = 0
+        assert await adisconnect() is True
+    task.cancel()
+
+    assert buffer.closed is True
+    assert ticks > 5
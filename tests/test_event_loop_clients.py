@@ -0,0 +1,131 @@
+import asyncio
+import threading
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from mongodb_odm import Document, Field
+from mongodb_odm.connection import _get_connection, adisconnect, connect, get_client
+from pymongo import AsyncMongoClient
+
+from tests.constants import MONGO_URL
+
+
+class LoopModel(Document):
+    title: str = Field(...)
+
+    class ODMConfig(Document.ODMConfig):
+        collection_name = "test_event_loop_clients"
+
+
+@pytest.fixture()
+def async_connection():
+    # The clients connect on the first operation, no server is needed
+    client = connect(MONGO_URL, async_is_enabled=True)
+    yield client
+    asyncio.run(adisconnect(raise_error=False))
+
+
+def get_loop_client() -> tuple[Any, Any]:
+    async def main() -> tuple[Any, Any]:
+        client = get_client()
+        assert get_client() is client
+        collection = LoopModel._async_get_collection()
+        assert collection.database.client is client
+        return client, LoopModel._async_get_collection()
+
+    return asyncio.run(main())
+
+
+def test_every_loop_has_its_own_client(async_connection):
+    first_client, first_collection = get_loop_client()
+    assert first_client is async_connection
+
+    second_client, second_collection = get_loop_client()
+    assert isinstance(second_client, AsyncMongoClient)
+    assert second_client is not first_client
+    assert second_collection is not first_collection
+
+    # Closed and forgotten when asyncio.run() closes the loop
+    assert dict(_get_connection("default").loop_clients) == {}
+
+
+def test_loop_per_thread(async_connection):
+    clients: list[Any] = []
+
+    def run() -> None:
+        clients.append(get_loop_client()[0])
+
+    threads = [threading.Thread(target=run) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(client) for client in clients}) == 3
+    assert dict(_get_connection("default").loop_clients) == {}
+
+
+def test_bare_loop_close_closes_the_client(async_connection):
+    closed: list[Any] = []
+    loop = asyncio.new_event_loop()
+
+    async def main() -> Any:
+        return get_client()
+
+    client = loop.run_until_complete(main())
+    assert client is async_connection
+    with patch.object(
+        AsyncMongoClient, "close", autospec=True, side_effect=closed.append
+    ):
+        # No shutdown_asyncgens() before closing the loop
+        loop.close()
+
+    assert loop.is_closed()
+    assert closed == [client]
+    assert dict(_get_connection("default").loop_clients) == {}
+
+
+async def test_adisconnect_closes_the_clients_of_other_loops():
+    client = connect(MONGO_URL, async_is_enabled=True)
+    assert get_client() is client
+
+    other_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=other_loop.run_forever)
+    thread.start()
+
+    async def get_other_client() -> Any:
+        return get_client()
+
+    other_client = asyncio.run_coroutine_threadsafe(
+        get_other_client(), other_loop
+    ).result()
+    assert other_client is not client
+
+    closed: list[tuple[Any, Any]] = []
+
+    async def close(self: Any) -> None:
+        closed.append((self, asyncio.get_running_loop()))
+
+    try:
+        with patch.object(AsyncMongoClient, "close", close):
+            await adisconnect()
+    finally:
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join()
+        other_loop.close()
+
+    assert len(closed) == 2
+    assert (client, asyncio.get_running_loop()) in closed
+    assert (other_client, other_loop) in closed
+
+
+async def test_adisconnect_closes_the_loop_client():
+    client = connect(MONGO_URL, async_is_enabled=True)
+    assert get_client() is client
+    assert dict(_get_connection("default").loop_clients) == {
+        asyncio.get_running_loop(): client
+    }
+
+    await adisconnect()
+    assert _get_connection("default").client is None
@@ -0,0 +1,174 @@
+import threading
+from typing import Optional
+from unittest.mock import MagicMock, patch
+
+import pytest
+from mongodb_odm import (
+    ASCENDING,
+    Document,
+    Field,
+    IndexModel,
+    apply_indexes,
+    connect,
+    disconnect,
+)
+from mongodb_odm.connection import get_client
+from mongodb_odm.exceptions import CollectionScanError
+from mongodb_odm.utils.explain import (
+    ExplainSummary,
+    forbid_collection_scans,
+    get_explain_summary,
+    is_collection_scan_forbidden,
+)
+from mongodb_odm.utils.transaction import _current_session
+from pymongo.client_session import ClientSession
+
+from tests.conftest import INIT_CONFIG
+from tests.constants import MONGO_URL
+
+
+class ExplainModel(Document):
+    title: str = Field(...)
+    author: Optional[str] = None
+
+    class ODMConfig(Document.ODMConfig):
+        collection_name = "test_explain"
+        indexes = [IndexModel([("title", ASCENDING)])]
+
+
+class NoIndexModel(Document):
+    title: str = Field(...)
+
+    class ODMConfig(Document.ODMConfig):
+        collection_name = "test_explain_no_index"
+
+
+IXSCAN_EXPLAIN = {
+    "queryPlanner": {
+        "winningPlan": {
+            "stage": "FETCH",
+            "inputStage": {
+                "stage": "IXSCAN",
+                "keyPattern": {"title": 1},
+                "indexName": "title_1",
+            },
+        }
+    },
+    "executionStats": {
+        "nReturned": 1,
+        "executionTimeMillis": 0,
+        "totalKeysExamined": 1,
+        "totalDocsExamined": 1,
+    },
+}
+
+COLLSCAN_EXPLAIN = {
+    "explainVersion": "2",
+    "queryPlanner": {
+        "winningPlan": {
+            "queryPlan": {"stage": "SORT", "inputStage": {"stage": "COLLSCAN"}},
+            "slotBasedPlan": {},
+        }
+    },
+    "executionStats": {"nReturned": 2, "totalKeysExamined": 0, "totalDocsExamined": 50},
+}
+
+
+def test_explain_summary():
+    summary = get_explain_summary("test_explain", IXSCAN_EXPLAIN)
+    assert summary.stages == ["FETCH", "IXSCAN"]
+    assert summary.index_name == "title_1"
+    assert summary.index_key == {"title": 1}
+    assert summary.is_collscan is False
+    assert (summary.keys_examined, summary.docs_examined) == (1, 1)
+    assert "FETCH <- IXSCAN (title_1)" in str(summary)
+
+    summary = get_explain_summary("test_explain", COLLSCAN_EXPLAIN)
+    assert summary.stages == ["SORT", "COLLSCAN"]
+    assert summary.index_name is None
+    assert summary.is_collscan is True
+    assert summary.docs_examined == 50
+
+    id_explain = {"queryPlanner": {"winningPlan": {"stage": "IDHACK"}}}
+    assert get_explain_summary("test_explain", id_explain).index_name == "_id_"
+
+
+def test_collection_scan_guard(monkeypatch):
+    collscan = get_explain_summary("test_explain", COLLSCAN_EXPLAIN)
+    explained = []
+
+    def explain(cls, filter=None, sort=None, **kwargs) -> ExplainSummary:
+        explained.append(cls)
+        return collscan
+
+    monkeypatch.setattr(Document, "explain", classmethod(explain))
+
+    ExplainModel._before_query("find", {"author": "a"})
+    assert explained == []
+
+    with forbid_collection_scans():
+        assert is_collection_scan_forbidden() is True
+        with pytest.raises(CollectionScanError, match="runs as a COLLSCAN"):
+            ExplainModel._before_query("find", {"author": "a"})
+        # Collections without indexes are expected to be scanned
+        NoIndexModel._before_query("count_documents", {"title": "a"})
+        # Reads of the whole collection are not explained
+        ExplainModel._before_query("find", {})
+        ExplainModel._before_query("count_documents", None)
+        with pytest.raises(CollectionScanError):
+            ExplainModel._before_query("find", {}, sort=[("author", ASCENDING)])
+
+    assert is_collection_scan_forbidden() is False
+    assert explained == [ExplainModel, NoIndexModel, ExplainModel]
+
+
+def test_collection_scan_guard_of_other_threads():
+    results = []
+
+    def check() -> None:
+        results.append(is_collection_scan_forbidden())
+
+    with forbid_collection_scans():
+        thread = threading.Thread(target=check)
+        thread.start()
+        thread.join()
+
+    assert results == [False]
+
+
+def test_explain_in_transaction():
+    connect(MONGO_URL)
+    session = MagicMock(spec=ClientSession)
+    session.client = get_client()
+    token = _current_session.set(session)
+    try:
+        with patch("pymongo.synchronous.collection.Collection.find") as mock_find:
+            mock_find.return_value.explain.return_value = IXSCAN_EXPLAIN
+            ExplainModel.find_raw({"title": "a"})
+            assert mock_find.call_args.kwargs["session"] is session
+
+            # Explain is not allowed in transactions
+            with forbid_collection_scans():
+                ExplainModel._before_query("find", {"title": "a"})
+            assert "session" not in mock_find.call_args.kwargs
+    finally:
+        _current_session.reset(token)
+        disconnect()
+
+
+@pytest.mark.usefixtures(INIT_CONFIG)
+def test_explain():
+    apply_indexes()
+    ExplainModel(title="Hello", author="a").create()
+
+    summary = ExplainModel.explain({"title": "Hello"})
+    assert summary.index_name == "title_1"
+    assert summary.n_returned == 1
+
+    summary = ExplainModel.explain({"author": "a"}, sort=[("author", ASCENDING)])
+    assert summary.is_collscan is True
+
+    with forbid_collection_scans():
+        assert ExplainModel.find_one({"title": "Hello"}) is not None
+        with pytest.raises(CollectionScanError):
+            ExplainModel.count_documents({"author": "a"})
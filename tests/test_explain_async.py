@@ -0,0 +1,35 @@
+from typing import Optional
+
+import pytest
+from mongodb_odm import ASCENDING, Document, Field, IndexModel, async_apply_indexes
+from mongodb_odm.exceptions import CollectionScanError
+from mongodb_odm.utils.explain import forbid_collection_scans
+
+from tests.conftest import ASYNC_INIT_CONFIG
+
+
+class AsyncExplainModel(Document):
+    title: str = Field(...)
+    author: Optional[str] = None
+
+    class ODMConfig(Document.ODMConfig):
+        collection_name = "test_async_explain"
+        indexes = [IndexModel([("title", ASCENDING)])]
+
+
+@pytest.mark.usefixtures(ASYNC_INIT_CONFIG)
+async def test_async_explain():
+    await async_apply_indexes()
+    await AsyncExplainModel(title="Hello", author="a").acreate()
+
+    summary = await AsyncExplainModel.aexplain({"title": "Hello"})
+    assert summary.index_name == "title_1"
+    assert summary.is_collscan is False
+
+    summary = await AsyncExplainModel.aexplain({"author": "a"})
+    assert summary.is_collscan is True
+
+    with forbid_collection_scans():
+        assert await AsyncExplainModel.afind_one({"title": "Hello"}) is not None
+        with pytest.raises(CollectionScanError):
+            await AsyncExplainModel.acount_documents({"author": "a"})
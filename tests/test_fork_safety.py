@@ -0,0 +1,129 @@
+import os
+import threading
+from typing import Optional, cast
+from unittest.mock import patch
+
+import pytest
+from mongodb_odm import Document, Field, FieldSequence, WriteBuffer
+from mongodb_odm.connection import (
+    _after_fork_in_child,
+    _get_connection,
+    connect,
+    db,
+    disconnect,
+    get_client,
+)
+from pymongo import MongoClient
+
+from tests.constants import MONGO_URL
+
+
+class ForkModel(Document):
+    title: str = Field(...)
+
+    class ODMConfig(Document.ODMConfig):
+        collection_name = "test_fork_safety"
+
+
+class SequenceForkModel(Document):
+    number: Optional[int] = None
+
+    class ODMConfig(Document.ODMConfig):
+        collection_name = "test_fork_safety_sequence"
+        sequences = [FieldSequence("number", block_size=10)]
+
+
+@pytest.fixture()
+def connection():
+    # The client connects on the first operation, no server is needed
+    client = connect(
+        MONGO_URL, databases={"logging"}, connection_kwargs={"appname": "a"}
+    )
+    yield client
+    disconnect(raise_error=False)
+
+
+def simulate_fork() -> None:
+    """Pretend the client was created by a parent process"""
+    _after_fork_in_child()
+    _get_connection("default").pid = os.getpid() + 1
+
+
+def next_sequence_value() -> Optional[int]:
+    """None if the call is stuck on a lock"""
+    values: list[int] = []
+    thread = threading.Thread(
+        target=lambda: values.append(SequenceForkModel.next_sequence_value("number")),
+        daemon=True,
+    )
+    thread.start()
+    thread.join(5)
+    return values[0] if values else None
+
+
+def test_reconnect_in_forked_process(connection):
+    collection = ForkModel._get_collection()
+    simulate_fork()
+
+    client = get_client()
+    assert isinstance(client, MongoClient)
+    assert client is not connection
+    assert client.options.pool_options.metadata["application"] == {"name": "a"}
+    assert _get_connection("default").pid == os.getpid()
+    assert db("logging").client is client
+
+    # The cached collection handles of the parent are rebuilt
+    new_collection = ForkModel._get_collection()
+    assert new_collection is not collection
+    assert new_collection.database.client is client
+    assert get_client() is client
+
+    # The client of the parent is left open for the parent
+    connection.close()
+
+
+def test_db_reconnects_in_forked_process(connection):
+    simulate_fork()
+    assert db().client is not connection
+    connection.close()
+
+
+def test_next_sequence_value_in_forked_process(connection):
+    with patch(
+        "pymongo.synchronous.collection.Collection.find_one_and_update",
+        return_value={"value": 10},
+    ) as mock_update:
+        assert SequenceForkModel.next_sequence_value("number") == 1
+        simulate_fork()
+        # The block of the parent is not reused by the child
+        assert next_sequence_value() == 1
+        assert mock_update.call_count == 2
+
+        # Reconnecting from get_client() doesn't take the sequence locks
+        _get_connection("default").pid = os.getpid() + 1
+        assert next_sequence_value() == 2
+
+    get_client().close()
+    connection.close()
+
+
+def test_write_buffer_in_forked_process(connection):
+    buffer = WriteBuffer(ForkModel, flush_interval=60)
+    with patch("pymongo.synchronous.collection.Collection.insert_many"):
+        buffer.put(ForkModel(title="parent"))
+        parent_thread, parent_wakeup = buffer._thread, buffer._wakeup
+        simulate_fork()
+
+        # The objects of the parent are left to the parent
+        assert buffer._queue.qsize() == 0
+        buffer.put(ForkModel(title="child"))
+        assert buffer._thread is not None and buffer._thread is not parent_thread
+        assert buffer._thread.is_alive()
+        buffer.close()
+
+        # Only needed since the parent thread still runs in this process
+        parent_wakeup.set()
+        cast(threading.Thread, parent_thread).join()
+
+    get_client().close()
+    connection.close()
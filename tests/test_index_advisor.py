@@ -0,0 +1,180 @@
+from typing import Optional
+
+import pytest
+from mongodb_odm import ASCENDING, DESCENDING, Document, Field, IndexModel
+from mongodb_odm.utils.index_advisor import (
+    STATUS_OPTIMAL,
+    STATUS_PARTIAL,
+    STATUS_UNINDEXED,
+    STATUS_UNSUPPORTED,
+    advise_indexes,
+)
+from mongodb_odm.utils.query_shape import (
+    QueryShapeRecorder,
+    get_filter_shape,
+    is_recording,
+    record_query,
+)
+
+from tests.conftest import INIT_CONFIG
+
+
+class AdvisorModel(Document):
+    title: str = Field(...)
+    status: Optional[str] = None
+    author: Optional[str] = None
+    created_at: Optional[int] = None
+
+    class ODMConfig(Document.ODMConfig):
+        collection_name = "test_index_advisor"
+        indexes = [
+            IndexModel([("status", ASCENDING), ("created_at", DESCENDING)]),
+            IndexModel([("author", ASCENDING)]),
+        ]
+
+
+def test_filter_shape():
+    shape = get_filter_shape(
+        {
+            "title": "Hello",
+            "created_at": {"$gte": 1, "$lt": 10},
+            "$or": [{"status": {"$in": ["a", "b"]}}, {"author": None}],
+            "tags": {"$elemMatch": {"name": "python", "score": {"$gt": 5}}},
+        }
+    )
+    assert shape == {
+        "title": "?",
+        "created_at": {"$gte": "?", "$lt": "?"},
+        "$or": [{"status": {"$in": "?"}}, {"author": "?"}],
+        "tags": {"$elemMatch": {"name": "?", "score": {"$gt": "?"}}},
+    }
+    assert get_filter_shape({"meta": {"a": 1}}) == {"meta": "?"}
+
+
+def test_recorder_groups_shapes():
+    assert is_recording() is False
+    record_query(AdvisorModel, "find", {"title": "ignored"})
+
+    with QueryShapeRecorder() as recorder:
+        assert is_recording() is True
+        record_query(AdvisorModel, "find", {"title": "a"})
+        record_query(AdvisorModel, "find", {"title": "b"})
+        record_query(AdvisorModel, "count_documents", {"title": "b"})
+        record_query(AdvisorModel, "find", {"title": "b"}, [("status", ASCENDING)])
+
+    assert is_recording() is False
+    shapes = recorder.get_shapes("AdvisorModel")
+    assert [(shape.operation, shape.count) for shape in shapes] == [
+        ("find", 2),
+        ("count_documents", 1),
+        ("find", 1),
+    ]
+    assert shapes[2].sort == [("status", ASCENDING)]
+
+    recorder.clear()
+    assert recorder.get_shapes() == []
+
+
+def advise(filter, sort=None):
+    with QueryShapeRecorder() as recorder:
+        record_query(AdvisorModel, "find", filter, sort)
+    return advise_indexes(recorder).advice
+
+
+def test_advise_optimal_queries():
+    for filter, sort in [
+        ({"status": "a"}, None),
+        ({"status": "a"}, [("created_at", DESCENDING)]),
+        ({"status": "a"}, [("created_at", ASCENDING)]),
+        ({"status": "a", "created_at": {"$gt": 1}}, None),
+        ({"author": {"$in": ["a", "b"]}}, None),
+        ({"_id": "a"}, None),
+    ]:
+        (advice,) = advise(filter, sort)
+        assert advice.status == STATUS_OPTIMAL, (filter, sort)
+        assert advice.suggested_keys == []
+
+    assert advise({}) == []
+
+
+def test_advise_esr_order():
+    (advice,) = advise(
+        {"created_at": {"$gt": 1}, "title": "a", "status": "b"},
+        [("author", DESCENDING)],
+    )
+    assert advice.status == STATUS_PARTIAL
+    assert advice.index_names == ["status_1_created_at_-1"]
+    assert advice.suggested_keys == [
+        [("title", 1), ("status", 1), ("author", -1), ("created_at", 1)]
+    ]
+
+    # The sort is done in memory
+    (advice,) = advise({"status": "a"}, [("title", ASCENDING)])
+    assert advice.status == STATUS_PARTIAL
+    assert advice.suggested_keys == [[("status", 1), ("title", 1)]]
+
+
+def test_advise_unindexed_queries():
+    (advice,) = advise({"title": "a"})
+    assert advice.status == STATUS_UNINDEXED
+    assert advice.index_names == []
+    assert advice.suggested_keys == [[("title", 1)]]
+
+    # A range on the second key of an index can't use it
+    (advice,) = advise({"created_at": {"$gt": 1}})
+    assert advice.status == STATUS_UNINDEXED
+
+
+def test_advise_or_branches():
+    (advice,) = advise({"$or": [{"author": "a"}, {"title": "b"}]})
+    assert advice.status == STATUS_UNINDEXED
+    assert advice.index_names == ["author_1"]
+    assert advice.suggested_keys == [[("title", 1)]]
+
+
+def test_advise_unsupported_queries():
+    (advice,) = advise({"$where": "this.a > 1"})
+    assert advice.status == STATUS_UNSUPPORTED
+    (advice,) = advise({"title": "a"}, [("score", {"$meta": "textScore"})])
+    assert advice.status == STATUS_UNSUPPORTED
+
+
+def test_suggested_indexes_merge_prefixes():
+    with QueryShapeRecorder() as recorder:
+        record_query(AdvisorModel, "find", {"title": "a"})
+        record_query(AdvisorModel, "find", {"title": "a"})
+        record_query(AdvisorModel, "find", {"title": "a"}, [("author", ASCENDING)])
+        record_query(AdvisorModel, "count_documents", {"created_at": {"$gt": 1}})
+
+    report = advise_indexes(recorder)
+    suggestions = report.get_suggested_indexes()
+    assert [(obj.key, obj.query_count) for obj in suggestions] == [
+        ([("title", 1), ("author", 1)], 3),
+        ([("created_at", 1)], 1),
+    ]
+    assert suggestions[0].get_index_model().document["key"] == {
+        "title": 1,
+        "author": 1,
+    }
+    # The sort on author can use the author index
+    assert len(report.get_unindexed()) == 2
+    assert len(report.get_partial()) == 1
+    assert "suggested index" in str(report)
+
+
+@pytest.mark.usefixtures(INIT_CONFIG)
+def test_model_queries_are_recorded():
+    with QueryShapeRecorder() as recorder:
+        list(AdvisorModel.find({"title": "a"}, sort=[("status", ASCENDING)]))
+        AdvisorModel.find_one({"status": "a"})
+        AdvisorModel.count_documents({"author": "a"})
+        AdvisorModel.update_many({"title": "a"}, {"$set": {"status": "b"}})
+    AdvisorModel.count_documents({"author": "a"})
+
+    shapes = recorder.get_shapes()
+    assert [(shape.operation, shape.filter, shape.count) for shape in shapes] == [
+        ("find", {"title": "?"}, 1),
+        ("find_one", {"status": "?"}, 1),
+        ("count_documents", {"author": "?"}, 1),
+        ("update_many", {"title": "?"}, 1),
+    ]
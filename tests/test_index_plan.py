@@ -0,0 +1,181 @@
+import json
+import threading
+from datetime import timezone
+from typing import Optional
+from unittest.mock import Mock, patch
+
+import pytest
+from mongodb_odm import (
+    ASCENDING,
+    DESCENDING,
+    Document,
+    Field,
+    IndexModel,
+    apply_indexes,
+    plan_indexes,
+)
+from mongodb_odm.utils.apply_indexes import (
+    CollectionIndexPlan,
+    IndexOperation,
+    IndexPlan,
+    _get_fingerprint_updates,
+    _get_index_fingerprint,
+    _run_in_threads,
+)
+
+from tests.conftest import INIT_CONFIG
+
+
+class PlanModel(Document):
+    title: str = Field(...)
+    slug: Optional[str] = None
+
+    class ODMConfig(Document.ODMConfig):
+        collection_name = "test_index_plan"
+        indexes = [IndexModel([("title", ASCENDING)])]
+
+
+def test_collection_plan_output():
+    plan = CollectionIndexPlan(
+        collection_name="test_index_plan",
+        create=[IndexModel([("title", DESCENDING)], unique=True).document],
+        drop=["title_1"],
+    )
+    index_plan = IndexPlan(collections=[plan, CollectionIndexPlan(collection_name="x")])
+
+    assert plan.has_changes is True
+    assert index_plan.create_count == 1 and index_plan.drop_count == 1
+    assert index_plan.get_changed_collections() == [plan]
+    assert "- title_1" in str(index_plan) and "+ title_-1" in str(index_plan)
+
+    data = json.loads(index_plan.model_dump_json())
+    assert data["collections"][0]["drop"] == ["title_1"]
+
+    new_index = plan.get_new_indexes()[0]
+    assert new_index.document["key"] == {"title": -1}
+    assert new_index.document["unique"] is True
+
+    assert str(IndexPlan()) == "No change detected."
+
+
+def test_run_in_threads():
+    thread_names: set[str] = set()
+
+    def func(value: int) -> int:
+        thread_names.add(threading.current_thread().name)
+        return value * 2
+
+    assert _run_in_threads(func, [1, 2, 3], max_workers=2) == [2, 4, 6]
+    assert all(name.startswith("mongodb-odm-indexes") for name in thread_names)
+
+    with pytest.raises(ValueError):
+        _run_in_threads(func, [1], max_workers=0)
+
+
+def test_dry_run_does_not_change_indexes():
+    operation = IndexOperation(
+        collection_name="test_index_plan",
+        model_indexes=[IndexModel([("title", ASCENDING)])],
+    )
+    collection = Mock()
+
+    with patch(
+        "mongodb_odm.utils.apply_indexes._get_all_indexes", return_value=[operation]
+    ):
+        with patch("mongodb_odm.utils.apply_indexes.db") as mock_db:
+            with patch(
+                "mongodb_odm.utils.apply_indexes._sync_get_database_indexes",
+                return_value=[],
+            ):
+                mock_db.return_value.__getitem__.return_value = collection
+
+                plan = apply_indexes(dry_run=True, force=True)
+
+    assert plan.create_count == 1 and plan.drop_count == 0
+    collection.create_indexes.assert_not_called()
+    collection.drop_index.assert_not_called()
+
+
+def test_index_fingerprint():
+    fingerprint = _get_index_fingerprint(
+        [
+            IndexModel([("title", ASCENDING), ("slug", ASCENDING)], unique=True),
+            IndexModel([("slug", DESCENDING)], sparse=True),
+        ]
+    )
+
+    assert fingerprint == _get_index_fingerprint(
+        [
+            IndexModel([("slug", DESCENDING)], sparse=True),
+            IndexModel([("title", ASCENDING), ("slug", ASCENDING)], unique=True),
+        ]
+    ), "Order of the indexes should not change the fingerprint"
+    assert fingerprint != _get_index_fingerprint(
+        [
+            IndexModel([("slug", ASCENDING), ("title", ASCENDING)], unique=True),
+            IndexModel([("slug", DESCENDING)], sparse=True),
+        ]
+    ), "Order of the keys should change the fingerprint"
+
+
+def test_fingerprint_updates():
+    plans = [
+        CollectionIndexPlan(collection_name="synced", fingerprint="abc"),
+        CollectionIndexPlan(collection_name="staged", fingerprint="abc", hide=["a_1"]),
+        CollectionIndexPlan(collection_name="unknown"),
+    ]
+    synced, staged = _get_fingerprint_updates(plans)
+    assert synced._doc["$set"]["fingerprint"] == "abc"
+    assert synced._doc["$set"]["updated_at"].tzinfo is timezone.utc
+    assert staged._doc == {"$unset": {"fingerprint": ""}}
+
+
+def test_unchanged_collections_are_skipped():
+    model_indexes = [IndexModel([("title", ASCENDING)])]
+    operation = IndexOperation(
+        collection_name="test_index_plan", model_indexes=model_indexes
+    )
+    stored = {
+        ("default", None, "test_index_plan"): _get_index_fingerprint(model_indexes)
+    }
+
+    with patch(
+        "mongodb_odm.utils.apply_indexes._get_all_indexes", return_value=[operation]
+    ):
+        with patch(
+            "mongodb_odm.utils.apply_indexes._sync_get_stored_fingerprints",
+            return_value=stored,
+        ):
+            with patch(
+                "mongodb_odm.utils.apply_indexes._sync_plan_for_a_collection"
+            ) as mock_plan:
+                plan = plan_indexes()
+
+    mock_plan.assert_not_called()
+    assert plan.skipped_count == 1 and plan.has_changes is False
+    assert "1 unchanged collection(s) skipped." in str(plan)
+
+
+@pytest.mark.usefixtures(INIT_CONFIG)
+def test_plan_and_apply_indexes():
+    plan = plan_indexes()
+    assert plan.create_count >= 1
+
+    applied_plan = apply_indexes(max_workers=4)
+    assert applied_plan.create_count == plan.create_count
+
+    plan = plan_indexes()
+    assert plan.has_changes is False
+    assert plan.skipped_count == len(applied_plan.collections)
+    assert plan_indexes(force=True).skipped_count == 0
+
+    PlanModel.ODMConfig.indexes = [IndexModel([("slug", ASCENDING)])]
+    try:
+        plan = plan_indexes()
+        [collection_plan] = [
+            obj for obj in plan.collections if obj.collection_name == "test_index_plan"
+        ]
+        assert collection_plan.drop == ["title_1"]
+        assert [index["name"] for index in collection_plan.create] == ["slug_1"]
+    finally:
+        PlanModel.ODMConfig.indexes = [IndexModel([("title", ASCENDING)])]
@@ -0,0 +1,57 @@
+import asyncio
+from typing import Optional
+
+import pytest
+from mongodb_odm import (
+    ASCENDING,
+    Document,
+    Field,
+    IndexModel,
+    async_apply_indexes,
+    async_plan_indexes,
+)
+from mongodb_odm.utils.apply_indexes import _gather_with_limit
+
+from tests.conftest import ASYNC_INIT_CONFIG
+
+
+class AsyncPlanModel(Document):
+    title: str = Field(...)
+    slug: Optional[str] = None
+
+    class ODMConfig(Document.ODMConfig):
+        collection_name = "test_async_index_plan"
+        indexes = [IndexModel([("title", ASCENDING)])]
+
+
+async def test_gather_with_limit():
+    running, max_running = 0, 0
+
+    async def func(value: int) -> int:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return value * 2
+
+    assert await _gather_with_limit(func, list(range(10)), 3) == [
+        value * 2 for value in range(10)
+    ]
+    assert max_running == 3
+
+    with pytest.raises(ValueError):
+        await _gather_with_limit(func, [1], 0)
+
+
+@pytest.mark.usefixtures(ASYNC_INIT_CONFIG)
+async def test_async_plan_and_apply_indexes():
+    plan = await async_apply_indexes(dry_run=True)
+    assert plan.create_count >= 1
+    assert (await async_plan_indexes()).create_count == plan.create_count
+
+    await async_apply_indexes(max_concurrency=4)
+
+    plan = await async_plan_indexes()
+    assert plan.has_changes is False and plan.skipped_count > 0
+    assert (await async_plan_indexes(force=True)).skipped_count == 0
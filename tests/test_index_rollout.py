@@ -0,0 +1,230 @@
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from unittest.mock import MagicMock, patch
+
+import pytest
+from bson import SON
+from mongodb_odm import ASCENDING, Document, Field, IndexModel, apply_indexes
+from mongodb_odm.utils.apply_indexes import (
+    CollectionIndexPlan,
+    IndexOperation,
+    _get_collection_plan,
+    _sync_apply_indexes_to_db,
+)
+from mongodb_odm.utils.index_rollout import (
+    IndexBuildProgress,
+    _get_build_progress,
+    get_staging_updates,
+    get_utc_datetime,
+    monitor_index_builds,
+)
+
+from tests.conftest import INIT_CONFIG
+
+
+class RolloutModel(Document):
+    title: str = Field(...)
+    slug: Optional[str] = None
+
+    class ODMConfig(Document.ODMConfig):
+        collection_name = "test_index_rollout"
+        indexes = [IndexModel([("title", ASCENDING)])]
+
+
+def db_index(name, field, **kwargs):
+    return SON([("v", 2), ("key", SON([(field, 1)])), ("name", name), *kwargs.items()])
+
+
+def test_staged_plan():
+    operation = IndexOperation(
+        collection_name="test_index_rollout",
+        model_indexes=[
+            IndexModel([("title", ASCENDING)]),
+            IndexModel([("slug", ASCENDING)]),
+        ],
+    )
+    database_indexes = [
+        db_index("_id_", "_id"),
+        db_index("slug_1", "slug", hidden=True),
+        db_index("old_1", "old"),
+        db_index("expired_1", "expired", hidden=True),
+        db_index("waiting_1", "waiting", hidden=True),
+    ]
+    # Aware with a tz_aware client, naive UTC otherwise
+    now = datetime.now(timezone.utc)
+    hidden_at = {
+        "expired_1": now - timedelta(days=2),
+        "waiting_1": now.replace(tzinfo=None) - timedelta(hours=1),
+    }
+
+    plan = _get_collection_plan(
+        operation,
+        database_indexes,
+        staged=True,
+        hidden_at=hidden_at,
+        drop_grace_period=24 * 60 * 60,
+    )
+
+    assert [index["name"] for index in plan.create] == ["title_1"]
+    assert plan.unhide == ["slug_1"]
+    assert plan.hide == ["old_1"]
+    assert plan.drop == ["expired_1"]
+    assert plan.pending_drop == ["waiting_1"]
+    assert plan.has_pending_drops is True
+    assert "~ old_1 (hide)" in str(plan) and "^ slug_1 (unhide)" in str(plan)
+
+    plan = _get_collection_plan(operation, database_indexes)
+    assert plan.drop == ["old_1", "expired_1", "waiting_1"]
+    assert plan.unhide == ["slug_1"] and plan.hide == []
+
+
+def test_hidden_at_is_utc():
+    (update,) = get_staging_updates("test_index_rollout", ["old_1"], [])
+    hidden_at = update._doc["$setOnInsert"]["hidden_at"]
+    assert hidden_at.tzinfo is timezone.utc
+
+    naive = datetime(2024, 3, 31, 1, 30)
+    assert get_utc_datetime(naive) == naive.replace(tzinfo=timezone.utc)
+    dhaka = timezone(timedelta(hours=6))
+    assert get_utc_datetime(datetime(2024, 3, 31, 7, 30, tzinfo=dhaka)) == datetime(
+        2024, 3, 31, 1, 30, tzinfo=timezone.utc
+    )
+
+
+def test_staged_plan_drops_index_with_the_same_name():
+    operation = IndexOperation(
+        collection_name="test_index_rollout",
+        model_indexes=[IndexModel([("title", ASCENDING)], unique=True)],
+    )
+    plan = _get_collection_plan(operation, [db_index("title_1", "title")], staged=True)
+
+    assert plan.drop == ["title_1"] and plan.hide == []
+
+
+def test_apply_staged_plan():
+    plan = CollectionIndexPlan(
+        collection_name="test_index_rollout",
+        create=[IndexModel([("title", ASCENDING)]).document],
+        drop=["expired_1"],
+        hide=["old_1"],
+        unhide=["slug_1"],
+        staged=True,
+    )
+    collection = MagicMock()
+
+    with patch("mongodb_odm.utils.apply_indexes.db") as mock_db:
+        mock_db.return_value.__getitem__.return_value = collection
+        with patch(
+            "mongodb_odm.utils.apply_indexes.sync_save_staging"
+        ) as mock_save_staging:
+            result = _sync_apply_indexes_to_db(plan, commit_quorum="majority")
+
+    assert result == (1, 1)
+    commands = [call.args[0] for call in collection.database.command.call_args_list]
+    assert commands[0]["index"] == {"name": "slug_1", "hidden": False}
+    assert commands[1]["index"] == {"name": "old_1", "hidden": True}
+    collection.drop_index.assert_called_once_with("expired_1")
+    assert collection.create_indexes.call_args.kwargs == {"commitQuorum": "majority"}
+    mock_save_staging.assert_called_once_with(
+        None,
+        "test_index_rollout",
+        hidden=["old_1"],
+        removed=["expired_1", "slug_1"],
+        connection="default",
+    )
+
+
+def test_index_build_progress():
+    progress = _get_build_progress(
+        "test_index_rollout",
+        {
+            "command": {
+                "createIndexes": "test_index_rollout",
+                "indexes": [{"name": "a_1"}],
+            },
+            "msg": "Index Build: scanning collection",
+            "progress": {"done": 250, "total": 1000},
+        },
+    )
+
+    assert progress.indexes == ["a_1"]
+    assert progress.percent == 25.0
+    assert str(progress) == 'Building a_1 on "test_index_rollout": 250/1000 (25.0%)'
+    assert "scanning" in str(
+        IndexBuildProgress(collection_name="x", message="scanning")
+    )
+
+
+def test_monitor_index_builds():
+    progress = IndexBuildProgress(collection_name="test_index_rollout", indexes=["a_1"])
+
+    with patch(
+        "mongodb_odm.utils.index_rollout.get_index_build_progress",
+        return_value=[progress],
+    ):
+        with patch("mongodb_odm.utils.index_rollout.logger") as mock_logger:
+            with monitor_index_builds(MagicMock(), interval=0.01):
+                time.sleep(0.1)
+
+    mock_logger.info.assert_called_with(str(progress))
+
+
+@pytest.mark.usefixtures(INIT_CONFIG)
+def test_staged_rollout():
+    apply_indexes()
+
+    RolloutModel.ODMConfig.indexes = [IndexModel([("slug", ASCENDING)])]
+    try:
+        plan = apply_indexes(staged=True, progress_interval=0.5)
+        [collection_plan] = [
+            obj
+            for obj in plan.collections
+            if obj.collection_name == "test_index_rollout"
+        ]
+        assert collection_plan.hide == ["title_1"]
+
+        indexes = {
+            index["name"]: index
+            for index in RolloutModel._get_collection().list_indexes()
+        }
+        assert indexes["title_1"]["hidden"] is True and "slug_1" in indexes
+
+        # Waiting for the grace period, the collection is checked again
+        plan = apply_indexes(staged=True)
+        [collection_plan] = [
+            obj
+            for obj in plan.collections
+            if obj.collection_name == "test_index_rollout"
+        ]
+        assert collection_plan.pending_drop == ["title_1"]
+
+        apply_indexes(staged=True, drop_grace_period=0)
+        indexes = [
+            index["name"] for index in RolloutModel._get_collection().list_indexes()
+        ]
+        assert "title_1" not in indexes
+    finally:
+        RolloutModel.ODMConfig.indexes = [IndexModel([("title", ASCENDING)])]
+
+
+@pytest.mark.usefixtures(INIT_CONFIG)
+def test_reintroduced_index_is_unhidden():
+    apply_indexes()
+
+    RolloutModel.ODMConfig.indexes = [IndexModel([("slug", ASCENDING)])]
+    try:
+        apply_indexes(staged=True)
+    finally:
+        RolloutModel.ODMConfig.indexes = [IndexModel([("title", ASCENDING)])]
+
+    plan = apply_indexes(staged=True)
+    [collection_plan] = [
+        obj for obj in plan.collections if obj.collection_name == "test_index_rollout"
+    ]
+    assert collection_plan.unhide == ["title_1"] and collection_plan.create == []
+
+    indexes = {
+        index["name"]: index for index in RolloutModel._get_collection().list_indexes()
+    }
+    assert not indexes["title_1"].get("hidden")
@@ -0,0 +1,54 @@
+import asyncio
+from typing import Optional
+from unittest.mock import MagicMock, patch
+
+import pytest
+from mongodb_odm import ASCENDING, Document, Field, IndexModel, async_apply_indexes
+from mongodb_odm.utils.index_rollout import IndexBuildProgress, amonitor_index_builds
+
+from tests.conftest import ASYNC_INIT_CONFIG
+
+
+class AsyncRolloutModel(Document):
+    title: str = Field(...)
+    slug: Optional[str] = None
+
+    class ODMConfig(Document.ODMConfig):
+        collection_name = "test_async_index_rollout"
+        indexes = [IndexModel([("title", ASCENDING)])]
+
+
+async def test_amonitor_index_builds():
+    progress = IndexBuildProgress(collection_name="test_async_index_rollout")
+
+    with patch(
+        "mongodb_odm.utils.index_rollout.aget_index_build_progress",
+        return_value=[progress],
+    ):
+        with patch("mongodb_odm.utils.index_rollout.logger") as mock_logger:
+            async with amonitor_index_builds(MagicMock(), interval=0.01):
+                await asyncio.sleep(0.1)
+
+    mock_logger.info.assert_called_with(str(progress))
+
+
+@pytest.mark.usefixtures(ASYNC_INIT_CONFIG)
+async def test_async_staged_rollout():
+    await async_apply_indexes()
+
+    AsyncRolloutModel.ODMConfig.indexes = [IndexModel([("slug", ASCENDING)])]
+    try:
+        plan = await async_apply_indexes(staged=True)
+        [collection_plan] = [
+            obj
+            for obj in plan.collections
+            if obj.collection_name == "test_async_index_rollout"
+        ]
+        assert collection_plan.hide == ["title_1"]
+
+        await async_apply_indexes(staged=True, drop_grace_period=0)
+        collection = AsyncRolloutModel._async_get_collection()
+        indexes = [index["name"] async for index in await collection.list_indexes()]
+        assert "title_1" not in indexes and "slug_1" in indexes
+    finally:
+        AsyncRolloutModel.ODMConfig.indexes = [IndexModel([("title", ASCENDING)])]
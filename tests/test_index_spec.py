@@ -0,0 +1,125 @@
+from bson import SON
+from mongodb_odm import ASCENDING, DESCENDING, TEXT, IndexModel
+from mongodb_odm.utils.apply_indexes import _get_calculated_indexes_for_collection
+from mongodb_odm.utils.index_spec import get_index_spec
+from pymongo.collation import Collation
+
+
+def db_index(**kwargs):
+    return SON([("v", 2), *kwargs.items()])
+
+
+def test_options_order_and_defaults_are_ignored():
+    model_index = IndexModel(
+        [("slug", ASCENDING)], sparse=False, unique=True, name="slug_index"
+    )
+    server_index = {
+        "v": 2,
+        "unique": True,
+        "key": {"slug": 1.0},
+        "name": "slug_1",
+        "background": True,
+    }
+
+    assert get_index_spec(model_index.document) == get_index_spec(server_index)
+    assert get_index_spec(model_index.document) != get_index_spec(
+        IndexModel([("slug", DESCENDING)], unique=True).document
+    )
+    assert get_index_spec(model_index.document) != get_index_spec(
+        IndexModel([("slug", ASCENDING)]).document
+    )
+
+
+def test_partial_filter_and_ttl():
+    model_index = IndexModel(
+        [("created_at", ASCENDING)],
+        expireAfterSeconds=3600,
+        partialFilterExpression={"status": "active", "age": {"$gt": 18}},
+    )
+    server_index = {
+        "key": {"created_at": 1},
+        "name": "created_at_1",
+        "expireAfterSeconds": 3600.0,
+        "partialFilterExpression": {"age": {"$gt": 18}, "status": "active"},
+    }
+
+    assert get_index_spec(model_index.document) == get_index_spec(server_index)
+    server_index["expireAfterSeconds"] = 60
+    assert get_index_spec(model_index.document) != get_index_spec(server_index)
+
+
+def test_collation_defaults():
+    model_index = IndexModel(
+        [("title", ASCENDING)], collation=Collation(locale="en", strength=2)
+    )
+    server_index = {
+        "key": {"title": 1},
+        "name": "title_1",
+        "collation": {
+            "locale": "en",
+            "caseLevel": False,
+            "caseFirst": "off",
+            "strength": 2,
+            "numericOrdering": False,
+            "alternate": "non-ignorable",
+            "maxVariable": "punct",
+            "normalization": False,
+            "backwards": False,
+            "version": "57.1",
+        },
+    }
+
+    assert get_index_spec(model_index.document) == get_index_spec(server_index)
+    server_index["collation"]["strength"] = 3
+    assert get_index_spec(model_index.document) != get_index_spec(server_index)
+
+
+def test_text_index():
+    model_index = IndexModel(
+        [("title", TEXT), ("short_description", TEXT)], weights={"title": 5}
+    )
+    server_index = {
+        "key": {"_fts": "text", "_ftsx": 1},
+        "name": "title_text_short_description_text",
+        "weights": {"short_description": 1, "title": 5},
+        "default_language": "english",
+        "language_override": "language",
+        "textIndexVersion": 3,
+    }
+
+    assert get_index_spec(model_index.document) == get_index_spec(server_index)
+
+    server_index["weights"] = {"short_description": 1, "title": 1}
+    assert get_index_spec(model_index.document) != get_index_spec(server_index)
+
+    server_index["weights"] = {"short_description": 1, "title": 5}
+    server_index["default_language"] = "spanish"
+    assert get_index_spec(model_index.document) != get_index_spec(server_index)
+
+
+def test_unchanged_indexes_are_not_rebuilt():
+    model_indexes = [
+        IndexModel([("slug", ASCENDING)], unique=True),
+        IndexModel([("title", TEXT)]),
+        IndexModel([("created_at", DESCENDING)]),
+    ]
+    database_indexes = [
+        db_index(key=SON([("_id", 1)]), name="_id_"),
+        db_index(key=SON([("slug", 1)]), name="slug_1", unique=True),
+        db_index(
+            key=SON([("_fts", "text"), ("_ftsx", 1)]),
+            name="title_text",
+            weights=SON([("title", 1)]),
+            default_language="english",
+            language_override="language",
+            textIndexVersion=3,
+        ),
+        db_index(key=SON([("old_field", 1)]), name="old_field_1"),
+    ]
+
+    new_indexes, delete_db_indexes = _get_calculated_indexes_for_collection(
+        database_indexes, model_indexes
+    )
+
+    assert [index.document["name"] for index in new_indexes] == ["created_at_-1"]
+    assert [index["name"] for index in delete_db_indexes] == ["old_field_1"]
@@ -0,0 +1,142 @@
+import json
+from datetime import datetime
+from typing import Optional
+from unittest.mock import patch
+
+import pytest
+from mongodb_odm import (
+    ASCENDING,
+    Document,
+    Field,
+    IndexModel,
+    apply_indexes,
+)
+from mongodb_odm.utils.index_usage import (
+    IndexUsageReport,
+    _analyze_collection,
+    _CollectionIndexes,
+    get_index_usage_report,
+)
+from pymongo import ReadPreference
+
+from tests.conftest import INIT_CONFIG
+
+
+class UsageModel(Document):
+    title: str = Field(...)
+    slug: Optional[str] = None
+
+    class ODMConfig(Document.ODMConfig):
+        collection_name = "test_index_usage"
+        indexes = [
+            IndexModel([("title", ASCENDING)]),
+            IndexModel([("title", ASCENDING), ("slug", ASCENDING)]),
+            IndexModel([("slug", ASCENDING)], unique=True),
+        ]
+
+
+def index_stats(name, key, ops, host="localhost:27017", **spec):
+    return {
+        "name": name,
+        "key": key,
+        "host": host,
+        "accesses": {"ops": ops, "since": datetime(2024, 1, 1)},
+        "spec": {"v": 2, "key": key, "name": name, **spec},
+    }
+
+
+def get_collection() -> _CollectionIndexes:
+    return _CollectionIndexes(
+        model=UsageModel,
+        collection_name="test_index_usage",
+        declared=[("UsageModel", index) for index in UsageModel.ODMConfig.indexes],
+    )
+
+
+def test_analyze_collection():
+    stats = [
+        index_stats("_id_", {"_id": 1}, 0),
+        index_stats("title_1", {"title": 1}, 10),
+        index_stats("title_1_slug_1", {"title": 1, "slug": 1}, 50),
+        index_stats("slug_1", {"slug": 1}, 0, unique=True),
+        index_stats("slug_-1", {"slug": -1}, 3),
+        index_stats("title_1_copy", {"title": 1.0}, 0, sparse=False),
+        # The same index reported by a secondary
+        index_stats("title_1_slug_1", {"title": 1, "slug": 1}, 25, host="other:27017"),
+    ]
+
+    usages = {
+        usage.name: usage for usage in _analyze_collection(get_collection(), stats)
+    }
+
+    assert len(usages) == 6
+    assert usages["_id_"].is_flagged is False
+
+    assert usages["title_1"].model_name == "UsageModel"
+    assert usages["title_1"].redundant_of == "title_1_slug_1"
+    assert usages["title_1_slug_1"].accesses == 75
+    assert usages["title_1_slug_1"].hosts == ["localhost:27017", "other:27017"]
+    assert usages["title_1_slug_1"].is_flagged is False
+
+    assert usages["slug_1"].unused is True
+    assert usages["slug_1"].redundant_of is None, "Unique index is not redundant"
+    assert usages["slug_-1"].declared is False and usages["slug_-1"].is_flagged is False
+
+    assert usages["title_1_copy"].duplicate_of == "title_1"
+    assert usages["title_1"].duplicate_of is None, "Most used index is kept"
+
+
+def test_analyze_collection_threshold():
+    stats = [index_stats("title_1", {"title": 1}, 2)]
+
+    [usage] = _analyze_collection(get_collection(), stats, unused_threshold=5)
+    assert usage.unused is True and "unused since" in str(usage)
+    assert str(IndexUsageReport(indexes=[usage])).startswith(
+        "Accesses of localhost:27017 only"
+    )
+
+
+def test_index_usage_report_reads_from_primary():
+    class SecondaryModel(Document):
+        title: str = Field(...)
+
+        class ODMConfig(Document.ODMConfig):
+            collection_name = "test_index_usage_secondary"
+            read_preference = "secondaryPreferred"
+
+    collections = [
+        _CollectionIndexes(
+            model=SecondaryModel, collection_name="test_index_usage_secondary"
+        )
+    ]
+    with (
+        patch(
+            "mongodb_odm.utils.index_usage._get_collections", return_value=collections
+        ),
+        patch.object(SecondaryModel, "_get_collection") as mock_get_collection,
+    ):
+        mock_get_collection.return_value.aggregate.return_value = []
+        get_index_usage_report()
+
+    mock_get_collection.assert_called_once_with(read_preference=ReadPreference.PRIMARY)
+
+
+@pytest.mark.usefixtures(INIT_CONFIG)
+def test_index_usage_report():
+    apply_indexes()
+    UsageModel(title="first", slug="first").create()
+    list(UsageModel.find({"title": "first", "slug": "first"}))
+
+    report = get_index_usage_report()
+    usages = {
+        usage.name: usage
+        for usage in report.indexes
+        if usage.collection_name == "test_index_usage"
+    }
+
+    assert usages["title_1"].redundant_of == "title_1_slug_1"
+    assert usages["slug_1"].declared is True
+    assert report.get_redundant() and report.get_unused()
+
+    data = json.loads(report.model_dump_json())
+    assert len(data["indexes"]) == len(report.indexes)
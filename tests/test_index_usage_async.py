@@ -0,0 +1,34 @@
+from typing import Optional
+
+import pytest
+from mongodb_odm import ASCENDING, Document, Field, IndexModel, async_apply_indexes
+from mongodb_odm.utils.index_usage import aget_index_usage_report
+
+from tests.conftest import ASYNC_INIT_CONFIG
+
+
+class AsyncUsageModel(Document):
+    title: str = Field(...)
+    slug: Optional[str] = None
+
+    class ODMConfig(Document.ODMConfig):
+        collection_name = "test_async_index_usage"
+        indexes = [
+            IndexModel([("title", ASCENDING)]),
+            IndexModel([("title", ASCENDING), ("slug", ASCENDING)]),
+        ]
+
+
+@pytest.mark.usefixtures(ASYNC_INIT_CONFIG)
+async def test_async_index_usage_report():
+    await async_apply_indexes()
+
+    report = await aget_index_usage_report()
+    usages = {
+        usage.name: usage
+        for usage in report.indexes
+        if usage.collection_name == "test_async_index_usage"
+    }
+
+    assert usages["title_1"].redundant_of == "title_1_slug_1"
+    assert usages["title_1_slug_1"].model_name == "AsyncUsageModel"
@@ -17,7 +17,8 @@ from mongodb_odm import (
 from mongodb_odm.exceptions import ConnectionError
 from mongodb_odm.utils.apply_indexes import (
     IndexOperation,
-    _sync_apply_indexes_for_a_collection,
+    _sync_apply_indexes_to_db,
+    _sync_plan_for_a_collection,
     apply_indexes,
 )
 
@@ -271,7 +272,7 @@ def test_son_object_handling():
             mock_db.return_value.__getitem__.return_value = mock_collection
 
             # This should handle SON object conversion without creating actual indexes
-            result = _sync_apply_indexes_for_a_collection(operation)
+            result = _sync_apply_indexes_to_db(_sync_plan_for_a_collection(operation))
             assert isinstance(result, tuple)
 
 
@@ -307,7 +308,7 @@ def test_invalid_key_type_handling():
             mock_db.return_value.__getitem__.return_value = mock_collection
 
             # This should handle invalid key type and continue
-            result = _sync_apply_indexes_for_a_collection(operation)
+            result = _sync_apply_indexes_to_db(_sync_plan_for_a_collection(operation))
             assert isinstance(result, tuple)
             assert result == (0, 0)  # No indexes should be created
 
@@ -333,7 +334,7 @@ def test_non_dict_new_indexes_handling():
 
     # Manually modify the function to test the condition
     with patch(
-        "mongodb_odm.utils.apply_indexes._sync_apply_indexes_for_a_collection"
+        "mongodb_odm.utils.apply_indexes._sync_apply_indexes_to_db"
     ) as mock_func:
 
         def side_effect(op):
@@ -364,7 +365,7 @@ def test_partial_match_handling():
         database_name=None,
     )
 
-    result = _sync_apply_indexes_for_a_collection(operation)
+    result = _sync_apply_indexes_to_db(_sync_plan_for_a_collection(operation))
     assert isinstance(result, tuple)
 
 
@@ -391,7 +392,7 @@ def test_create_indexes_exception_handling():
 
             # Test that the exception is properly re-raised
             with pytest.raises(Exception, match="Mocked model_indexes error"):
-                _sync_apply_indexes_for_a_collection(operation)
+                _sync_apply_indexes_to_db(_sync_plan_for_a_collection(operation))
 
 
 @pytest.mark.usefixtures(INIT_CONFIG)
@@ -17,7 +17,8 @@ from mongodb_odm import (
 from mongodb_odm.exceptions import ConnectionError
 from mongodb_odm.utils.apply_indexes import (
     IndexOperation,
-    _async_apply_indexes_for_a_collection,
+    _async_apply_indexes_to_db,
+    _async_plan_for_a_collection,
     async_apply_indexes,
 )
 
@@ -293,7 +294,9 @@ async def test_son_object_handling():
             mock_db.return_value.__getitem__.return_value = mock_collection
 
             # This should handle SON object conversion without creating actual indexes
-            result = await _async_apply_indexes_for_a_collection(operation)
+            result = await _async_apply_indexes_to_db(
+                await _async_plan_for_a_collection(operation)
+            )
             assert isinstance(result, tuple)
 
 
@@ -329,7 +332,9 @@ async def test_invalid_key_type_handling():
             mock_db.return_value.__getitem__.return_value = mock_collection
 
             # This should handle invalid key type and continue
-            result = await _async_apply_indexes_for_a_collection(operation)
+            result = await _async_apply_indexes_to_db(
+                await _async_plan_for_a_collection(operation)
+            )
             assert isinstance(result, tuple)
             assert result == (0, 0)  # No indexes should be created
 
@@ -355,7 +360,7 @@ async def test_non_dict_new_indexes_handling():
 
     # Manually modify the function to test the condition
     with patch(
-        "mongodb_odm.utils.apply_indexes._async_apply_indexes_for_a_collection"
+        "mongodb_odm.utils.apply_indexes._async_apply_indexes_to_db"
     ) as mock_func:
 
         def side_effect(op):
@@ -386,7 +391,9 @@ async def test_partial_match_handling():
         database_name=None,
     )
 
-    result = await _async_apply_indexes_for_a_collection(operation)
+    result = await _async_apply_indexes_to_db(
+        await _async_plan_for_a_collection(operation)
+    )
     assert isinstance(result, tuple)
 
 
@@ -415,7 +422,9 @@ async def test_create_indexes_exception_handling():
 
             # Test that the exception is properly re-raised
             with pytest.raises(Exception, match="Mocked model_indexes error"):
-                await _async_apply_indexes_for_a_collection(operation)
+                await _async_apply_indexes_to_db(
+                    await _async_plan_for_a_collection(operation)
+                )
 
 
 @pytest.mark.usefixtures(ASYNC_INIT_CONFIG)
@@ -0,0 +1,157 @@
+from datetime import timedelta
+
+from mongodb_odm import connect, disconnect
+from mongodb_odm.connection import get_client
+from mongodb_odm.utils.metrics import (
+    CommandMetricsListener,
+    LatencyHistogram,
+    MetricsRegistry,
+    get_metrics_registry,
+)
+from pymongo import monitoring
+
+from tests.constants import MONGO_URL
+
+ADDRESS = ("localhost", 27017)
+
+
+def run_command(
+    registry: MetricsRegistry,
+    request_id: int,
+    command: dict,
+    milliseconds: float,
+    failed: bool = False,
+) -> None:
+    command_listener, _, _ = registry.get_listeners()
+    command_name = next(iter(command))
+    command_listener.started(
+        monitoring.CommandStartedEvent(command, "testdb", request_id, ADDRESS, 1)
+    )
+    duration = timedelta(milliseconds=milliseconds)
+    if failed:
+        command_listener.failed(
+            monitoring.CommandFailedEvent(
+                duration,
+                {"ok": 0},
+                command_name,
+                request_id,
+                ADDRESS,
+                1,
+                None,
+                "testdb",
+            )
+        )
+    else:
+        command_listener.succeeded(
+            monitoring.CommandSucceededEvent(
+                duration,
+                {"ok": 1},
+                command_name,
+                request_id,
+                ADDRESS,
+                1,
+                None,
+                "testdb",
+            )
+        )
+
+
+def test_latency_histogram():
+    histogram = LatencyHistogram()
+    for value in [0.5, 3, 3, 4, 40, 20000]:
+        histogram.observe(value)
+
+    assert histogram.count == 6 and histogram.max_ms == 20000
+    assert histogram.counts[0] == 1 and histogram.counts[-1] == 1
+    assert histogram.get_percentile(50) == 5.0
+    assert histogram.get_percentile(100) == 20000
+    assert LatencyHistogram().get_percentile(50) is None
+    # Every histogram has its own buckets
+    assert LatencyHistogram().counts[0] == 0
+
+
+def test_command_metrics():
+    registry = MetricsRegistry(measure_bytes=True)
+    run_command(registry, 1, {"find": "player", "filter": {}}, 3)
+    run_command(registry, 2, {"getMore": 1, "collection": "player"}, 12)
+    run_command(registry, 3, {"find": "player", "filter": {}}, 30, failed=True)
+    run_command(registry, 4, {"insert": "team", "documents": []}, 1)
+
+    snapshot = registry.snapshot()
+    find = snapshot.get_command("player", "find")
+    assert find is not None
+    assert (find.count, find.errors) == (2, 1)
+    assert find.latency.max_ms == 30
+    assert find.request_bytes > 0 and find.reply_bytes > 0
+    assert snapshot.get_command("player", "getMore").count == 1
+    assert snapshot.get_command("team", "insert").count == 1
+
+    # Snapshots don't change with later events
+    run_command(registry, 5, {"find": "player"}, 1)
+    assert snapshot.get_command("player", "find").count == 2
+
+    registry.reset()
+    assert registry.snapshot().commands == []
+
+
+def test_pool_and_server_metrics():
+    registry = MetricsRegistry()
+    _, pool_listener, server_listener = registry.get_listeners()
+
+    pool_listener.connection_created(monitoring.ConnectionCreatedEvent(ADDRESS, 1))
+    pool_listener.connection_checked_out(
+        monitoring.ConnectionCheckedOutEvent(ADDRESS, 1, 0.004)
+    )
+    pool_listener.connection_checked_out(
+        monitoring.ConnectionCheckedOutEvent(ADDRESS, 2, 0.1)
+    )
+    pool_listener.connection_checked_in(monitoring.ConnectionCheckedInEvent(ADDRESS, 1))
+    pool_listener.connection_check_out_failed(
+        monitoring.ConnectionCheckOutFailedEvent(ADDRESS, "timeout", 2.0)
+    )
+    server_listener.succeeded(
+        monitoring.ServerHeartbeatSucceededEvent(0.002, None, ADDRESS)
+    )
+    server_listener.failed(
+        monitoring.ServerHeartbeatFailedEvent(0.5, Exception(), ADDRESS)
+    )
+
+    snapshot = registry.snapshot()
+    (pool,) = snapshot.pools
+    assert pool.address == "localhost:27017"
+    assert (pool.connections_created, pool.checkouts, pool.checked_out) == (1, 2, 1)
+    assert pool.checkout_failures == 1
+    assert pool.checkout_wait.max_ms == 2000
+    (server,) = snapshot.servers
+    assert (server.heartbeats, server.heartbeat_failures) == (2, 1)
+    assert server.last_rtt_ms == 2
+
+    text = registry.to_text()
+    assert 'mongodb_odm_pool_checked_out{address="localhost:27017"} 1' in text
+    assert (
+        'mongodb_odm_server_heartbeat_failures_total{address="localhost:27017"} 1'
+        in text
+    )
+
+
+def test_text_export():
+    registry = MetricsRegistry()
+    run_command(registry, 1, {"find": "player"}, 3)
+
+    text = registry.to_text()
+    labels = 'database="testdb",collection="player",command="find"'
+    assert f'mongodb_odm_command_duration_ms_bucket{{{labels},le="2.5"}} 0' in text
+    assert f'mongodb_odm_command_duration_ms_bucket{{{labels},le="5.0"}} 1' in text
+    assert f'mongodb_odm_command_duration_ms_bucket{{{labels},le="+Inf"}} 1' in text
+    assert f"mongodb_odm_command_duration_ms_count{{{labels}}} 1" in text
+    assert f"mongodb_odm_command_errors_total{{{labels}}} 0" in text
+
+
+def test_connect_registers_listeners():
+    connect(MONGO_URL, metrics=True)
+    try:
+        listeners = get_client().options.event_listeners
+        assert any(isinstance(obj, CommandMetricsListener) for obj in listeners)
+        assert all(obj in listeners for obj in get_metrics_registry().get_listeners())
+    finally:
+        disconnect()
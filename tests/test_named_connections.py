@@ -0,0 +1,97 @@
+from typing import Optional
+from unittest.mock import patch
+
+import pytest
+from mongodb_odm import Document, Field, WriteBuffer
+from mongodb_odm.connection import (
+    connect,
+    db,
+    disconnect,
+    get_client,
+    get_connection_aliases,
+)
+from mongodb_odm.exceptions import ConnectionError, InvalidConnection
+from mongodb_odm.models import _cashed_collection_handles
+
+from tests.constants import MONGO_URL
+
+ANALYTICS_URL = "mongodb://localhost:27017/analytics"
+
+
+class EventModel(Document):
+    name: str = Field(...)
+    user: Optional[str] = None
+
+    class ODMConfig(Document.ODMConfig):
+        collection_name = "test_named_connection_event"
+        connection = "analytics"
+
+
+class DefaultModel(Document):
+    name: str = Field(...)
+
+    class ODMConfig(Document.ODMConfig):
+        collection_name = "test_named_connection_default"
+
+
+@pytest.fixture()
+def connections():
+    # The clients connect on the first operation, no server is needed
+    connect(MONGO_URL)
+    connect(ANALYTICS_URL, alias="analytics")
+    yield None
+    disconnect(raise_error=False, alias="analytics")
+    disconnect(raise_error=False)
+
+
+@pytest.mark.usefixtures("connections")
+def test_connections_are_separated():
+    assert get_connection_aliases() == ["default", "analytics"]
+    assert get_client("analytics") is not get_client()
+    assert db(alias="analytics").name == "analytics"
+
+    with pytest.raises(InvalidConnection):
+        db("logging", alias="analytics")
+
+
+@pytest.mark.usefixtures("connections")
+def test_model_uses_its_connection():
+    assert EventModel._connection_alias() == "analytics"
+
+    collection = EventModel._get_collection()
+    assert collection.database.client is get_client("analytics")
+    assert collection.database.name == "analytics"
+
+
+def test_disconnect_alias():
+    connect(ANALYTICS_URL, alias="analytics")
+    assert get_connection_aliases() == ["analytics"]
+
+    disconnect(alias="analytics")
+    assert get_connection_aliases() == []
+    with pytest.raises(ConnectionError) as exc_info:
+        get_client("analytics")
+    assert "analytics" in str(exc_info.value)
+
+
+def test_disconnect_alias_keeps_the_other_connections():
+    connect(MONGO_URL)
+    connect(ANALYTICS_URL, alias="analytics")
+    default_buffer = WriteBuffer(DefaultModel)
+    analytics_buffer = WriteBuffer(EventModel)
+    try:
+        DefaultModel._get_collection()
+        EventModel._get_collection()
+
+        with patch.object(WriteBuffer, "_drain"):
+            disconnect(alias="analytics")
+
+        aliases = {key[1] for key in _cashed_collection_handles}
+        assert aliases == {"default"}
+        assert analytics_buffer.closed is True
+        assert default_buffer.closed is False
+    finally:
+        with patch.object(WriteBuffer, "_drain"):
+            default_buffer.close()
+            analytics_buffer.close()
+        disconnect()
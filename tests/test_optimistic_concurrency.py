@@ -0,0 +1,129 @@
+from typing import Optional
+
+import pytest
+from mongodb_odm import Document, Field, retry_on_conflict
+from mongodb_odm.exceptions import VersionConflictError
+
+from tests.conftest import INIT_CONFIG
+
+
+class Account(Document):
+    owner: str = Field(...)
+    balance: int = 0
+    note: Optional[str] = None
+
+    class ODMConfig(Document.ODMConfig):
+        collection_name = "test_account"
+        version_field = "_v"
+
+
+def test_versioned_object_initialization():
+    account = Account(owner="one", _v=5)
+    assert account._version == 5
+
+    account = Account(owner="one")
+    assert account._version is None
+
+    data = account._prepare_crate_data()
+    assert data["_v"] == 1, "New documents should start with the first version"
+    assert account._version == 1
+
+
+def test_update_dict_increases_version():
+    account = Account(owner="one", _v=2)
+
+    assert account._get_update_filter() == {"_id": account.id, "_v": 2}
+
+    updated_data = account._get_update_dict({"$inc": {"balance": 10}})
+    assert updated_data["$inc"] == {"balance": 10, "_v": 1}
+
+
+def test_retry_on_conflict():
+    calls = []
+
+    @retry_on_conflict(max_retries=2, backoff=0)
+    def conflicting_update():
+        calls.append(1)
+        if len(calls) < 3:
+            raise VersionConflictError()
+        return "done"
+
+    assert conflicting_update() == "done"
+    assert len(calls) == 3
+
+
+def test_retry_on_conflict_raises_after_max_retries():
+    calls = []
+
+    @retry_on_conflict(max_retries=1, backoff=0)
+    def always_conflicting_update():
+        calls.append(1)
+        raise VersionConflictError()
+
+    with pytest.raises(VersionConflictError):
+        always_conflicting_update()
+
+    assert len(calls) == 2
+
+
+@pytest.mark.usefixtures(INIT_CONFIG)
+def test_update_with_version():
+    account = Account(owner="one").create()
+
+    account.balance = 10
+    account.update()
+    assert account._version == 2
+
+    db_account = Account.get({Account.id: account.id})
+    assert db_account._version == 2
+    assert db_account.balance == 10
+
+
+@pytest.mark.usefixtures(INIT_CONFIG)
+def test_concurrent_update_conflict():
+    account = Account(owner="one").create()
+
+    first = Account.get({Account.id: account.id})
+    second = Account.get({Account.id: account.id})
+
+    first.balance = 10
+    first.update()
+
+    second.balance = 20
+    with pytest.raises(VersionConflictError):
+        second.update()
+
+    assert Account.get({Account.id: account.id}).balance == 10
+
+
+@pytest.mark.usefixtures(INIT_CONFIG)
+def test_update_document_without_version():
+    account = Account(owner="one").create()
+    Account.update_one({Account.id: account.id}, {"$unset": {"_v": ""}})
+
+    legacy_account = Account.get({Account.id: account.id})
+    assert legacy_account._version is None
+
+    legacy_account.update({"$set": {Account.note: "legacy"}})
+    assert Account.get({Account.id: account.id})._version == 1
+
+
+@pytest.mark.usefixtures(INIT_CONFIG)
+def test_retry_on_conflict_with_database():
+    account = Account(owner="one").create()
+    stale_account = Account.get({Account.id: account.id})
+    account.update({"$inc": {Account.balance: 5}})
+
+    @retry_on_conflict(backoff=0)
+    def deposit(amount):
+        nonlocal stale_account
+        stale_account.balance += amount
+        try:
+            stale_account.update()
+        finally:
+            # Reload the latest version for the next attempt
+            stale_account = Account.get({Account.id: account.id})
+
+    deposit(10)
+
+    assert Account.get({Account.id: account.id}).balance == 15
@@ -0,0 +1,50 @@
+import pytest
+from mongodb_odm import retry_on_conflict
+from mongodb_odm.exceptions import VersionConflictError
+
+from tests.conftest import ASYNC_INIT_CONFIG
+from tests.test_optimistic_concurrency import Account
+
+
+async def test_async_retry_on_conflict():
+    calls = []
+
+    @retry_on_conflict(max_retries=2, backoff=0)
+    async def conflicting_update():
+        calls.append(1)
+        if len(calls) < 3:
+            raise VersionConflictError()
+        return "done"
+
+    assert await conflicting_update() == "done"
+    assert len(calls) == 3
+
+
+@pytest.mark.usefixtures(ASYNC_INIT_CONFIG)
+async def test_aupdate_with_version():
+    account = await Account(owner="one").acreate()
+
+    account.balance = 10
+    await account.aupdate()
+    assert account._version == 2
+
+    db_account = await Account.aget({Account.id: account.id})
+    assert db_account._version == 2
+    assert db_account.balance == 10
+
+
+@pytest.mark.usefixtures(ASYNC_INIT_CONFIG)
+async def test_concurrent_aupdate_conflict():
+    account = await Account(owner="one").acreate()
+
+    first = await Account.aget({Account.id: account.id})
+    second = await Account.aget({Account.id: account.id})
+
+    first.balance = 10
+    await first.aupdate()
+
+    second.balance = 20
+    with pytest.raises(VersionConflictError):
+        await second.aupdate()
+
+    assert (await Account.aget({Account.id: account.id})).balance == 10
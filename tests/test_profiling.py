@@ -0,0 +1,156 @@
+import threading
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from bson import ObjectId
+from mongodb_odm import Document, Field, adisconnect, connect, disconnect
+from mongodb_odm.utils.profiling import (
+    PHASE_HYDRATION,
+    PHASE_NETWORK,
+    PHASE_SERIALIZATION,
+    PHASE_VALIDATION,
+    get_profile_registry,
+    is_profiling,
+    profile,
+    time_phase,
+)
+
+from tests.constants import MONGO_URL
+from tests.utils import AsyncCursor
+
+
+class ProfiledModel(Document):
+    title: str = Field(...)
+
+    class ODMConfig(Document.ODMConfig):
+        collection_name = "test_profiling"
+
+
+DOCUMENTS = [{"_id": ObjectId(), "title": "a"}, {"_id": ObjectId(), "title": "b"}]
+
+
+@pytest.fixture()
+def connection():
+    # The client connects on the first operation, no server is needed
+    connect(MONGO_URL)
+    yield None
+    disconnect()
+
+
+def test_profiling_is_disabled_by_default():
+    assert is_profiling() is False
+    assert time_phase(ProfiledModel, "find", PHASE_NETWORK) is time_phase(
+        ProfiledModel, "find_one", PHASE_NETWORK
+    )
+
+
+def test_profile_find(connection):
+    with patch(
+        "pymongo.synchronous.collection.Collection.find", return_value=DOCUMENTS
+    ):
+        with profile() as report:
+            assert is_profiling()
+            objs = list(ProfiledModel.find({"title": {"$ne": "c"}}))
+
+    assert [obj.title for obj in objs] == ["a", "b"]
+    assert not is_profiling()
+    (validation,) = report.get_timings("ProfiledModel", "find", PHASE_VALIDATION)
+    assert validation.calls == 1 and validation.total_ns > 0
+    (hydration,) = report.get_timings("ProfiledModel", "find", PHASE_HYDRATION)
+    assert hydration.calls == 2
+    # Two documents and the end of the cursor
+    (network,) = report.get_timings("ProfiledModel", "find", PHASE_NETWORK)
+    assert network.calls == 3
+    assert "ProfiledModel.find: validation" in str(report)
+
+
+def test_profile_create(connection):
+    obj = ProfiledModel(title="a")
+    with patch("pymongo.synchronous.collection.Collection.insert_one") as mock_insert:
+        mock_insert.return_value.inserted_id = ObjectId()
+        with profile() as report:
+            obj.create()
+
+    assert report.get_total_ns("ProfiledModel", "create", PHASE_SERIALIZATION) > 0
+    assert report.get_total_ns("ProfiledModel", "create", PHASE_NETWORK) > 0
+    assert report.get_timings(phase=PHASE_HYDRATION) == []
+
+
+def test_nested_profiles(connection):
+    with patch("pymongo.synchronous.collection.Collection.update_many"):
+        with profile() as outer:
+            ProfiledModel.update_many({}, {"$set": {"title": "a"}})
+            with profile() as inner:
+                ProfiledModel.update_many({}, {"$set": {"title": "b"}})
+
+    assert len(outer.get_timings("ProfiledModel", "update_many")) == 2
+    assert outer.get_timings(phase=PHASE_NETWORK)[0].calls == 2
+    assert inner.get_timings(phase=PHASE_NETWORK)[0].calls == 1
+
+
+def test_profile_ignores_other_threads(connection):
+    def count() -> None:
+        ProfiledModel.count_documents({})
+
+    with patch(
+        "pymongo.synchronous.collection.Collection.count_documents", return_value=0
+    ):
+        with profile() as report:
+            thread = threading.Thread(target=count)
+            thread.start()
+            thread.join()
+
+    assert report.get_timings() == []
+
+
+def test_profile_registry(connection):
+    registry = get_profile_registry()
+    registry.enable()
+    try:
+        with patch(
+            "pymongo.synchronous.collection.Collection.count_documents",
+            return_value=0,
+        ):
+            ProfiledModel.count_documents({})
+            ProfiledModel.count_documents({})
+        assert is_profiling()
+    finally:
+        registry.disable()
+
+    (network,) = registry.get_timings("ProfiledModel", "count_documents", PHASE_NETWORK)
+    assert network.calls == 2
+    registry.clear()
+    assert registry.get_timings() == []
+
+
+async def test_profile_afind():
+    connect(MONGO_URL, async_is_enabled=True)
+    try:
+        with patch(
+            "pymongo.asynchronous.collection.AsyncCollection.find",
+            return_value=AsyncCursor(DOCUMENTS),
+        ):
+            with profile() as report:
+                objs = [obj async for obj in ProfiledModel.afind()]
+    finally:
+        await adisconnect()
+
+    assert len(objs) == 2
+    assert report.get_timings("ProfiledModel", "afind", PHASE_HYDRATION)[0].calls == 2
+    assert report.get_total_ns("ProfiledModel", "afind", PHASE_NETWORK) > 0
+
+
+async def test_profile_acount_documents():
+    connect(MONGO_URL, async_is_enabled=True)
+    try:
+        with patch(
+            "pymongo.asynchronous.collection.AsyncCollection.count_documents",
+            new_callable=AsyncMock,
+            return_value=3,
+        ):
+            with profile() as report:
+                assert await ProfiledModel.acount_documents() == 3
+    finally:
+        await adisconnect()
+
+    assert report.get_total_ns("ProfiledModel", "acount_documents") > 0
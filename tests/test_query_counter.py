@@ -0,0 +1,153 @@
+import threading
+
+import pytest
+from mongodb_odm import connect, disconnect
+from mongodb_odm.connection import db
+from mongodb_odm.exceptions import InvalidAction, QueryBudgetExceeded
+from mongodb_odm.utils.query_counter import (
+    _get_model_name,
+    get_query_counter_listener,
+    odm_query_counter,
+)
+from pymongo import monitoring
+
+from tests.constants import CONNECTION_POOL_PARAMS, MONGO_URL
+from tests.models.course import Comment
+from tests.utils import populate_data
+
+ADDRESS = ("localhost", 27017)
+
+
+@pytest.fixture()
+def connection():
+    # The client connects on the first operation, no server is needed
+    connect(MONGO_URL, query_counter=True)
+    yield None
+    disconnect()
+
+
+@pytest.fixture()
+def query_counter_config():
+    connect(MONGO_URL, connection_kwargs=CONNECTION_POOL_PARAMS, query_counter=True)
+    db().command("dropDatabase")
+    yield None
+    db().command("dropDatabase")
+    disconnect()
+
+
+def start_command(command: dict, request_id: int = 1) -> None:
+    get_query_counter_listener().started(
+        monitoring.CommandStartedEvent(command, "testdb", request_id, ADDRESS, 1)
+    )
+
+
+def test_counter_needs_the_listener():
+    connect(MONGO_URL)
+    try:
+        with pytest.raises(InvalidAction):
+            with odm_query_counter():
+                pass
+    finally:
+        disconnect()
+
+
+def test_count_queries(connection):
+    with odm_query_counter() as counter:
+        start_command({"find": "comment", "filter": {}})
+        start_command({"getMore": 1, "collection": "comment"})
+        start_command({"find": "user", "filter": {}})
+        start_command({"aggregate": "unknown_collection", "pipeline": []})
+        start_command({"hello": 1})
+        with odm_query_counter() as inner:
+            start_command({"insert": "course", "documents": []})
+
+    # Not counted outside the block
+    start_command({"find": "comment", "filter": {}})
+
+    assert counter.total == 5
+    assert counter.get_count("Comment") == 2
+    assert counter.get_count("Comment", "getMore") == 1
+    assert counter.get_count("User", "find") == 1
+    assert counter.get_count(None, "aggregate") == 1
+    assert inner.total == 1 and inner.get_count("Course", "insert") == 1
+    assert "Comment.find: 1" in str(counter)
+
+
+def test_count_inherited_models(connection):
+    # ContentDescription and ContentImage share the collection of Content
+    with odm_query_counter() as counter:
+        start_command({"find": "content", "filter": {"_cls": "ContentImage"}})
+
+    assert counter.get_count("Content", "find") == 1
+
+
+def test_model_names_are_cached(connection):
+    with odm_query_counter():
+        start_command({"find": "comment"})
+        start_command({"find": "comment"})
+    assert _get_model_name.cache_info().hits >= 1
+
+    disconnect()
+    assert _get_model_name.cache_info().currsize == 0
+
+    connect(MONGO_URL, query_counter=True)
+    with odm_query_counter():
+        start_command({"find": "comment"})
+    assert _get_model_name.cache_info().currsize == 1
+
+    connect(MONGO_URL, alias="other")
+    assert _get_model_name.cache_info().currsize == 0
+
+    with odm_query_counter():
+        start_command({"find": "comment"})
+    assert _get_model_name.cache_info().currsize == 1
+    disconnect(alias="other")
+    assert _get_model_name.cache_info().currsize == 0
+
+
+def test_query_budget(connection, caplog):
+    with pytest.raises(QueryBudgetExceeded):
+        with odm_query_counter(max_queries=1):
+            start_command({"find": "comment"})
+            start_command({"find": "user"})
+
+    with odm_query_counter(max_queries=1, raise_error=False) as counter:
+        start_command({"find": "comment"})
+        start_command({"find": "user"})
+    assert counter.is_over_budget
+    assert "2 queries were made, the budget is 1" in caplog.text
+
+    # The error of the block is not replaced
+    with pytest.raises(ValueError):
+        with odm_query_counter(max_queries=0):
+            start_command({"find": "comment"})
+            raise ValueError()
+
+
+def test_other_threads_are_not_counted(connection):
+    with odm_query_counter() as counter:
+        thread = threading.Thread(target=start_command, args=({"find": "comment"},))
+        thread.start()
+        thread.join()
+
+    assert counter.total == 0
+
+
+async def test_async_query_counter(connection):
+    async with odm_query_counter(max_queries=1) as counter:
+        start_command({"find": "comment"})
+
+    assert counter.total == 1
+
+
+def test_load_related_query_budget(query_counter_config):
+    populate_data()
+
+    # One query for the comments and one for each relationship
+    with odm_query_counter(max_queries=3) as counter:
+        comments = list(Comment.load_related(Comment.find()))
+
+    assert len(comments) > 1
+    assert counter.get_count("Comment", "find") == 1
+    assert counter.get_count("User", "find") == 1
+    assert counter.get_count("Course", "find") == 1
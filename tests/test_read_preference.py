@@ -0,0 +1,115 @@
+from typing import Any, Optional
+from unittest.mock import MagicMock, patch
+
+import pytest
+from mongodb_odm import Document, Field, connect, disconnect
+from mongodb_odm.exceptions import InvalidConfiguration
+from mongodb_odm.utils.collection_options import (
+    get_collection_options,
+    get_read_preference,
+)
+from pymongo import ReadPreference
+
+from tests.conftest import INIT_CONFIG
+from tests.constants import MONGO_URL
+
+
+class ReportModel(Document):
+    title: str = Field(...)
+    author: Optional[str] = None
+
+    class ODMConfig(Document.ODMConfig):
+        collection_name = "test_read_preference"
+        read_preference = "secondaryPreferred"
+        max_staleness_seconds = 120
+        read_preference_tags = [{"dc": "analytics"}, {}]
+
+
+class PrimaryModel(Document):
+    title: str = Field(...)
+
+    class ODMConfig(Document.ODMConfig):
+        collection_name = "test_read_preference_primary"
+
+
+@pytest.fixture()
+def lazy_connection():
+    # The client connects on the first operation, no server is needed
+    connect(MONGO_URL)
+    yield None
+    disconnect()
+
+
+def test_get_read_preference():
+    read_preference = get_read_preference("secondary", 90, [{"dc": "a"}])
+    assert read_preference.document == {
+        "mode": "secondary",
+        "tags": [{"dc": "a"}],
+        "maxStalenessSeconds": 90,
+    }
+    assert get_read_preference(ReadPreference.NEAREST) is ReadPreference.NEAREST
+
+    with pytest.raises(InvalidConfiguration):
+        get_read_preference("unknown")
+    with pytest.raises(InvalidConfiguration):
+        get_read_preference("primary", tags=[{"dc": "a"}])
+
+
+def test_collection_options():
+    options = get_collection_options(ReportModel)
+    assert options["read_preference"].document == {
+        "mode": "secondaryPreferred",
+        "tags": [{"dc": "analytics"}, {}],
+        "maxStalenessSeconds": 120,
+    }
+    assert get_collection_options(PrimaryModel) == {}
+
+    # Not a Document subclass to keep it out of apply_indexes()
+    class InvalidModel:
+        class ODMConfig(Document.ODMConfig):
+            max_staleness_seconds = 120
+
+    with pytest.raises(InvalidConfiguration):
+        get_collection_options(InvalidModel)
+
+
+@pytest.mark.usefixtures("lazy_connection")
+def test_collection_handles_are_cached():
+    collection = ReportModel._get_collection()
+    assert collection.read_preference.mode == ReadPreference.SECONDARY_PREFERRED.mode
+    assert collection is ReportModel._get_collection()
+
+    override = ReportModel._get_collection(read_preference="primary")
+    assert override.read_preference == ReadPreference.PRIMARY
+    assert override is ReportModel._get_collection(
+        read_preference=ReadPreference.PRIMARY
+    )
+    assert override is not collection
+
+    assert PrimaryModel._get_collection().read_preference == ReadPreference.PRIMARY
+
+
+@pytest.mark.usefixtures("lazy_connection")
+def test_batch_ids_are_read_from_primary():
+    read_preferences: list[Any] = []
+
+    def find(self: Any, *args: Any, **kwargs: Any) -> MagicMock:
+        read_preferences.append(self.read_preference)
+        cursor = MagicMock()
+        cursor.sort.return_value.limit.return_value = []
+        return cursor
+
+    with patch("pymongo.synchronous.collection.Collection.find", find):
+        progress = ReportModel.update_in_batches({}, {"$set": {"title": "Hi"}})
+
+    assert progress.last_id is None
+    assert read_preferences == [ReadPreference.PRIMARY]
+
+
+@pytest.mark.usefixtures(INIT_CONFIG)
+def test_reads_with_read_preference():
+    PrimaryModel(title="Hello").create()
+
+    assert PrimaryModel.count_documents({}, read_preference="primaryPreferred") == 1
+    assert PrimaryModel.find_one({}, read_preference="nearest") is not None
+    assert len(list(PrimaryModel.aggregate([], read_preference="nearest"))) == 1
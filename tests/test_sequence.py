@@ -0,0 +1,115 @@
+import threading
+from typing import Optional
+from unittest.mock import MagicMock, patch
+
+import pytest
+from mongodb_odm import Document, FieldSequence, WriteBuffer
+from mongodb_odm.exceptions import InvalidConfiguration
+
+from tests.conftest import INIT_CONFIG
+
+
+class Invoice(Document):
+    number: Optional[int] = None
+    description: Optional[str] = None
+
+    class ODMConfig(Document.ODMConfig):
+        collection_name = "test_invoice"
+        sequences = [FieldSequence("number", block_size=10)]
+
+
+def get_counter_collection_mock():
+    counters = {}
+    lock = threading.Lock()
+
+    def find_one_and_update(filter, update, **kwargs):
+        with lock:
+            key = filter["_id"]
+            counters[key] = counters.get(key, 0) + update["$inc"]["value"]
+            return {"_id": key, "value": counters[key]}
+
+    collection = MagicMock()
+    collection.find_one_and_update.side_effect = find_one_and_update
+    return collection
+
+
+def test_invalid_block_size():
+    with pytest.raises(ValueError):
+        FieldSequence("number", block_size=0)
+
+
+def test_sequence_reserves_blocks():
+    sequence = FieldSequence("number", block_size=5)
+    collection = get_counter_collection_mock()
+
+    with patch(
+        "mongodb_odm.utils.sequence.db", return_value={"odm_counters": collection}
+    ):
+        values = [sequence.next_value(Invoice) for _ in range(12)]
+
+    assert values == list(range(1, 13))
+    assert collection.find_one_and_update.call_count == 3, (
+        "Only one round trip should happen for each block"
+    )
+    assert sequence.get_name(Invoice) == "test_invoice.number"
+
+
+def test_sequence_is_thread_safe():
+    sequence = FieldSequence("number", block_size=7)
+    collection = get_counter_collection_mock()
+    values = []
+
+    def allocate():
+        for _ in range(50):
+            values.append(sequence.next_value(Invoice))
+
+    with patch(
+        "mongodb_odm.utils.sequence.db", return_value={"odm_counters": collection}
+    ):
+        threads = [threading.Thread(target=allocate) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert sorted(values) == list(range(1, 401)), "Values should be unique"
+
+
+def test_sequence_reset():
+    sequence = FieldSequence("number", block_size=5)
+    collection = get_counter_collection_mock()
+
+    with patch(
+        "mongodb_odm.utils.sequence.db", return_value={"odm_counters": collection}
+    ):
+        assert sequence.next_value(Invoice) == 1
+        sequence.reset()
+        assert sequence.next_value(Invoice) == 6, "The rest of the block is skipped"
+
+
+def test_invalid_sequence_field():
+    with pytest.raises(InvalidConfiguration):
+        Invoice.next_sequence_value("description")
+
+
+@pytest.mark.usefixtures(INIT_CONFIG)
+def test_create_assigns_sequence_value():
+    invoices = [Invoice(description=f"Invoice {i}").create() for i in range(15)]
+
+    assert [invoice.number for invoice in invoices] == list(range(1, 16))
+    assert Invoice.get({Invoice.number: 15}).description == "Invoice 14"
+
+    invoice = Invoice(number=1000).create()
+    assert invoice.number == 1000, "Assigned value should not be overwritten"
+    assert Invoice.next_sequence_value("number") == 16
+
+
+@pytest.mark.usefixtures(INIT_CONFIG)
+def test_write_buffer_assigns_sequence_value():
+    buffer = WriteBuffer(Invoice, flush_interval=60)
+    for i in range(3):
+        buffer.put(Invoice(description=f"Invoice {i}"))
+    buffer.close()
+
+    numbers = sorted(invoice.number for invoice in Invoice.find())
+    assert numbers == [1, 2, 3]
@@ -0,0 +1,39 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from mongodb_odm import FieldSequence
+
+from tests.conftest import ASYNC_INIT_CONFIG
+from tests.test_sequence import Invoice
+
+
+async def test_async_sequence_reserves_blocks_once():
+    sequence = FieldSequence("number", block_size=10)
+    counter = {"value": 0}
+
+    async def find_one_and_update(filter, update, **kwargs):
+        await asyncio.sleep(0)
+        counter["value"] += update["$inc"]["value"]
+        return {"_id": filter["_id"], "value": counter["value"]}
+
+    collection = AsyncMock()
+    collection.find_one_and_update.side_effect = find_one_and_update
+
+    with patch(
+        "mongodb_odm.utils.sequence.db", return_value={"odm_counters": collection}
+    ):
+        values = await asyncio.gather(
+            *[sequence.anext_value(Invoice) for _ in range(25)]
+        )
+
+    assert sorted(values) == list(range(1, 26))
+    assert collection.find_one_and_update.call_count == 3
+
+
+@pytest.mark.usefixtures(ASYNC_INIT_CONFIG)
+async def test_acreate_assigns_sequence_value():
+    invoices = [await Invoice(description=f"Invoice {i}").acreate() for i in range(15)]
+
+    assert [invoice.number for invoice in invoices] == list(range(1, 16))
+    assert await Invoice.anext_sequence_value("number") == 16
@@ -0,0 +1,88 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from mongodb_odm import ODMObjectId
+from mongodb_odm.utils.counters import ShardedCounter
+
+from tests.conftest import INIT_CONFIG
+from tests.models.course import Course
+
+
+def test_invalid_shards():
+    with pytest.raises(ValueError):
+        ShardedCounter(Course, "likes", shards=0)
+
+
+def test_sharded_counter_is_cached_per_model_and_field():
+    counter = Course.sharded_counter("likes")
+
+    assert Course.sharded_counter("likes") is counter
+    assert Course.sharded_counter("views") is not counter
+    assert counter.model is Course and counter.shards == 16
+
+
+def test_increment_goes_to_a_shard():
+    counter = ShardedCounter(Course, "likes", shards=4)
+    course_id = ODMObjectId()
+
+    filter, update = counter._get_increment_args(course_id, 3)
+
+    assert filter["_id"] in counter._get_shard_ids(course_id)
+    assert update == {"$inc": {"value": 3}}
+    assert counter._get_collection_name() == "course_counters"
+
+
+def test_aggregated_value_cache():
+    counter = ShardedCounter(Course, "likes", shards=4, cache_ttl=60)
+    course_id = ODMObjectId()
+
+    collection = MagicMock()
+    collection.find.return_value = [{"value": 2}, {"value": 3}]
+
+    with patch.object(ShardedCounter, "_get_collection", return_value=collection):
+        assert counter.get(course_id) == 5
+        assert counter.get(course_id) == 5
+        assert collection.find.call_count == 1, "Second read should hit the cache"
+
+        assert counter.get(course_id, use_cache=False) == 5
+        assert collection.find.call_count == 2
+
+
+def test_expired_values_are_evicted():
+    counter = ShardedCounter(Course, "likes", shards=4, cache_ttl=60)
+    course_ids = [ODMObjectId() for _ in range(3)]
+
+    with patch("time.monotonic", return_value=100):
+        counter._set_cache(course_ids[0], 1)
+        counter._set_cache(course_ids[1], 2)
+    with patch("time.monotonic", return_value=130):
+        # Refreshed entries expire last
+        counter._set_cache(course_ids[0], 3)
+        counter._set_cache(course_ids[2], 4)
+    with patch("time.monotonic", return_value=170):
+        assert counter._get_cached(course_ids[2]) == 4
+
+    assert list(counter._cache) == [course_ids[0], course_ids[2]]
+
+    with patch("time.monotonic", return_value=200):
+        assert counter._get_cached(course_ids[0]) is None
+    assert len(counter._cache) == 0
+
+
+@pytest.mark.usefixtures(INIT_CONFIG)
+def test_sharded_counter_increment_and_read():
+    counter = Course.sharded_counter("likes", shards=4)
+    course_id = ODMObjectId()
+    other_course_id = ODMObjectId()
+
+    for _ in range(20):
+        counter.incr(course_id)
+    counter.incr(course_id, amount=5)
+    counter.incr(other_course_id)
+
+    assert counter.get(course_id) == 25
+    assert counter.get(other_course_id) == 1
+    assert Course.sharded_counter("views").get(course_id) == 0
+
+    counter.reset(course_id)
+    assert counter.get(course_id) == 0
@@ -0,0 +1,20 @@
+import asyncio
+
+import pytest
+from mongodb_odm import ODMObjectId
+
+from tests.conftest import ASYNC_INIT_CONFIG
+from tests.models.course import Course
+
+
+@pytest.mark.usefixtures(ASYNC_INIT_CONFIG)
+async def test_async_sharded_counter_increment_and_read():
+    counter = Course.sharded_counter("likes", shards=4)
+    course_id = ODMObjectId()
+
+    await asyncio.gather(*[counter.aincr(course_id) for _ in range(20)])
+
+    assert await counter.aget(course_id) == 20
+
+    await counter.areset(course_id)
+    assert await counter.aget(course_id) == 0
@@ -0,0 +1,255 @@
+import logging
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from bson import ObjectId
+from mongodb_odm import Document, Field, UpdateOne, adisconnect, connect, disconnect
+from mongodb_odm.exceptions import InvalidConfiguration
+from mongodb_odm.utils.slow_query import (
+    SlowQuery,
+    disable_slow_query_log,
+    enable_slow_query_log,
+    get_pipeline_filter,
+)
+from pymongo.errors import ExecutionTimeout
+from pymongo.results import BulkWriteResult, UpdateResult
+
+from tests.constants import MONGO_URL
+from tests.utils import AsyncCursor
+
+DOCUMENTS = [{"_id": ObjectId(), "title": "a"}, {"_id": ObjectId(), "title": "b"}]
+
+
+class SlowModel(Document):
+    title: str = Field(...)
+
+    class ODMConfig(Document.ODMConfig):
+        collection_name = "test_slow_query"
+
+
+@pytest.fixture()
+def connection():
+    # The client connects on the first operation, no server is needed
+    connect(MONGO_URL)
+    yield None
+    disconnect()
+    disable_slow_query_log()
+
+
+def get_slow_queries(caplog: pytest.LogCaptureFixture) -> list[SlowQuery]:
+    return [record.slow_query for record in caplog.records]  # type: ignore
+
+
+def test_enable_slow_query_log_validation():
+    with pytest.raises(InvalidConfiguration):
+        enable_slow_query_log(threshold_ms=-1)
+    with pytest.raises(InvalidConfiguration):
+        enable_slow_query_log(sample_rate=0)
+
+
+def test_get_pipeline_filter():
+    assert get_pipeline_filter([{"$match": {"a": 1}}, {"$limit": 1}]) == {"a": 1}
+    assert get_pipeline_filter([{"$limit": 1}]) is None
+    assert get_pipeline_filter([]) is None
+
+
+def test_log_slow_find(connection, caplog):
+    enable_slow_query_log(threshold_ms=0)
+    with patch("pymongo.synchronous.collection.Collection.find") as mock_find:
+        mock_find.return_value.sort.return_value = DOCUMENTS
+        with caplog.at_level(logging.WARNING, logger="mongodb_odm"):
+            objs = list(
+                SlowModel.find(
+                    {"title": {"$in": ["a", "b"]}},
+                    projection={"title": 1},
+                    sort=[("title", 1)],
+                )
+            )
+
+    assert len(objs) == 2
+    (slow_query,) = get_slow_queries(caplog)
+    assert slow_query.model_name == "SlowModel"
+    assert slow_query.operation == "find"
+    assert slow_query.filter == {"title": {"$in": "?"}}
+    assert slow_query.sort == [("title", 1)]
+    assert slow_query.projection == {"title": 1}
+    assert slow_query.documents == 2
+    assert slow_query.call_site is not None
+    assert slow_query.call_site.startswith(__file__)
+    assert "Slow query SlowModel.find" in caplog.text
+
+
+def test_ignore_fast_and_unfinished_queries(connection, caplog):
+    enable_slow_query_log(threshold_ms=60_000)
+    with patch(
+        "pymongo.synchronous.collection.Collection.find", return_value=DOCUMENTS
+    ):
+        with caplog.at_level(logging.WARNING, logger="mongodb_odm"):
+            list(SlowModel.find())
+            enable_slow_query_log(threshold_ms=0)
+            # Only logged once the cursor is exhausted
+            next(SlowModel.find())
+
+    assert caplog.records == []
+
+
+def test_sampling(connection, caplog):
+    enable_slow_query_log(threshold_ms=0, sample_rate=0.5)
+    with patch(
+        "pymongo.synchronous.collection.Collection.find", return_value=DOCUMENTS
+    ):
+        with caplog.at_level(logging.WARNING, logger="mongodb_odm"):
+            with patch("random.random", return_value=0.7):
+                list(SlowModel.find())
+            with patch("random.random", return_value=0.2):
+                list(SlowModel.find())
+
+    assert len(get_slow_queries(caplog)) == 1
+
+
+def test_log_slow_writes(connection, caplog):
+    enable_slow_query_log(threshold_ms=0, level=logging.INFO)
+    update_result = UpdateResult({"n": 3, "nModified": 2}, acknowledged=True)
+    bulk_result = BulkWriteResult(
+        {"nInserted": 1, "nUpserted": 0, "nMatched": 1, "nModified": 1, "nRemoved": 2},
+        acknowledged=True,
+    )
+    with (
+        patch(
+            "pymongo.synchronous.collection.Collection.update_many",
+            return_value=update_result,
+        ),
+        patch(
+            "pymongo.synchronous.collection.Collection.bulk_write",
+            return_value=bulk_result,
+        ),
+    ):
+        with caplog.at_level(logging.INFO, logger="mongodb_odm"):
+            SlowModel.update_many({"title": "a"}, {"$set": {"title": "b"}})
+            SlowModel.bulk_write([UpdateOne({"title": "a"}, {"$set": {"title": "b"}})])
+
+    update_many, bulk_write = get_slow_queries(caplog)
+    assert (update_many.operation, update_many.documents) == ("update_many", 2)
+    assert update_many.filter == {"title": "?"}
+    assert (bulk_write.operation, bulk_write.documents) == ("bulk_write", 4)
+    assert caplog.records[0].levelno == logging.INFO
+    # Not the frames of contextlib that run the exit of log_slow_query()
+    for slow_query in (update_many, bulk_write):
+        assert slow_query.call_site is not None
+        assert slow_query.call_site.startswith(__file__)
+
+
+def test_log_slow_aggregate(connection, caplog):
+    enable_slow_query_log(threshold_ms=0)
+    with patch(
+        "pymongo.synchronous.collection.Collection.aggregate",
+        return_value=iter(DOCUMENTS),
+    ):
+        with caplog.at_level(logging.WARNING, logger="mongodb_odm"):
+            list(SlowModel.aggregate([{"$match": {"title": "a"}}], get_raw=True))
+
+    (slow_query,) = get_slow_queries(caplog)
+    assert slow_query.operation == "aggregate"
+    assert slow_query.filter == {"title": "?"}
+    assert slow_query.documents == 2
+
+
+def test_log_failed_queries(connection, caplog):
+    def cursor():
+        yield DOCUMENTS[0]
+        raise ExecutionTimeout("operation exceeded time limit")
+
+    enable_slow_query_log(threshold_ms=0)
+    with (
+        patch(
+            "pymongo.synchronous.collection.Collection.update_many",
+            side_effect=ExecutionTimeout("operation exceeded time limit"),
+        ),
+        patch(
+            "pymongo.synchronous.collection.Collection.aggregate",
+            return_value=cursor(),
+        ),
+    ):
+        with caplog.at_level(logging.WARNING, logger="mongodb_odm"):
+            with pytest.raises(ExecutionTimeout):
+                SlowModel.update_many({"title": "a"}, {"$set": {"title": "b"}})
+            with pytest.raises(ExecutionTimeout):
+                list(SlowModel.aggregate([{"$match": {"title": "a"}}], get_raw=True))
+
+    update_many, aggregate = get_slow_queries(caplog)
+    assert (update_many.operation, update_many.error) == (
+        "update_many",
+        "ExecutionTimeout",
+    )
+    assert update_many.documents == 0
+    assert (aggregate.operation, aggregate.error) == ("aggregate", "ExecutionTimeout")
+    assert aggregate.documents == 1
+    assert "error=ExecutionTimeout" in caplog.text
+
+
+async def test_log_slow_afind(caplog):
+    connect(MONGO_URL, async_is_enabled=True)
+    enable_slow_query_log(threshold_ms=0)
+    try:
+        with patch(
+            "pymongo.asynchronous.collection.AsyncCollection.find",
+            return_value=AsyncCursor(DOCUMENTS),
+        ):
+            with caplog.at_level(logging.WARNING, logger="mongodb_odm"):
+                objs = [obj async for obj in SlowModel.afind({"title": "a"})]
+    finally:
+        disable_slow_query_log()
+        await adisconnect()
+
+    assert len(objs) == 2
+    (slow_query,) = get_slow_queries(caplog)
+    assert slow_query.documents == 2
+    assert slow_query.call_site is not None
+    assert slow_query.call_site.startswith(__file__)
+
+
+async def test_log_slow_aupdate_many(caplog):
+    connect(MONGO_URL, async_is_enabled=True)
+    enable_slow_query_log(threshold_ms=0)
+    try:
+        with patch(
+            "pymongo.asynchronous.collection.AsyncCollection.update_many",
+            new_callable=AsyncMock,
+            return_value=UpdateResult({"n": 1, "nModified": 1}, acknowledged=False),
+        ):
+            with caplog.at_level(logging.WARNING, logger="mongodb_odm"):
+                await SlowModel.aupdate_many({}, {"$set": {"title": "b"}})
+    finally:
+        disable_slow_query_log()
+        await adisconnect()
+
+    # Unacknowledged writes don't report counts
+    (slow_query,) = get_slow_queries(caplog)
+    assert slow_query.documents == 0
+
+
+async def test_log_failed_abulk_write(caplog):
+    connect(MONGO_URL, async_is_enabled=True)
+    enable_slow_query_log(threshold_ms=0)
+    try:
+        with patch(
+            "pymongo.asynchronous.collection.AsyncCollection.bulk_write",
+            new_callable=AsyncMock,
+            side_effect=ExecutionTimeout("operation exceeded time limit"),
+        ):
+            with caplog.at_level(logging.WARNING, logger="mongodb_odm"):
+                with pytest.raises(ExecutionTimeout):
+                    await SlowModel.abulk_write(
+                        [UpdateOne({"title": "a"}, {"$set": {"title": "b"}})]
+                    )
+    finally:
+        disable_slow_query_log()
+        await adisconnect()
+
+    (slow_query,) = get_slow_queries(caplog)
+    assert (slow_query.operation, slow_query.error) == (
+        "bulk_write",
+        "ExecutionTimeout",
+    )
+    assert slow_query.call_site is not None
+    assert slow_query.call_site.startswith(__file__)
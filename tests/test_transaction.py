@@ -1,10 +1,12 @@
+import asyncio
 from time import sleep
 from uuid import uuid4
 
 import pytest
-from mongodb_odm import ODMObjectId
+from mongodb_odm import ODMObjectId, atransaction, transaction
 from mongodb_odm.exceptions import InvalidConfiguration
 from mongodb_odm.models import Document
+from mongodb_odm.utils.transaction import get_current_session
 from pymongo.errors import OperationFailure
 
 from tests.conftest import INIT_CONFIG
@@ -88,3 +90,90 @@ def test_try_to_open_transaction_with_async_connection():
     assert type(exc_info.value) is InvalidConfiguration, (
         "Should raise InvalidConfiguration when trying to open a transaction with async connection"
     )
+
+
+@pytest.mark.usefixtures(INIT_CONFIG)
+def test_transaction_context_manager_binds_session():
+    author_id = ODMObjectId()
+
+    with transaction() as session:
+        assert get_current_session() is session
+        Course(author_id=author_id, title="Course Title").create()
+
+        # Read your own writes inside the transaction without passing the session
+        assert Course.count_documents({Course.author_id: author_id}) == 1
+
+    assert get_current_session() is None
+    assert Course.find_one({Course.author_id: author_id}) is not None
+
+
+@pytest.mark.usefixtures(INIT_CONFIG)
+def test_transaction_context_manager_rollback():
+    author_id = ODMObjectId()
+
+    with pytest.raises(ValueError):
+        with transaction():
+            Course(author_id=author_id, title="Course Title").create()
+            raise ValueError("Custom error on transaction")
+
+    assert Course.find_one({Course.author_id: author_id}) is None
+
+
+@pytest.mark.usefixtures(INIT_CONFIG)
+def test_transaction_decorator_retry_transient_error():
+    author_id = ODMObjectId()
+    attempts = []
+
+    @transaction(max_retries=2, backoff=0)
+    def create_course():
+        attempts.append(1)
+        Course(author_id=author_id, title=f"Course {len(attempts)}").create()
+        if len(attempts) < 2:
+            raise OperationFailure(
+                "Transient error",
+                details={"errorLabels": ["TransientTransactionError"]},
+            )
+
+    create_course()
+
+    assert len(attempts) == 2
+    courses = list(Course.find({Course.author_id: author_id}))
+    assert len(courses) == 1, "Only the last attempt should be committed"
+    assert courses[0].title == "Course 2"
+
+
+@pytest.mark.usefixtures(INIT_CONFIG)
+def test_nested_transaction_joins_outer_transaction():
+    author_id = ODMObjectId()
+
+    @transaction
+    def create_course(title):
+        Course(author_id=author_id, title=title).create()
+
+    with pytest.raises(ValueError):
+        with transaction() as session:
+            create_course("one")
+            with transaction() as inner_session:
+                assert inner_session is session
+                create_course("two")
+            raise ValueError("Custom error on transaction")
+
+    assert Course.count_documents({Course.author_id: author_id}) == 0
+
+
+@pytest.mark.usefixtures(INIT_CONFIG)
+def test_try_to_open_atransaction_with_sync_connection():
+    @atransaction
+    async def create_course():
+        pass
+
+    with pytest.raises(InvalidConfiguration):
+        asyncio.run(create_course())
+
+
+def test_atransaction_decorate_sync_function():
+    with pytest.raises(InvalidConfiguration):
+
+        @atransaction
+        def create_course():
+            pass
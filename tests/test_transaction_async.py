@@ -2,9 +2,10 @@ from time import sleep
 from uuid import uuid4
 
 import pytest
-from mongodb_odm import ODMObjectId
+from mongodb_odm import ODMObjectId, atransaction, transaction
 from mongodb_odm.exceptions import InvalidConfiguration
 from mongodb_odm.models import Document
+from mongodb_odm.utils.transaction import get_current_session
 from pymongo.errors import OperationFailure
 
 from tests.conftest import ASYNC_INIT_CONFIG
@@ -89,3 +90,58 @@ async def test_try_to_open_transaction_with_sync_connection():
     assert type(exc_info.value) is InvalidConfiguration, (
         "Should raise InvalidConfiguration when trying to open a transaction with async connection"
     )
+
+
+@pytest.mark.usefixtures(ASYNC_INIT_CONFIG)
+async def test_atransaction_context_manager_binds_session():
+    author_id = ODMObjectId()
+
+    async with atransaction() as session:
+        assert get_current_session() is session
+        await Course(author_id=author_id, title="Course Title").acreate()
+
+        # Read your own writes inside the transaction without passing the session
+        assert await Course.acount_documents({Course.author_id: author_id}) == 1
+
+    assert get_current_session() is None
+    assert await Course.afind_one({Course.author_id: author_id}) is not None
+
+
+@pytest.mark.usefixtures(ASYNC_INIT_CONFIG)
+async def test_atransaction_context_manager_rollback():
+    author_id = ODMObjectId()
+
+    with pytest.raises(ValueError):
+        async with atransaction():
+            await Course(author_id=author_id, title="Course Title").acreate()
+            raise ValueError("Custom error on transaction")
+
+    assert await Course.afind_one({Course.author_id: author_id}) is None
+
+
+@pytest.mark.usefixtures(ASYNC_INIT_CONFIG)
+async def test_atransaction_decorator_retry_transient_error():
+    author_id = ODMObjectId()
+    attempts = []
+
+    @atransaction(max_retries=2, backoff=0)
+    async def create_course():
+        attempts.append(1)
+        await Course(author_id=author_id, title=f"Course {len(attempts)}").acreate()
+        if len(attempts) < 2:
+            raise OperationFailure(
+                "Transient error",
+                details={"errorLabels": ["TransientTransactionError"]},
+            )
+
+    await create_course()
+
+    assert len(attempts) == 2
+    assert await Course.acount_documents({Course.author_id: author_id}) == 1
+
+
+@pytest.mark.usefixtures(ASYNC_INIT_CONFIG)
+async def test_try_to_open_transaction_with_async_connection():
+    with pytest.raises(InvalidConfiguration):
+        with transaction():
+            pass
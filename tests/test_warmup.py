@@ -0,0 +1,153 @@
+import logging
+import os
+import threading
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from mongodb_odm import Document, Field, aconnect, adisconnect, connect, disconnect
+from mongodb_odm.connection import _get_connection, get_client
+from mongodb_odm.exceptions import InvalidAction
+from mongodb_odm.models import _cashed_collection_handles, _get_connection_models
+from mongodb_odm.utils.warmup import (
+    PoolConnectionListener,
+    _get_pool_listener,
+    warmup_pool,
+)
+from pymongo import monitoring
+
+from tests.constants import MONGO_URL
+
+
+class WarmupModel(Document):
+    title: str = Field(...)
+
+    class ODMConfig(Document.ODMConfig):
+        collection_name = "test_warmup"
+
+
+class OtherConnectionModel(Document):
+    title: str = Field(...)
+
+    class ODMConfig(Document.ODMConfig):
+        collection_name = "test_warmup_other"
+        connection = "other"
+
+
+class UnknownDatabaseModel(Document):
+    title: str = Field(...)
+
+    class ODMConfig(Document.ODMConfig):
+        collection_name = "test_warmup_unknown"
+        database = "unknown"
+
+
+ADDRESS = ("localhost", 27017)
+
+
+def get_cached_models() -> set[str]:
+    return {key[0].__name__ for key in _cashed_collection_handles}
+
+
+def test_get_connection_models():
+    models = _get_connection_models("default")
+    assert WarmupModel in models
+    assert OtherConnectionModel not in models
+    assert _get_connection_models("other") == [OtherConnectionModel]
+
+
+def open_connections(listener: PoolConnectionListener, count: int) -> None:
+    for connection_id in range(1, count + 1):
+        listener.connection_ready(
+            monitoring.ConnectionReadyEvent(ADDRESS, connection_id, 0.01)
+        )
+
+
+def test_pool_connection_listener():
+    listener = PoolConnectionListener()
+    open_connections(listener, 3)
+    listener.connection_closed(monitoring.ConnectionClosedEvent(ADDRESS, 2, "stale"))
+    # Connections that failed before they were ready are not counted
+    listener.connection_closed(monitoring.ConnectionClosedEvent(ADDRESS, 9, "error"))
+    assert listener.connections == 2
+    assert listener.wait_for(2, timeout=0)
+    assert not listener.wait_for(3, timeout=0.01)
+
+
+def test_warmup_pool_needs_the_listener():
+    connect(MONGO_URL)
+    try:
+        with pytest.raises(InvalidAction):
+            warmup_pool()
+    finally:
+        disconnect()
+
+
+def test_connect_with_warmup(caplog):
+    # The driver opens the connections of minPoolSize in the background
+    def command(*args: Any, **kwargs: Any) -> dict[str, Any]:
+        threading.Timer(
+            0.05, open_connections, args=(_get_pool_listener("default"), 3)
+        ).start()
+        return {"ok": 1}
+
+    with patch(
+        "pymongo.synchronous.database.Database.command", side_effect=command
+    ) as mock_command:
+        connect(MONGO_URL, connection_kwargs={"minPoolSize": 3}, warmup=True)
+
+    try:
+        mock_command.assert_called_once_with("ping")
+        assert _get_pool_listener("default").connections == 3
+        assert "WarmupModel" in get_cached_models()
+        assert "OtherConnectionModel" not in get_cached_models()
+        # The database is not configured in connect()
+        assert "UnknownDatabaseModel" not in get_cached_models()
+
+        # Warmed up again in a forked process, with a new listener
+        parent_listener = _get_pool_listener("default")
+        _get_connection("default").pid = os.getpid() + 1
+        with patch(
+            "pymongo.synchronous.database.Database.command", side_effect=command
+        ) as mock_command:
+            get_client()
+        assert mock_command.call_count == 1
+        listener = _get_pool_listener("default")
+        assert listener is not parent_listener and listener.connections == 3
+
+        # The pool doesn't reach minPoolSize
+        listener.connection_closed(
+            monitoring.ConnectionClosedEvent(ADDRESS, 1, "stale")
+        )
+        with (
+            patch("pymongo.synchronous.database.Database.command"),
+            caplog.at_level(logging.WARNING, logger="mongodb_odm"),
+        ):
+            result = warmup_pool(timeout=0.01)
+        assert result.connections == 2
+        assert "has 2 of 3 (minPoolSize) connections" in caplog.text
+    finally:
+        disconnect()
+
+
+def test_connect_async_client_with_warmup():
+    with pytest.raises(InvalidAction):
+        connect(MONGO_URL, async_is_enabled=True, warmup=True)
+
+
+async def test_aconnect_with_warmup():
+    async def command(*args: Any, **kwargs: Any) -> dict[str, Any]:
+        open_connections(_get_pool_listener("default"), 2)
+        return {"ok": 1}
+
+    with patch(
+        "pymongo.asynchronous.database.AsyncDatabase.command", side_effect=command
+    ) as mock_command:
+        await aconnect(MONGO_URL, connection_kwargs={"minPoolSize": 2}, warmup=True)
+
+    try:
+        assert mock_command.call_count == 1
+        assert _get_pool_listener("default").connections == 2
+        assert "WarmupModel" in get_cached_models()
+    finally:
+        await adisconnect()
@@ -0,0 +1,179 @@
+from unittest.mock import patch
+
+import pytest
+from bson import ObjectId
+from mongodb_odm import (
+    ODMObjectId,
+    WriteBuffer,
+    apply_indexes,
+    connect,
+    disconnect,
+)
+from mongodb_odm.exceptions import InvalidAction, WriteBufferFull
+from mongodb_odm.utils.write_buffer import _sync_buffers
+from pymongo.errors import BulkWriteError
+
+from tests.conftest import INIT_CONFIG
+from tests.constants import MONGO_URL
+from tests.models.course import Course
+from tests.models.user import User
+
+
+def test_invalid_buffer_configuration():
+    with pytest.raises(ValueError):
+        WriteBuffer(Course, max_batch_size=0)
+
+    with pytest.raises(ValueError):
+        WriteBuffer(Course, max_batch_size=10, max_queue_size=5)
+
+
+def test_put_invalid_object():
+    buffer = WriteBuffer(Course)
+
+    with pytest.raises(ValueError):
+        buffer.put(User(username="one", full_name="Full Name"))
+
+    buffer.close()
+
+
+def test_buffer_backpressure_without_blocking():
+    buffer = WriteBuffer(Course, max_batch_size=2, max_queue_size=2, block=False)
+
+    try:
+        # Do not start the writer thread so that the queue is never drained
+        with patch.object(WriteBuffer, "_start"):
+            buffer.put(Course(author_id=ODMObjectId(), title="one"))
+            buffer.put(Course(author_id=ODMObjectId(), title="two"))
+
+            with pytest.raises(WriteBufferFull):
+                buffer.put(Course(author_id=ODMObjectId(), title="three"))
+
+        assert buffer._queue.qsize() == 2
+    finally:
+        # Drop the queued objects, there is no server to write them to
+        with patch.object(WriteBuffer, "_drain"):
+            buffer.close()
+
+    assert buffer not in _sync_buffers
+
+
+def test_put_after_close():
+    buffer = WriteBuffer(Course)
+    buffer.close()
+
+    with pytest.raises(InvalidAction):
+        buffer.put(Course(author_id=ODMObjectId(), title="one"))
+
+
+@pytest.mark.usefixtures(INIT_CONFIG)
+def test_buffered_insert_on_flush():
+    author_id = ODMObjectId()
+    buffer = WriteBuffer(Course, max_batch_size=100, flush_interval=60)
+
+    courses = [Course(author_id=author_id, title=f"Course {i}") for i in range(10)]
+    for course in courses:
+        buffer.put(course)
+
+    buffer.flush()
+
+    assert Course.count_documents({Course.author_id: author_id}) == 10
+    for course in courses:
+        assert Course.exists({Course.id: course.id})
+
+    buffer.close()
+
+
+@pytest.mark.usefixtures(INIT_CONFIG)
+def test_buffered_insert_on_batch_size():
+    author_id = ODMObjectId()
+    buffer = WriteBuffer(Course, max_batch_size=5, flush_interval=60)
+
+    for i in range(5):
+        buffer.put(Course(author_id=author_id, title=f"Course {i}"))
+
+    buffer._queue.join()
+
+    assert Course.count_documents({Course.author_id: author_id}) == 5
+
+    buffer.close()
+
+
+@pytest.mark.usefixtures(INIT_CONFIG)
+def test_buffered_insert_error_callback():
+    failed_batches = []
+    buffer = WriteBuffer(
+        User,
+        flush_interval=60,
+        on_error=lambda error, objects: failed_batches.append(objects),
+    )
+
+    apply_indexes()
+    User(username="one", full_name="Full Name").create()
+
+    buffer.put(User(username="one", full_name="Full Name"))
+    buffer.flush()
+    buffer.close()
+
+    assert len(failed_batches) == 1, "Duplicate username should fail the batch"
+    assert failed_batches[0][0].username == "one"
+
+
+@pytest.mark.parametrize(
+    "ordered, failed_titles", [(False, ["two"]), (True, ["two", "three"])]
+)
+def test_buffered_insert_partial_failure(ordered, failed_titles):
+    inserted_ids = []
+
+    def insert_many(documents, ordered=True, **kwargs):
+        # pymongo sets the _id of the documents, the second one is a duplicate
+        for document in documents:
+            inserted_ids.append(document.setdefault("_id", ObjectId()))
+        write_errors = [{"index": 1, "code": 11000, "errmsg": "duplicate key"}]
+        raise BulkWriteError({"writeErrors": write_errors})
+
+    failed = []
+    courses = [
+        Course(author_id=ODMObjectId(), title=title)
+        for title in ("one", "two", "three")
+    ]
+    connect(MONGO_URL)
+    buffer = WriteBuffer(
+        Course,
+        ordered=ordered,
+        on_error=lambda error, objects: failed.extend(objects),
+    )
+    try:
+        with patch(
+            "pymongo.synchronous.collection.Collection.insert_many",
+            side_effect=insert_many,
+        ):
+            buffer._write(courses)
+    finally:
+        buffer.close()
+        disconnect()
+
+    # Only the failed objects are reported, the inserted ones get their ids
+    assert [obj.title for obj in failed] == failed_titles
+    assert courses[0].id == inserted_ids[0]
+    assert courses[1].id != inserted_ids[1]
+    assert (courses[2].id == inserted_ids[2]) is not ordered
+
+
+def test_disconnect_flushes_buffers():
+    from mongodb_odm import connect, disconnect
+
+    from tests.constants import MONGO_URL
+
+    connect(MONGO_URL)
+    author_id = ODMObjectId()
+    buffer = WriteBuffer(Course, flush_interval=60)
+    buffer.put(Course(author_id=author_id, title="Course"))
+
+    disconnect()
+
+    assert buffer.closed is True
+
+    connect(MONGO_URL)
+    assert Course.count_documents({Course.author_id: author_id}) == 1
+    Course.delete_many({Course.author_id: author_id})
+    disconnect()
@@ -0,0 +1,92 @@
+import pytest
+from mongodb_odm import AsyncWriteBuffer, ODMObjectId, async_apply_indexes
+from mongodb_odm.exceptions import InvalidAction, WriteBufferFull
+from mongodb_odm.utils.write_buffer import _async_buffers
+
+from tests.conftest import ASYNC_INIT_CONFIG
+from tests.models.course import Course
+from tests.models.user import User
+
+
+async def test_async_buffer_backpressure_without_blocking():
+    buffer = AsyncWriteBuffer(Course, max_batch_size=2, max_queue_size=2, block=False)
+
+    try:
+        # The writer task can not run until this coroutine yields to the event loop
+        buffer.put_nowait(Course(author_id=ODMObjectId(), title="one"))
+        await buffer.put(Course(author_id=ODMObjectId(), title="two"))
+
+        with pytest.raises(WriteBufferFull):
+            buffer.put_nowait(Course(author_id=ODMObjectId(), title="three"))
+
+        assert buffer._queue is not None and buffer._queue.qsize() == 2
+    finally:
+        # Drop the queued objects, there is no server to write them to
+        if buffer._task is not None:
+            buffer._task.cancel()
+        _async_buffers.discard(buffer)
+
+
+async def test_async_put_after_close():
+    buffer = AsyncWriteBuffer(Course)
+    await buffer.aclose()
+
+    with pytest.raises(InvalidAction):
+        await buffer.put(Course(author_id=ODMObjectId(), title="one"))
+
+
+@pytest.mark.usefixtures(ASYNC_INIT_CONFIG)
+async def test_async_buffered_insert_on_flush():
+    author_id = ODMObjectId()
+    buffer = AsyncWriteBuffer(Course, max_batch_size=100, flush_interval=60)
+
+    courses = [Course(author_id=author_id, title=f"Course {i}") for i in range(10)]
+    for course in courses:
+        await buffer.put(course)
+
+    await buffer.flush()
+
+    assert await Course.acount_documents({Course.author_id: author_id}) == 10
+    for course in courses:
+        assert await Course.aexists({Course.id: course.id})
+
+    await buffer.aclose()
+
+
+@pytest.mark.usefixtures(ASYNC_INIT_CONFIG)
+async def test_async_buffered_insert_error_callback():
+    failed_batches = []
+    buffer = AsyncWriteBuffer(
+        User,
+        flush_interval=60,
+        on_error=lambda error, objects: failed_batches.append(objects),
+    )
+
+    await async_apply_indexes()
+    await User(username="one", full_name="Full Name").acreate()
+
+    await buffer.put(User(username="one", full_name="Full Name"))
+    await buffer.flush()
+    await buffer.aclose()
+
+    assert len(failed_batches) == 1, "Duplicate username should fail the batch"
+
+
+async def test_adisconnect_flushes_buffers():
+    from mongodb_odm import adisconnect, connect
+
+    from tests.constants import MONGO_URL
+
+    connect(MONGO_URL, async_is_enabled=True)
+    author_id = ODMObjectId()
+    buffer = AsyncWriteBuffer(Course, flush_interval=60)
+    await buffer.put(Course(author_id=author_id, title="Course"))
+
+    await adisconnect()
+
+    assert buffer.closed is True
+
+    connect(MONGO_URL, async_is_enabled=True)
+    assert await Course.acount_documents({Course.author_id: author_id}) == 1
+    await Course.adelete_many({Course.author_id: author_id})
+    await adisconnect()
@@ -0,0 +1,117 @@
+from typing import Optional
+
+import pytest
+from mongodb_odm import Document, Field, connect, disconnect
+from mongodb_odm.exceptions import InvalidConfiguration
+from mongodb_odm.utils.collection_options import (
+    get_collection_options,
+    get_override_options,
+    get_write_concern,
+    pop_collection_options,
+)
+from pymongo.read_concern import ReadConcern
+from pymongo.write_concern import WriteConcern
+
+from tests.conftest import INIT_CONFIG
+from tests.constants import MONGO_URL
+
+
+class EventLog(Document):
+    message: str = Field(...)
+
+    class ODMConfig(Document.ODMConfig):
+        collection_name = "test_write_concern_event"
+        write_concern = 1
+        journal = False
+
+
+class Payment(Document):
+    amount: int = Field(...)
+    note: Optional[str] = None
+
+    class ODMConfig(Document.ODMConfig):
+        collection_name = "test_write_concern_payment"
+        write_concern = "majority"
+        journal = True
+        read_concern = "majority"
+
+
+@pytest.fixture()
+def lazy_connection():
+    connect(MONGO_URL)
+    yield None
+    disconnect()
+
+
+def test_collection_options():
+    options = get_collection_options(Payment)
+    assert options["write_concern"] == WriteConcern(w="majority", j=True)
+    assert options["read_concern"] == ReadConcern("majority")
+    assert get_collection_options(EventLog) == {
+        "write_concern": WriteConcern(w=1, j=False)
+    }
+
+    with pytest.raises(InvalidConfiguration):
+        get_write_concern(-1)
+
+
+def test_invalid_collection_options():
+    class UnacknowledgedJournal(Document):
+        message: str = Field(...)
+
+        class ODMConfig(Document.ODMConfig):
+            collection_name = "test_write_concern_invalid"
+            write_concern = 0
+            journal = True
+
+    with pytest.raises(InvalidConfiguration):
+        get_collection_options(UnacknowledgedJournal)
+
+
+def test_override_options():
+    kwargs = {"write_concern": 0, "upsert": True}
+    overrides = pop_collection_options(kwargs, ("write_concern",))
+    assert kwargs == {"upsert": True}
+    assert get_override_options(overrides) == {"write_concern": WriteConcern(w=0)}
+    assert get_override_options({"read_concern": "local"}) == {
+        "read_concern": ReadConcern("local")
+    }
+    assert get_override_options({"read_concern": None}) == {}
+
+    # The journal of the model is kept, unless a WriteConcern is given
+    assert get_override_options({"write_concern": 2}, journal=True) == {
+        "write_concern": WriteConcern(w=2, j=True)
+    }
+    assert get_override_options({"write_concern": WriteConcern(w=2)}, journal=True) == {
+        "write_concern": WriteConcern(w=2)
+    }
+    with pytest.raises(InvalidConfiguration):
+        get_override_options({"write_concern": 0}, journal=True)
+
+
+@pytest.mark.usefixtures("lazy_connection")
+def test_collection_handles():
+    collection = Payment._get_collection()
+    assert collection.write_concern == WriteConcern(w="majority", j=True)
+    assert collection.read_concern == ReadConcern("majority")
+
+    override = Payment._get_collection(write_concern=2)
+    assert override.write_concern == WriteConcern(w=2, j=True)
+    assert override.read_concern == ReadConcern("majority")
+    assert override is Payment._get_collection(write_concern=WriteConcern(w=2, j=True))
+    assert Payment._get_collection(
+        write_concern=WriteConcern(w=1)
+    ).write_concern == WriteConcern(w=1)
+
+    assert EventLog._get_collection().write_concern == WriteConcern(w=1, j=False)
+
+
+@pytest.mark.usefixtures(INIT_CONFIG)
+def test_writes_with_write_concern():
+    payment = Payment(amount=10).create(write_concern=1)
+    Payment.update_one({"_id": payment.id}, {"$set": {"note": "a"}}, write_concern=1)
+    assert Payment.count_documents({"note": "a"}, read_concern="local") == 1
+
+    EventLog(message="Hello").create()
+    result = EventLog.delete_many({}, write_concern="majority")
+    assert result.deleted_count == 1
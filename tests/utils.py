@@ -21,6 +21,21 @@ TOTAL_DESCRIPTIONS = 2
 TOTAL_COMMENTS = 2
 
 
+class AsyncCursor:
+    """Async iterator over documents, in place of a driver cursor"""
+
+    def __init__(self, documents: list[dict]) -> None:
+        self.documents = iter(documents)
+
+    def __aiter__(self) -> "AsyncCursor":
+        return self
+
+    async def __anext__(self) -> dict:
+        for document in self.documents:
+            return document
+        raise StopAsyncIteration
+
+
 def create_users():
     User(username="one", full_name="Full Name").create()
     User(username="two", full_name="Full Name").create()